@@ -0,0 +1,45 @@
+# Compares building nested Scrollable/Frame layouts with and without
+# bulk_construction(). Requires a display.
+#
+# Usage: python benchmarks/nested_layouts.py [repeats]
+import sys
+import time
+from ticklish_ui import *
+
+def nested(depth, width):
+    if depth == 0:
+        return [Label(f'label {i}') for i in range(width)]
+    return [
+        Scrollable(
+            [Frame(nested(depth - 1, width))],
+            [Frame(nested(depth - 1, width))],
+        ).options(width=200, height=100)
+        for i in range(width)
+    ]
+
+def build(root, deferred):
+    factory = Frame(nested(3, 3))
+    start = time.perf_counter()
+    if deferred:
+        with bulk_construction():
+            widget = factory.create_widget(root)
+    else:
+        widget = factory.create_widget(root)
+    widget.pack()
+    root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    widget.destroy()
+    return elapsed
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    root = Application('Nested layouts benchmark')
+    for deferred in (False, True):
+        times = [build(root, deferred) for _ in range(repeats)]
+        label = 'bulk_construction' if deferred else 'immediate'
+        print(f'{label:>20}: best {min(times):.4f}s, '
+              f'mean {sum(times) / len(times):.4f}s')
+    root.destroy()
+
+if __name__ == '__main__':
+    main()
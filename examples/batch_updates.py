@@ -0,0 +1,28 @@
+# Demonstrates updating many labels at once with a Batch. Every tick
+# all of the labels are updated but only a single call is made to Tcl.
+import random
+from ticklish_ui import *
+
+ROWS = 40
+COLUMNS = 10
+
+app = Application(
+    'Batch Updates',
+    *[[Label('----').options(name=f'status_{r}_{c}', tags='status', width=5)
+       for c in range(COLUMNS)]
+      for r in range(ROWS)],
+    [CloseButton('Quit')],
+)
+
+labels = app.widgets.by_tag('status')
+
+def tick():
+    with app.batch() as batch:
+        for label in labels:
+            value = random.randint(0, 100)
+            color = 'red' if value > 90 else 'black'
+            batch.configure(label, text=f'{value:4d}', foreground=color)
+    app.after(100, tick)
+
+tick()
+app.mainloop()
@@ -0,0 +1,39 @@
+# Demonstrates drawing many Canvas items at once. Press the button to
+# draw 50,000 random line segments with a single call to draw_many()
+# and 1,000 labelled points with another.
+import random
+from ticklish_ui import *
+
+app = Application(
+    'Draw Many',
+
+    # .row1
+    [Button('Draw').options(name='draw'), Label('').options(name='count')],
+
+    # .row2
+    [Canvas(640, 480).options(name='canvas')],
+)
+
+canvas = app.widgets['canvas']
+
+def draw():
+    canvas.delete('all')
+    segments = []
+    for _ in range(50000):
+        x, y = random.uniform(0, 640), random.uniform(0, 480)
+        segments.append((x, y, x + random.uniform(-10, 10), y + random.uniform(-10, 10)))
+    lines = canvas.draw_many('line', segments, fill='gray')
+
+    points = [(random.uniform(0, 640), random.uniform(0, 480)) for _ in range(1000)]
+    labels = canvas.draw_many(
+        'text', points, fill='blue',
+        item_options={'text': [str(i) for i in range(len(points))]},
+    )
+    app.widgets['count']['text'] = f'{len(lines) + len(labels)} items'
+
+(app.get_event_stream('<ButtonRelease-1>')
+ .by_name('draw')
+ .map(lambda e: draw())
+)
+
+app.mainloop()
@@ -0,0 +1,44 @@
+# Demonstrates hit testing with a Canvas spatial index. The canvas
+# holds 100,000 dots; the one nearest the mouse is highlighted as it
+# moves and the dots within 30 pixels of a click are counted, without
+# looking at every item on the canvas.
+import random
+from ticklish_ui import *
+
+app = Application(
+    'Hit Testing',
+
+    # .row1
+    [Label('Click to count nearby dots').options(name='status')],
+
+    # .row2
+    [Canvas(800, 600).options(name='canvas')],
+)
+
+canvas = app.widgets['canvas']
+index = canvas.spatial_index(cell_size=16)
+dots = []
+for _ in range(100000):
+    x, y = random.uniform(0, 800), random.uniform(0, 600)
+    dots.append((x - 1, y - 1, x + 1, y + 1))
+canvas.draw_many('oval', dots, fill='gray', outline='')
+highlighted = None
+
+def highlight(event):
+    global highlighted
+    item = index.nearest(event.x, event.y, max_distance=10)
+    if item != highlighted:
+        if highlighted is not None:
+            canvas.itemconfigure(highlighted, fill='gray')
+        if item is not None:
+            canvas.itemconfigure(item, fill='red')
+        highlighted = item
+
+def count(event):
+    nearby = index.within(event.x, event.y, 30)
+    app.widgets['status']['text'] = f'{len(nearby)} dots within 30 pixels'
+
+app.get_event_stream('<Motion>').by_name('canvas').map(highlight)
+app.get_event_stream('<ButtonRelease-1>').by_name('canvas').map(count)
+
+app.mainloop()
@@ -0,0 +1,79 @@
+# Demonstrates a retained Canvas scene. Click to add a vertex, click
+# two vertices to join them with an edge and drag a vertex to move
+# it. Only the items of the objects which changed are updated; the
+# rest of the scene is never redrawn.
+from ticklish_ui import *
+
+class Vertex:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+class Edge:
+    def __init__(self, start, end):
+        self.start = start
+        self.end = end
+
+app = Application(
+    'Scene',
+
+    # .row1
+    [Canvas(640, 480).options(name='canvas')],
+)
+
+canvas = app.widgets['canvas']
+scene = canvas.scene(layers=['edges', 'vertices'])
+index = canvas.spatial_index()
+edges = []
+state = {'selected': None, 'dragging': None}
+
+def draw_vertex(vertex, color='black'):
+    x, y = vertex.x, vertex.y
+    scene.draw(vertex, 'oval', (x - 4, y - 4, x + 4, y + 4),
+               layer='vertices', fill=color, outline=color)
+
+def draw_edge(edge):
+    scene.draw(edge, 'line', (edge.start.x, edge.start.y, edge.end.x, edge.end.y),
+               layer='edges')
+
+def vertex_at(event):
+    scene.flush()
+    item = index.nearest(event.x, event.y, max_distance=4)
+    vertex = scene.object_at(item) if item is not None else None
+    return vertex if isinstance(vertex, Vertex) else None
+
+def press(event):
+    vertex = vertex_at(event)
+    if vertex is None:
+        draw_vertex(Vertex(event.x, event.y))
+        return
+    state['dragging'] = vertex
+    selected = state['selected']
+    if selected is None:
+        state['selected'] = vertex
+        draw_vertex(vertex, 'red')
+    else:
+        if selected is not vertex:
+            edge = Edge(selected, vertex)
+            edges.append(edge)
+            draw_edge(edge)
+        state['selected'] = None
+        draw_vertex(selected)
+
+def drag(event):
+    vertex = state['dragging']
+    if vertex is not None:
+        vertex.x, vertex.y = event.x, event.y
+        draw_vertex(vertex, 'red' if vertex is state['selected'] else 'black')
+        for edge in edges:
+            if vertex is edge.start or vertex is edge.end:
+                draw_edge(edge)
+
+def release(event):
+    state['dragging'] = None
+
+app.get_event_stream('<Button-1>').by_name('canvas').map(press)
+app.get_event_stream('<B1-Motion>').by_name('canvas').map(drag)
+app.get_event_stream('<ButtonRelease-1>').by_name('canvas').map(release)
+
+app.mainloop()
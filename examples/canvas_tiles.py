@@ -0,0 +1,67 @@
+# Demonstrates a tiled background on a large scrolling Canvas. The
+# background, a fine grid with a contour map, would take hundreds of
+# thousands of items to draw, but it's drawn once into image tiles
+# as they come into view and cached, so scrolling stays smooth. The
+# markers on top are ordinary Canvas items. Press the button to
+# change the map, which redraws the visible tiles.
+import math
+import random
+from ticklish_ui import *
+
+app = Application(
+    'Tiles',
+
+    # .row1
+    [Button('New map').options(name='new')],
+
+    # .row2
+    [Canvas(800, 600).options(
+        name='canvas', background='white',
+        scrollregion=(0, 0, 20000, 20000),
+     ),
+     Scrollbar('vertical').options(name='ybar')],
+
+    # .row3
+    [Scrollbar('horizontal').options(name='xbar')],
+)
+
+canvas = app.widgets['canvas']
+settings = {'frequency': 0.002}
+
+def draw_background(raster, left, top):
+    size = raster.width
+    frequency = settings['frequency']
+    heights = [
+        [math.sin((left + x) * frequency) * math.cos((top + y) * frequency)
+         for x in range(0, size, 4)]
+        for y in range(0, size, 4)
+    ]
+    raster.heatmap(heights, value_range=(-1, 1),
+                   colormap=[(220, 235, 255), (255, 250, 220), (200, 230, 200)])
+    lines = [(x - left, 0, x - left, size)
+             for x in range(left - left % 20, left + size, 20)]
+    lines += [(0, y - top, size, y - top)
+              for y in range(top - top % 20, top + size, 20)]
+    raster.lines(lines, (200, 200, 200))
+
+layer = canvas.tile_layer(draw_background)
+
+app.widgets['ybar']['command'] = canvas.yview
+app.widgets['xbar']['command'] = canvas.xview
+canvas['yscrollcommand'] = app.widgets['ybar'].set
+canvas['xscrollcommand'] = app.widgets['xbar'].set
+
+for _ in range(2000):
+    x, y = random.uniform(0, 20000), random.uniform(0, 20000)
+    canvas.create_oval(x - 4, y - 4, x + 4, y + 4, fill='red')
+
+def new_map():
+    settings['frequency'] = random.uniform(0.001, 0.01)
+    layer.invalidate()
+
+(app.get_event_stream('<ButtonRelease-1>')
+ .by_name('new')
+ .map(lambda e: new_map())
+)
+
+app.mainloop()
@@ -0,0 +1,45 @@
+# Demonstrates a pan and zoom Canvas. The floor plan below has half a
+# million walls and doors, far more than Tk can move or scale as
+# items, but only the visible ones are drawn. Drag to pan and use the
+# mouse wheel to zoom; zoomed out, the plan is drawn as shaded cells.
+# Click a wall to see its key.
+import random
+from ticklish_ui import *
+
+app = Application(
+    'Floor Plan',
+
+    # .row1
+    [Label('').options(name='status')],
+
+    # .row2
+    [Canvas(800, 600).options(name='plan', viewport=True, background='white')],
+)
+
+plan = app.widgets['plan']
+viewport = plan.viewport
+
+walls = []
+doors = []
+for i in range(250):
+    for j in range(250):
+        x, y = i * 40, j * 40
+        walls.append((x, y, x + 40, y))
+        walls.append((x, y, x, y + 40))
+        if random.random() < 0.5:
+            doors.append((x + 15, y - 2, x + 25, y + 2))
+        for _ in range(2):
+            fx, fy = x + random.uniform(5, 30), y + random.uniform(5, 30)
+            doors.append((fx, fy, fx + 5, fy + 5))
+
+viewport.add_many('line', walls, fill='black')
+viewport.add_many('rectangle', doors, fill='tan', outline='')
+viewport.set_view(0, 0, 2)
+
+def show_key(event):
+    key = viewport.find(event.x, event.y)
+    app.widgets['status']['text'] = f'Primitive {key}' if key is not None else ''
+
+app.get_event_stream('<ButtonRelease-1>').by_name('plan').map(show_key)
+
+app.mainloop()
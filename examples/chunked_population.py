@@ -0,0 +1,29 @@
+# Demonstrates filling a Listbox and a Treeview from generators. The
+# items are inserted a chunk at a time so the window stays responsive
+# while they load.
+from ticklish_ui import *
+
+def tree_items():
+    for i in range(1000):
+        yield (f'Group {i}', [f'Item {i}.{j}' for j in range(50)])
+
+app = Application(
+    'Chunked Population',
+
+    # .row1
+    [Label('Loading...').options(name='status')],
+
+    # .row2
+    [Listbox(f'Item {i}' for i in range(100000)).options(name='list'),
+     Treeview(tree_items()).options(name='tree', budget=4)],
+)
+
+def show_progress(progress):
+    name = progress.widget.winfo_name()
+    state = 'done' if progress.done else 'loading'
+    app.widgets['status']['text'] = f'{name}: {progress.count} items, {state}'
+
+app.widgets['list'].progress.map(show_progress)
+app.widgets['tree'].progress.map(show_progress)
+
+app.mainloop()
@@ -0,0 +1,50 @@
+# Demonstrates a DataGrid showing a million rows. Click a heading to
+# sort by that column, click it again to reverse the order. The
+# buttons hide and show the cheap items using a filter computed from
+# the data.
+import random
+from ticklish_ui import *
+
+count = 1000000
+columns = {
+    'id': range(count),
+    'price': [random.random() * 100 for _ in range(count)],
+    'stock': [random.randint(0, 500) for _ in range(count)],
+}
+
+app = Application(
+    'DataGrid',
+
+    # .row1
+    [Button('Hide items under $50').options(name='hide'),
+     Button('Show all').options(name='show')],
+
+    # .row2
+    [DataGrid(columns).options(
+        name='grid', height=25,
+        formatters={'price': lambda price: f'${price:.2f}'},
+    ),
+     Scrollbar('vertical').options(name='bar')],
+)
+
+grid = app.widgets['grid']
+app.widgets['bar']['command'] = grid.yview
+grid['yscrollcommand'] = app.widgets['bar'].set
+
+order = {}
+
+def sort(column):
+    order[column] = not order.get(column, True)
+    grid.sort_by(column, reverse=order[column])
+
+for name in columns:
+    grid.heading(name, command=lambda name=name: sort(name))
+
+def hide_cheap():
+    grid.set_filter([price >= 50 for price in grid.data['price']])
+
+clicks = app.get_event_stream('<ButtonRelease-1>')
+clicks.by_name('hide').map(lambda e: hide_cheap())
+clicks.by_name('show').map(lambda e: grid.set_filter(None))
+
+app.mainloop()
@@ -0,0 +1,37 @@
+# The same as simple_input_with_popup.py except that the popup window
+# is reused rather than recreated every time OK is clicked.
+from ticklish_ui import *
+
+app = Application(
+    'Example GUI',
+
+    # .row1
+    [Label('Enter some text below:')],
+
+    # .row2
+    [Entry().options(name='user_text')],
+
+    # .row3
+    [Button('OK').options(name='ok'), CloseButton('Quit')],
+)
+
+popups = DialogPool(lambda: Toplevel(
+    'Your Text',
+
+    # .row1
+    [Label('').options(name='text')],
+
+    # .row2
+    [CloseButton('OK')],
+))
+
+def show_text(dialog):
+    text = app.nametowidget('.row2.user_text').get()
+    dialog.nametowidget('row1.text')['text'] = text
+
+(app.get_event_stream('<ButtonRelease-1>')
+ .by_name('ok')
+ .map(lambda e: popups.open(show_text))
+)
+
+app.mainloop()
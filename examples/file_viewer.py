@@ -0,0 +1,41 @@
+# Demonstrates viewing a large file with a Text widget. The file named
+# on the command line, or a generated sample file, is memory mapped
+# and indexed in the background; only the visible lines, and a few on
+# either side, are ever loaded into the widget. Enter a line number
+# to jump straight to it.
+import os
+import sys
+import tempfile
+from ticklish_ui import *
+
+if len(sys.argv) > 1:
+    path = sys.argv[1]
+else:
+    path = os.path.join(tempfile.gettempdir(), 'ticklish_sample.log')
+    if not os.path.exists(path):
+        with open(path, 'w') as sample:
+            for i in range(1, 2000001):
+                sample.write(f'{i:8} the quick brown fox jumps over the lazy dog\n')
+
+app = Application(
+    'File Viewer',
+
+    # .row1
+    [Label('Go to line:'), Entry().options(name='line')],
+
+    # .row2
+    [Text().options(name='view', file=path, width=80, height=30),
+     Scrollbar('vertical').options(name='bar')],
+)
+
+view = app.widgets['view']
+app.widgets['bar']['command'] = view.yview
+view['yscrollcommand'] = app.widgets['bar'].set
+
+(app.get_event_stream('<Return>')
+ .by_name('line')
+ .filter(lambda e: e.widget.get().isdigit())
+ .map(lambda e: view.goto_line(int(e.widget.get())))
+)
+
+app.mainloop()
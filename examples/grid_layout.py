@@ -0,0 +1,30 @@
+# This example shows the 'grid' layout. Widgets are placed directly in
+# the window, without a frame for each row, but the usual row names can
+# still be used to look them up.
+from ticklish_ui import *
+
+app = Application(
+    'Grid Layout',
+
+    # .row1
+    [Label('Name:'), Entry().options(name='name')],
+
+    # .row2
+    [Label('Email:'), Entry().options(name='email')],
+
+    # .row3
+    [Button('OK').options(name='ok'), CloseButton('Quit')],
+
+    layout='grid'
+)
+
+def print_input(event):
+    print(app.nametowidget('.row1.name').get())
+    print(app.nametowidget('.row2.email').get())
+
+(app.get_event_stream('<ButtonRelease-1>')
+ .by_name('ok')
+ .map(print_input)
+)
+
+app.mainloop()
@@ -0,0 +1,25 @@
+# Demonstrates a Treeview that loads its children on demand. The
+# filesystem is browsed one directory at a time: a directory's
+# contents are only read when it's opened and, with evict set, are
+# thrown away again when it's closed.
+import os
+from ticklish_ui import *
+
+def children(path):
+    try:
+        with os.scandir(path or os.path.abspath(os.sep)) as entries:
+            return sorted(
+                (entry.path, entry.is_dir(follow_symlinks=False), entry.name)
+                for entry in entries
+            )
+    except OSError:
+        return []
+
+app = Application(
+    'Lazy Treeview',
+
+    # .row1
+    [Treeview(children).options(name='tree', evict=True, height=20)],
+)
+
+app.mainloop()
@@ -0,0 +1,25 @@
+# Filter a large Listbox as you type. Try it with and without the
+# virtual option.
+from ticklish_ui import *
+
+words = [f'{a}{b}{c}-{i}' for i, (a, b, c) in enumerate(
+    (a, b, c) for a in 'abcdefghij' for b in 'klmnopqrst' for c in 'uvwxyz'
+)] * 300
+words = [f'{word}.{i}' for i, word in enumerate(words)]
+
+app = Application(
+    'Listbox Filter',
+
+    # .row1
+    [Label('Filter:'), Entry().options(name='filter')],
+
+    # .row2
+    [Listbox(words).options(name='words', virtual=True, height=20)],
+)
+
+(app.get_event_stream('<KeyRelease>')
+ .by_name('filter')
+ .map(lambda e: app.widgets['words'].set_filter(e.widget.get()))
+)
+
+app.mainloop()
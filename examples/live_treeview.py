@@ -0,0 +1,36 @@
+# Demonstrates refreshing a Treeview from live data with apply(). Each
+# second a new snapshot of the "processes" is built from scratch but
+# only the rows that actually changed are updated in Tk.
+import random
+from ticklish_ui import *
+
+hosts = {f'host{h}': [f'host{h}/proc{p}' for p in range(20)] for h in range(5)}
+
+def snapshot():
+    items = []
+    for (host, processes) in hosts.items():
+        running = [
+            (name, [], {'text': name.split('/')[1], 'values': [load]})
+            for name in processes
+            for load in [random.choice([0, 0, 0, 1, 5, 50])]
+            if load
+        ]
+        items.append((host, running, {'open': True}))
+    return items
+
+app = Application(
+    'Live Treeview',
+
+    # .row1
+    [Treeview(*snapshot()).options(name='tree', columns=['load'], height=25)],
+)
+
+tree = app.widgets['tree']
+tree.heading('load', text='Load')
+
+def refresh():
+    tree.apply(snapshot())
+    app.after(1000, refresh)
+
+refresh()
+app.mainloop()
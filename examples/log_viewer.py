@@ -0,0 +1,31 @@
+# Demonstrates a Text widget used as a log viewer. Lines arrive much
+# faster than the screen refreshes but are written to the widget at
+# most once per frame, and only the most recent 5000 lines are kept.
+# Scroll up to read older lines; scroll back to the end to follow the
+# log again.
+import random
+from ticklish_ui import *
+
+log = Stream()
+
+app = Application(
+    'Log Viewer',
+
+    # .row1
+    [Text().options(
+        name='log', max_lines=5000, append_stream=log, state='disabled'
+    )],
+)
+
+levels = ['DEBUG', 'INFO', 'INFO', 'INFO', 'WARNING', 'ERROR']
+count = 0
+
+def produce():
+    global count
+    for _ in range(50):
+        count += 1
+        log.insert(f'{count:8} {random.choice(levels):8} request handled')
+    app.after(5, produce)
+
+produce()
+app.mainloop()
@@ -0,0 +1,42 @@
+# Demonstrates a raster layer on a Canvas. A million random points
+# are drawn as a density plot into a single image, with ordinary
+# Canvas items for the axes and labels drawn on top. Press the
+# button to draw a new set of points. Requires NumPy to run quickly.
+import numpy
+from ticklish_ui import *
+
+app = Application(
+    'Raster Scatter',
+
+    # .row1
+    [Button('New points').options(name='new')],
+
+    # .row2
+    [Canvas(640, 480).options(name='canvas', background='white')],
+)
+
+canvas = app.widgets['canvas']
+layer = canvas.raster_layer(640, 480)
+extent = (-4, -3, 4, 3)
+
+canvas.create_line(0, 240, 640, 240, fill='gray')
+canvas.create_line(320, 0, 320, 480, fill='gray')
+label = canvas.create_text(10, 10, anchor='nw')
+
+def draw():
+    count = 1000000
+    xs = numpy.random.standard_normal(count)
+    ys = numpy.random.standard_normal(count) * 0.5 + 0.3 * xs ** 2 - 0.5
+    layer.clear()
+    layer.density(xs, ys, extent=extent)
+    layer.scatter([0], [0], (255, 0, 0), extent=extent, size=5)
+    layer.show()
+    canvas.itemconfigure(label, text=f'{count:,} points')
+
+(app.get_event_stream('<ButtonRelease-1>')
+ .by_name('new')
+ .map(lambda e: draw())
+)
+
+draw()
+app.mainloop()
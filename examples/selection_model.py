@@ -0,0 +1,33 @@
+# Selecting, deselecting and inverting the selection of a very large
+# virtual Listbox. The selection is kept in Python so these operations
+# are instant no matter how many items there are.
+from ticklish_ui import *
+
+app = Application(
+    'Selection Model',
+
+    # .row1
+    [Listbox([f'Row {i}' for i in range(500000)])
+     .options(name='rows', virtual=True, height=20, selectmode='extended')],
+
+    # .row2
+    [Button('Select all').options(name='all'),
+     Button('Clear').options(name='none'),
+     Button('Invert').options(name='invert'),
+     Label('0 selected').options(name='count')],
+)
+
+rows = app.widgets['rows']
+selection = rows.selection_model
+
+clicks = app.get_event_stream('<ButtonRelease-1>')
+clicks.by_name('all').map(lambda e: selection.select_all())
+clicks.by_name('none').map(lambda e: selection.clear())
+clicks.by_name('invert').map(lambda e: selection.invert())
+
+(app.get_event_stream('<<SelectionChanged>>')
+ .by_name('rows')
+ .map(lambda e: app.widgets['count'].configure(text=f'{len(selection)} selected'))
+)
+
+app.mainloop()
@@ -0,0 +1,40 @@
+# Demonstrates sorting a Treeview by clicking on its column headings.
+# Clicking the same heading again reverses the order. The "checksum"
+# column uses a deliberately slow key which is computed in a worker
+# thread so the window stays responsive while it sorts.
+import hashlib
+import random
+from ticklish_ui import *
+
+rows = [
+    (f'file{i}', [], {'values': [random.randint(0, 10**6), f'{i:x}']})
+    for i in range(20000)
+]
+
+app = Application(
+    'Sorting',
+
+    # .row1
+    [Treeview(*rows).options(
+        name='files', columns=['size', 'checksum'], height=20
+    )],
+)
+
+tree = app.widgets['files']
+order = {}
+
+def checksum(value):
+    return hashlib.sha256(value.encode() * 1000).hexdigest()
+
+def sort(column, key=None, threaded=False):
+    order[column] = not order.get(column, True)
+    tree.sort_by(column, key=key, reverse=order[column], threaded=threaded)
+
+tree.heading('#0', text='Name', command=lambda: sort('#0'))
+tree.heading('size', text='Size', command=lambda: sort('size', key=int))
+tree.heading(
+    'checksum', text='Checksum',
+    command=lambda: sort('checksum', key=checksum, threaded=True)
+)
+
+app.mainloop()
@@ -0,0 +1,60 @@
+# Demonstrates incremental syntax highlighting. The Text widget holds
+# a large Python file and only the lines that change are tokenized
+# again, in small slices while the UI is idle, visible lines first.
+# Try opening or closing a triple quoted string: the highlighting
+# follows the change for as many lines as it affects.
+import keyword
+import re
+import tkinter
+from ticklish_ui import *
+
+TOKENS = re.compile(
+    r'(?P<comment>#.*)|(?P<string>\'[^\']*\'|"[^"]*")|(?P<word>\w+)'
+)
+KEYWORDS = set(keyword.kwlist)
+
+def tokenize(line, in_docstring):
+    tokens = []
+    start = 0
+    if in_docstring:
+        end = line.find('"""')
+        if end == -1:
+            return ([('string', 0, len(line))], True)
+        tokens.append(('string', 0, end + 3))
+        start = end + 3
+    while True:
+        opening = line.find('"""', start)
+        segment = line[start:] if opening == -1 else line[start:opening]
+        for match in TOKENS.finditer(segment):
+            kind = match.lastgroup
+            if kind == 'word' and match.group() not in KEYWORDS:
+                continue
+            kind = 'keyword' if kind == 'word' else kind
+            tokens.append((kind, start + match.start(), start + match.end()))
+        if opening == -1:
+            return (tokens, False)
+        closing = line.find('"""', opening + 3)
+        if closing == -1:
+            tokens.append(('string', opening, len(line)))
+            return (tokens, True)
+        tokens.append(('string', opening, closing + 3))
+        start = closing + 3
+
+with open(tkinter.__file__) as source:
+    code = source.read()
+
+app = Application(
+    'Syntax Highlighting',
+
+    # .row1
+    [Text(code).options(
+        name='editor', width=100, height=40, highlighter=tokenize
+    )],
+)
+
+editor = app.widgets['editor']
+editor.tag_configure('keyword', foreground='purple')
+editor.tag_configure('string', foreground='darkgreen')
+editor.tag_configure('comment', foreground='grey')
+
+app.mainloop()
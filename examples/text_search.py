@@ -0,0 +1,52 @@
+# Demonstrates searching a large Text widget with a search index.
+# Every occurrence of the text typed in the entry is highlighted as
+# you type, even though the log has half a million lines. Press the
+# button to add more lines; the index keeps up with every change.
+import random
+from ticklish_ui import *
+
+levels = ['DEBUG', 'INFO', 'INFO', 'WARNING', 'ERROR']
+lines = '\n'.join(
+    f'{i:7} {random.choice(levels):8} handled request {random.randrange(10000)}'
+    for i in range(500000)
+)
+
+app = Application(
+    'Text Search',
+
+    # .row1
+    [Label('Find:'), Entry().options(name='query'),
+     Label('').options(name='count'), Button('Add lines').options(name='add')],
+
+    # .row2
+    [Text(lines).options(name='log', width=80, height=30)],
+)
+
+log = app.widgets['log']
+log.tag_configure('search', background='yellow')
+index = log.search_index()
+
+def highlight():
+    matches = index.highlight_all(app.widgets['query'].get())
+    app.widgets['count']['text'] = f'{len(matches)} matches'
+    if matches:
+        log.see(matches[0][0])
+
+def add_lines():
+    log.insert('end', ''.join(
+        f'\n      - {random.choice(levels):8} handled request {random.randrange(10000)}'
+        for _ in range(100)
+    ))
+    highlight()
+
+(app.get_event_stream('<KeyRelease>')
+ .by_name('query')
+ .map(lambda e: highlight())
+)
+
+(app.get_event_stream('<ButtonRelease-1>')
+ .by_name('add')
+ .map(lambda e: add_lines())
+)
+
+app.mainloop()
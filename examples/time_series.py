@@ -0,0 +1,45 @@
+# Demonstrates a TimeSeries chart. The chart starts with a million
+# samples and a simulated sensor adds a thousand more every second
+# through a stream. It shows ten seconds at a time and follows new
+# samples; drag the scrollbar to look back, and back to the end to
+# follow again. Redrawing costs the same however many samples there
+# are.
+import math
+import random
+from ticklish_ui import *
+
+samples = Stream()
+
+app = Application(
+    'Time Series',
+
+    # .row1
+    [TimeSeries(800, 300).options(
+        name='chart', stream=samples, window=10.0,
+        line_options={'fill': 'blue'},
+        xscrollcommand=lambda first, last: app.widgets['bar'].set(first, last),
+    )],
+
+    # .row2
+    [Scrollbar('horizontal').options(name='bar')],
+)
+
+chart = app.widgets['chart']
+app.widgets['bar']['command'] = chart.xview
+
+def signal(t):
+    return math.sin(t) + 0.3 * math.sin(7.3 * t) + random.gauss(0, 0.1)
+
+count = 1000000
+chart.extend([i / 1000 for i in range(count)],
+             [signal(i / 1000) for i in range(count)])
+
+def produce():
+    global count
+    for _ in range(20):
+        samples.insert((count / 1000, signal(count / 1000)))
+        count += 1
+    app.after(20, produce)
+
+produce()
+app.mainloop()
@@ -0,0 +1,37 @@
+# Demonstrates searching a large Treeview. Typing in the entry finds
+# the matching items, opens only the branches that lead to them and
+# selects them.
+from ticklish_ui import *
+
+items = [
+    (f'Region {r}', [
+        (f'Store {r}.{s}', [f'Order {r}.{s}.{o}' for o in range(100)])
+        for s in range(20)
+    ])
+    for r in range(50)
+]
+
+app = Application(
+    'Treeview Search',
+
+    # .row1
+    [Label('Find:'), Entry().options(name='query'),
+     Label('').options(name='count')],
+
+    # .row2
+    [Treeview(*items).options(name='tree', height=20)],
+)
+
+tree = app.widgets['tree']
+
+def search(query):
+    matches = tree.find(query, expand=True)
+    tree.selection_set([iid for (iid, ancestors) in matches[:1000]])
+    app.widgets['count']['text'] = f'{len(matches)} matches'
+
+(app.get_event_stream('<KeyRelease>')
+ .by_name('query')
+ .map(lambda e: search(e.widget.get()))
+)
+
+app.mainloop()
@@ -0,0 +1,25 @@
+# A Listbox with a million items. Only the visible rows exist in Tk
+# and they are reused as the list scrolls.
+from ticklish_ui import *
+
+app = Application(
+    'Virtual Listbox',
+
+    # .row1
+    [Listbox([f'Item {i}' for i in range(1000000)])
+     .options(name='items', virtual=True, height=20),
+     Scrollbar('vertical').options(name='bar')],
+)
+
+listbox = app.widgets['items']
+scrollbar = app.widgets['bar']
+scrollbar.pack_configure(fill='y')
+scrollbar['command'] = listbox.yview
+listbox['yscrollcommand'] = scrollbar.set
+
+(app.get_event_stream('<<TreeviewSelect>>')
+ .by_name('items')
+ .map(lambda e: print(e.widget.focus()))
+)
+
+app.mainloop()
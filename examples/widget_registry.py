@@ -0,0 +1,34 @@
+# Demonstrates looking up widgets through the application's widget
+# registry instead of by path name.
+from ticklish_ui import *
+
+app = Application(
+    'Widget Registry',
+
+    # .row1
+    [Label('First:'), Entry().options(name='first', tags='inputs')],
+
+    # .row2
+    [Label('Second:'), Entry().options(name='second', tags='inputs')],
+
+    # .row3
+    [RadioGroup('case', ['Upper', 'Lower'])],
+
+    # .row4
+    [Button('Print').options(name='print'), CloseButton('Quit')],
+)
+
+app.widgets['case'].variable.set('Upper')
+
+def print_inputs(event):
+    case = app.widgets['case'].variable.get()
+    for entry in app.widgets.by_tag('inputs'):
+        text = entry.get()
+        print(text.upper() if case == 'Upper' else text.lower())
+
+(app.get_event_stream('<ButtonRelease-1>')
+ .by_name('print')
+ .map(print_inputs)
+)
+
+app.mainloop()
@@ -81,6 +81,11 @@ Example:
     app.mainloop()
 
 """
+from ticklish_ui.batch import *
 from ticklish_ui.events import *
+from ticklish_ui.indexing import *
 from ticklish_ui.menu_specification import *
+from ticklish_ui.registry import *
+from ticklish_ui.selection import *
+from ticklish_ui.spatial import *
 from ticklish_ui.widgets import *
@@ -0,0 +1,240 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Provides Batch for coalescing widget updates into a single Tcl call.
+
+Every call to a widget method like configure() is a round trip from
+Python to Tcl. When many widgets are updated at once, for instance a
+status panel refreshing thousands of labels, most of the time is
+spent making those calls and, often, the same option is set several
+times before the screen is ever redrawn.
+
+A Batch queues configure(), itemconfigure(), coords() and set() calls
+instead of making them immediately. Calls are merged per widget (and
+per item and option) so only the last value set is kept, and when the
+batch is flushed every queued call is sent to Tcl as a single script.
+
+Example:
+    from ticklish_ui import *
+
+    app = Application(
+        'Batch Example',
+        [Label('').options(name=f'status{i}') for i in range(100)],
+    )
+
+    with app.batch() as batch:
+        for i in range(100):
+            batch.configure(app.widgets[f'status{i}'], text='OK')
+
+A batch can also flush itself automatically after a fixed delay,
+which is useful for updates driven by events or timers. Pass the
+delay in milliseconds, typically one frame, as the frame argument:
+
+    batch = app.batch(frame=16)
+
+    def update(label, text):
+        # Flushed at most 16ms after the first queued update.
+        batch.configure(label, text=text)
+
+"""
+import re
+import tkinter as tk
+
+_ESCAPED = re.compile(r'[\s\\{}\[\]$";]')
+_ESCAPES = {'\n': '\\n', '\t': '\\t', '\r': '\\r'}
+
+def _escape(match):
+    char = match.group(0)
+    return _ESCAPES.get(char, '\\' + char)
+
+def tcl_quote(value):
+    """Quote a value as a single Tcl word.
+
+    Lists and tuples are quoted as Tcl lists, booleans become 1 or 0
+    and everything else is converted with str().
+
+    Arguments:
+        value - the value to quote
+
+    Returns:
+        A string which Tcl will parse as one word.
+
+    """
+    if isinstance(value, (list, tuple)):
+        value = ' '.join(tcl_quote(element) for element in value)
+    elif isinstance(value, bool):
+        value = str(int(value))
+    else:
+        value = str(value)
+    if not value:
+        return '{}'
+    return _ESCAPED.sub(_escape, value)
+
+class Batch:
+    """Queue widget updates and send them to Tcl in one call.
+
+    See the module documentation for an example.
+
+    """
+    def __init__(self, widget, frame=None):
+        """Initialize the Batch.
+
+        Arguments:
+            widget - any widget, used to access the Tcl interpreter
+                     and to schedule automatic flushes.
+            frame (optional) - an int. If given, the batch flushes
+                               itself this many milliseconds after
+                               the first call is queued.
+
+        """
+        self.widget = widget
+        self.frame = frame
+        self._queue = {}
+        self._count = 0
+        self._after_id = None
+
+    def configure(self, widget, **options):
+        """Queue a configure() call on widget."""
+        self._merge(('configure', str(widget)), widget, options)
+
+    def itemconfigure(self, widget, item, **options):
+        """Queue an itemconfigure() call for an item of widget."""
+        self._merge(
+            ('itemconfigure', str(widget), str(item)), widget, options
+        )
+
+    def coords(self, widget, item, *coords):
+        """Queue a coords() call for an item of a Canvas."""
+        key = ('coords', str(widget), str(item))
+        self._queue[key] = (str(widget), 'coords', item, coords)
+        self._schedule()
+
+    def set(self, widget, *values):
+        """Queue a set() call.
+
+        Arguments:
+            widget - a widget with a set() method, like Scale or
+                     Scrollbar, or a tkinter Variable.
+            *values - the arguments to set()
+
+        """
+        if isinstance(widget, tk.Variable):
+            command = ('set', str(widget)) + values
+        else:
+            command = (str(widget), 'set') + values
+        self._queue[('set', str(widget))] = command
+        self._schedule()
+
+    def call(self, widget, *args):
+        """Queue an arbitrary widget command.
+
+        Unlike the other methods, calls are never merged. They are
+        sent in the order they were made, relative to the first call
+        for any merged update.
+
+        Arguments:
+            widget - the widget whose command is called
+            *args - the command and its arguments, for example
+                    batch.call(tree, 'move', item, '', 0)
+
+        """
+        self._count += 1
+        self._queue[('call', self._count)] = (str(widget),) + args
+        self._schedule()
+
+    def script(self):
+        """Return the queued calls as a Tcl script."""
+        return '\n'.join(
+            ' '.join(_words(command)) for command in self._queue.values()
+        )
+
+    def flush(self):
+        """Send every queued call to Tcl as a single script.
+
+        Returns:
+            The result of the last call, or None if nothing was
+            queued.
+
+        """
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        if not self._queue:
+            return None
+        script = self.script()
+        self._queue = {}
+        return self.widget.tk.eval(script)
+
+    def clear(self):
+        """Discard every queued call."""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._queue = {}
+
+    def __len__(self):
+        return len(self._queue)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        if error_type is None:
+            self.flush()
+        else:
+            self.clear()
+
+    def _merge(self, key, widget, options):
+        command = self._queue.get(key)
+        if command is None:
+            command = (str(widget), key[0]) + key[2:] + ({},)
+            self._queue[key] = command
+        for (option, value) in options.items():
+            if callable(value):
+                value = widget.register(value)
+            command[-1][option] = value
+        self._schedule()
+
+    def _schedule(self):
+        if self.frame is not None and self._after_id is None:
+            self._after_id = self.widget.after(self.frame, self._flush_frame)
+
+    def _flush_frame(self):
+        self._after_id = None
+        self.flush()
+
+def _words(command):
+    for word in command:
+        if isinstance(word, dict):
+            for (option, value) in word.items():
+                yield '-' + option.rstrip('_')
+                yield tcl_quote(value)
+        else:
+            yield tcl_quote(word)
@@ -0,0 +1,241 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Provides SubstringIndex for fast substring searches.
+
+Searching a large collection of strings for a substring by checking
+every string is slow. SubstringIndex keeps an n-gram index, a map from
+n character sequences to the strings containing them, so only the
+strings containing one n-gram of the query need to be checked.
+
+Building a complete n-gram index in Python takes seconds for a few
+hundred thousand strings, so the index is filled in on demand
+instead. When a query contains none of the n-grams seen so far, the
+strings containing its first n-gram are found with a single scan over
+all of the text, done by str.find() at C speed, and cached. Cached
+n-grams are kept up to date as strings are added and removed, so
+later queries containing them only check the strings listed for
+their rarest n-gram.
+
+Example:
+    index = SubstringIndex()
+    index.add(1, 'apple')
+    index.add(2, 'banana')
+    index.add(3, 'pineapple')
+
+    index.search('apple')   # [1, 3]
+    index.search('an')      # [2]
+
+"""
+import bisect
+from array import array
+
+_SEPARATOR = '\0'
+
+class SubstringIndex:
+    """An n-gram index mapping keys to searchable text.
+
+    Keys can be any hashable value. Search results are returned in
+    the order the keys were added.
+
+    At most CACHE_SIZE n-grams are kept in the index at any one time.
+
+    """
+    CACHE_SIZE = 4096
+
+    def __init__(self, size=3, fold_case=True):
+        """Initialize the SubstringIndex.
+
+        Arguments:
+            size (optional) - an int, the length of the n-grams.
+            fold_case (optional) - a bool. If True, the default,
+                                   searches are case insensitive.
+
+        """
+        self.size = size
+        self.fold_case = fold_case
+        self._keys = []
+        self._texts = []
+        self._ids = {}
+        self._grams = {}
+        # All of the text, each string followed by _SEPARATOR, and
+        # where each string starts. Extended as strings are added.
+        self._joined = ''
+        self._starts = array('l')
+
+    def add(self, key, text):
+        """Add, or replace, the text for a key.
+
+        Arguments:
+            key - any hashable value.
+            text - a string, the text to search.
+
+        """
+        if key in self._ids:
+            self.remove(key)
+        id_ = len(self._keys)
+        text = self._fold(text)
+        self._ids[key] = id_
+        self._keys.append(key)
+        self._texts.append(text)
+        for gram in self._cached_grams(text):
+            self._grams[gram].append(id_)
+
+    def remove(self, key):
+        """Remove a key from the index.
+
+        Arguments:
+            key - a key previously added. Unknown keys are ignored.
+
+        """
+        id_ = self._ids.pop(key, None)
+        if id_ is None:
+            return
+        for gram in self._cached_grams(self._texts[id_]):
+            postings = self._grams[gram]
+            position = bisect.bisect_left(postings, id_)
+            if position < len(postings) and postings[position] == id_:
+                del postings[position]
+        self._keys[id_] = None
+        self._texts[id_] = None
+        if len(self._keys) > 2 * len(self._ids) + 64:
+            self._compact()
+
+    def search(self, query, within=None):
+        """Return the keys whose text contains query.
+
+        Arguments:
+            query - a string.
+            within (optional) - a list of keys, in the order they
+                                were added, to restrict the search
+                                to. Typically the result of a
+                                previous search for a substring of
+                                query, which makes refining a search
+                                as the user types very cheap.
+
+        Returns:
+            A list of keys in the order they were added.
+
+        """
+        query = self._fold(query)
+        candidates = None
+        if within is not None:
+            ids = self._ids
+            candidates = [ids[key] for key in within if key in ids]
+        if len(query) >= self.size and (
+                candidates is None or len(candidates) > 1000):
+            postings = self._postings(query)
+            if candidates is None:
+                candidates = postings
+            elif len(postings) < len(candidates):
+                postings = set(postings)
+                candidates = [id_ for id_ in candidates if id_ in postings]
+        elif candidates is None:
+            candidates = self._scan(query)
+        texts = self._texts
+        keys = self._keys
+        return [
+            keys[id_] for id_ in candidates
+            if texts[id_] is not None and query in texts[id_]
+        ]
+
+    def text(self, key):
+        """Return the text added for a key, case folded if fold_case is set."""
+        return self._texts[self._ids[key]]
+
+    def __contains__(self, key):
+        return key in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _fold(self, text):
+        text = str(text)
+        return text.casefold() if self.fold_case else text
+
+    def _postings(self, query):
+        # Return the ids of the strings containing the rarest cached
+        # n-gram of query, caching its first n-gram if none are.
+        size = self.size
+        grams = [query[i:i + size] for i in range(len(query) - size + 1)]
+        cached = [self._grams[gram] for gram in grams if gram in self._grams]
+        if cached:
+            return min(cached, key=len)
+        if len(self._grams) >= self.CACHE_SIZE:
+            del self._grams[next(iter(self._grams))]
+        postings = self._grams[grams[0]] = self._scan(grams[0])
+        return postings
+
+    def _cached_grams(self, text):
+        # Return the cached n-grams text contains.
+        grams = self._grams
+        if len(text) < len(grams):
+            size = self.size
+            return {
+                text[i:i + size] for i in range(len(text) - size + 1)
+                if text[i:i + size] in grams
+            }
+        return [gram for gram in grams if gram in text]
+
+    def _scan(self, needle):
+        # Return the ids of the strings containing needle, in order.
+        texts = self._texts
+        starts = self._starts
+        if len(starts) < len(texts):
+            new = texts[len(starts):]
+            offset = len(self._joined)
+            for text in new:
+                starts.append(offset)
+                offset += len(text or '') + 1
+            self._joined += ''.join((text or '') + _SEPARATOR for text in new)
+        joined = self._joined
+        postings = array('l')
+        position = joined.find(needle)
+        while position >= 0:
+            id_ = bisect.bisect_right(starts, position) - 1
+            # Removed strings are still in the joined text.
+            if texts[id_] is not None:
+                postings.append(id_)
+            if id_ + 1 >= len(starts):
+                break
+            position = joined.find(needle, starts[id_ + 1])
+        return postings
+
+    def _compact(self):
+        entries = [
+            (key, text) for (key, text) in zip(self._keys, self._texts)
+            if text is not None
+        ]
+        self._keys = [key for (key, _) in entries]
+        self._texts = [text for (_, text) in entries]
+        self._ids = {key: id_ for (id_, key) in enumerate(self._keys)}
+        self._grams = {}
+        self._joined = ''
+        self._starts = array('l')
@@ -0,0 +1,177 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Provides the WidgetRegistry for looking up widgets without paths.
+
+Every Application has a WidgetRegistry, available as app.widgets,
+which is filled in by the ticklish factories as widgets are
+created. Widgets are indexed by name, by tag and, for widgets like
+RadioGroup and CheckGroup, by group so they can be found without
+building tkinter path names or walking the widget tree.
+
+Example:
+    from ticklish_ui import *
+
+    app = Application(
+        'Registry Example',
+
+        # .row1
+        [Entry().options(name='user_text', tags='inputs')],
+
+        # .row2
+        [Entry().options(name='more_text', tags='inputs')],
+
+        # .row3
+        [RadioGroup('mode', ['Read', 'Write'])],
+    )
+
+    entry = app.widgets['user_text']
+    inputs = app.widgets.by_tag('inputs')
+    mode_buttons = app.widgets.by_group('mode')
+
+Widgets are removed from the registry automatically when they are
+destroyed.
+
+"""
+
+class WidgetRegistry:
+    """An index of widgets by name, tag, and group.
+
+    Widget names are not required to be unique, so by_name(), by_tag()
+    and by_group() all return lists of widgets in the order they were
+    registered. Indexing the registry by name returns the first widget
+    registered with that name.
+
+    """
+    def __init__(self):
+        self._widgets = {}
+        self._names = {}
+        self._tags = {}
+        self._groups = {}
+
+    def register(self, widget, tags=(), group=None):
+        """Add a widget to the registry.
+
+        Registering a widget which is already in the registry adds any
+        new tags or group to its existing entry.
+
+        Arguments:
+            widget - the widget to add.
+            tags (optional) - an iterable of strings, the widget's tags.
+            group (optional) - a string, the name of the group the
+                               widget belongs to.
+
+        """
+        path = str(widget)
+        keys = self._widgets.get(path)
+        if keys is None:
+            name = path.rsplit('.', 1)[-1]
+            keys = (widget, name, set(), set())
+            self._widgets[path] = keys
+            self._names.setdefault(name, {})[path] = widget
+        for tag in tags:
+            if tag and tag not in keys[2]:
+                keys[2].add(tag)
+                self._tags.setdefault(tag, {})[path] = widget
+        if group is not None and group not in keys[3]:
+            keys[3].add(group)
+            self._groups.setdefault(group, {})[path] = widget
+
+    def unregister(self, widget):
+        """Remove a widget from the registry.
+
+        Arguments:
+            widget - the widget, or its path name, to remove. Widgets
+                     which aren't in the registry are ignored.
+
+        """
+        path = str(widget)
+        keys = self._widgets.pop(path, None)
+        if keys is None:
+            return
+        _discard(self._names, keys[1], path)
+        for tag in keys[2]:
+            _discard(self._tags, tag, path)
+        for group in keys[3]:
+            _discard(self._groups, group, path)
+
+    def watch(self, toplevel):
+        """Unregister widgets as they are destroyed.
+
+        A single <Destroy> binding on the toplevel window sees the
+        destruction of every widget it contains.
+
+        Arguments:
+            toplevel - an Application or Toplevel window.
+
+        """
+        toplevel.bind(
+            '<Destroy>', lambda event: self.unregister(event.widget), add='+'
+        )
+
+    def by_name(self, name):
+        """Return a list of all widgets with the given name."""
+        return list(self._names.get(name, {}).values())
+
+    def by_tag(self, tag):
+        """Return a list of all widgets with the given tag."""
+        return list(self._tags.get(tag, {}).values())
+
+    def by_group(self, group):
+        """Return a list of all widgets in the given group."""
+        return list(self._groups.get(group, {}).values())
+
+    def get(self, name, default=None):
+        """Return the first widget with the given name or default."""
+        for widget in self._names.get(name, {}).values():
+            return widget
+        return default
+
+    def __getitem__(self, name):
+        widget = self.get(name)
+        if widget is None:
+            raise KeyError(name)
+        return widget
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __len__(self):
+        return len(self._widgets)
+
+    def __iter__(self):
+        return (keys[0] for keys in self._widgets.values())
+
+def _discard(index, key, path):
+    entries = index.get(key)
+    if entries is not None:
+        entries.pop(path, None)
+        if not entries:
+            del index[key]
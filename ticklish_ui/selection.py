@@ -0,0 +1,222 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Provides SelectionModel, a compact selection for large lists.
+
+Tk keeps a Treeview's selection as a list of item ids, so selecting
+every row of a large list creates enormous strings on every call to
+selection(). SelectionModel instead keeps the selection in Python as a
+bitset, one bit per row, with a flag which inverts the meaning of
+every bit. Selecting or deselecting everything, and inverting the
+selection, takes a constant number of Python operations no matter
+how many rows there are.
+
+Every change is reported through the model's changes stream as a
+SelectionChange describing what changed, rather than the whole
+selection.
+
+Example:
+    from ticklish_ui import SelectionModel
+
+    selection = SelectionModel(1000000)
+    selection.changes.map(print)
+
+    selection.select([1, 2, 3, 10])
+    # SelectionChange(widget=None, kind='change',
+    #                 added=[(1, 4), (10, 11)], removed=[])
+
+    selection.select_all()
+    # SelectionChange(widget=None, kind='all', added=[], removed=[])
+
+    len(selection)  # 1000000
+
+"""
+import collections
+import ticklish_ui.events as events
+
+class SelectionChange(collections.namedtuple(
+        'SelectionChange', 'widget kind added removed')):
+    """A change to a SelectionModel.
+
+    Attributes:
+        widget - the widget the selection belongs to, or None.
+        kind - a string, one of 'change', 'all', 'none' or 'invert'.
+               For 'all', 'none' and 'invert' every row may have
+               changed and added and removed are empty.
+        added - a list of (start, stop) ranges of newly selected rows.
+        removed - a list of (start, stop) ranges of deselected rows.
+
+    """
+
+class SelectionModel:
+    """A bitset of selected rows.
+
+    Rows are numbered from 0 to size - 1.
+
+    """
+    def __init__(self, size=0, widget=None):
+        """Initialize the SelectionModel with nothing selected.
+
+        Arguments:
+            size (optional) - an int, the number of rows.
+            widget (optional) - the widget the selection belongs
+                                to, passed along with every change.
+
+        """
+        self.size = size
+        self.widget = widget
+        self.changes = events.EventStream()
+        self._bits = bytearray((size + 7) // 8)
+        self._ones = 0
+        self._inverted = False
+
+    def __contains__(self, row):
+        if not 0 <= row < self.size:
+            return False
+        return bool(self._bits[row >> 3] & (1 << (row & 7))) != self._inverted
+
+    def __len__(self):
+        return self.size - self._ones if self._inverted else self._ones
+
+    def __iter__(self):
+        flip = 0xff if self._inverted else 0
+        size = self.size
+        for (index, byte) in enumerate(self._bits):
+            byte ^= flip
+            if byte:
+                base = index << 3
+                for bit in range(8):
+                    if byte & (1 << bit) and base + bit < size:
+                        yield base + bit
+
+    def ranges(self):
+        """Return the selection as a list of (start, stop) ranges."""
+        return _ranges(self)
+
+    def select(self, rows):
+        """Select an iterable of rows."""
+        self.update(added=rows)
+
+    def deselect(self, rows):
+        """Deselect an iterable of rows."""
+        self.update(removed=rows)
+
+    def update(self, added=(), removed=()):
+        """Select and deselect rows, reporting a single change.
+
+        Rows outside the model, and rows which are already in the
+        requested state, are ignored.
+
+        Arguments:
+            added (optional) - an iterable of rows to select.
+            removed (optional) - an iterable of rows to deselect.
+
+        """
+        added = [row for row in added if self._set(row, True)]
+        removed = [row for row in removed if self._set(row, False)]
+        if added or removed:
+            self._emit('change', _ranges(sorted(added)), _ranges(sorted(removed)))
+
+    def select_all(self):
+        """Select every row."""
+        self._reset(True)
+        self._emit('all')
+
+    def clear(self):
+        """Deselect every row."""
+        self._reset(False)
+        self._emit('none')
+
+    def invert(self):
+        """Select every unselected row and deselect every selected row."""
+        self._inverted = not self._inverted
+        self._emit('invert')
+
+    def resize(self, size):
+        """Change the number of rows.
+
+        Rows added to the model are not selected. Rows removed from
+        the model are forgotten. No change is reported.
+
+        Arguments:
+            size - an int, the new number of rows.
+
+        """
+        length = (size + 7) // 8
+        if size < self.size:
+            del self._bits[length:]
+        elif self._inverted:
+            # Unselected rows have their bit set when inverted.
+            for row in range(self.size, min(size, len(self._bits) << 3)):
+                self._assign(row, 1)
+            self._bits.extend(b'\xff' * (length - len(self._bits)))
+        else:
+            self._bits.extend(bytes(length - len(self._bits)))
+        for row in range(size, length << 3):
+            self._assign(row, 0)
+        self.size = size
+        self._ones = _popcount(self._bits)
+
+    def _assign(self, row, value):
+        mask = 1 << (row & 7)
+        if value:
+            self._bits[row >> 3] |= mask
+        else:
+            self._bits[row >> 3] &= ~mask
+
+    def _set(self, row, selected):
+        if not 0 <= row < self.size or (row in self) == selected:
+            return False
+        bit = selected != self._inverted
+        self._assign(row, bit)
+        self._ones += 1 if bit else -1
+        return True
+
+    def _reset(self, inverted):
+        self._bits = bytearray(len(self._bits))
+        self._ones = 0
+        self._inverted = inverted
+
+    def _emit(self, kind, added=(), removed=()):
+        self.changes.insert(
+            SelectionChange(self.widget, kind, list(added), list(removed))
+        )
+
+def _popcount(data):
+    return bin(int.from_bytes(data, 'little')).count('1')
+
+def _ranges(rows):
+    ranges = []
+    for row in rows:
+        if ranges and ranges[-1][1] == row:
+            ranges[-1][1] = row + 1
+        else:
+            ranges.append([row, row + 1])
+    return [tuple(pair) for pair in ranges]
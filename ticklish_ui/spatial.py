@@ -0,0 +1,284 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Provides SpatialGrid for fast queries on rectangles.
+
+Finding the shapes near a point by checking every shape is slow once
+there are many of them. SpatialGrid divides the plane into square
+cells and remembers which cells each shape's bounding box touches, so
+a query only needs to check the shapes in the cells it covers.
+
+Example:
+    grid = SpatialGrid()
+    grid.insert('a', (0, 0, 10, 10))
+    grid.insert('b', (100, 100, 110, 120))
+
+    grid.nearest(20, 20)              # 'a'
+    grid.in_rect(90, 90, 200, 200)    # {'b'}
+    grid.within(0, 0, 50)             # {'a'}
+
+"""
+import math
+
+class SpatialGrid:
+    """A uniform grid of cells mapping keys to bounding boxes.
+
+    Keys can be any hashable value. Boxes are (x1, y1, x2, y2) tuples
+    with x1 <= x2 and y1 <= y2, and include their edges.
+
+    Queries take time proportional to the number of cells they cover
+    and the shapes in them, so the cell size should be around the
+    size of a typical shape or query. Shapes covering more than
+    MAX_CELLS cells aren't put in the grid at all but are checked by
+    every query instead.
+
+    """
+    MAX_CELLS = 64
+
+    def __init__(self, cell_size=64):
+        """Initialize the SpatialGrid.
+
+        Arguments:
+            cell_size (optional) - a number, the width and height of
+                                   each cell.
+
+        """
+        self.cell_size = cell_size
+        self._boxes = {}
+        self._cells = {}
+        self._large = set()
+
+    def insert(self, key, bbox):
+        """Add, or replace, the bounding box for a key.
+
+        Arguments:
+            key - any hashable value.
+            bbox - an (x1, y1, x2, y2) tuple.
+
+        """
+        if key in self._boxes:
+            self.remove(key)
+        bbox = tuple(float(value) for value in bbox)
+        self._boxes[key] = bbox
+        cells = self._span(*bbox)
+        if _area(cells) > self.MAX_CELLS:
+            self._large.add(key)
+            return
+        for cell in _cells(cells):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def insert_many(self, items):
+        """Add, or replace, many bounding boxes at once.
+
+        Equivalent to calling insert() for each item, but quicker.
+
+        Arguments:
+            items - an iterable of (key, bbox) pairs
+
+        """
+        boxes = self._boxes
+        cells = self._cells
+        size = self.cell_size
+        floor = math.floor
+        for (key, (x1, y1, x2, y2)) in items:
+            if key in boxes:
+                self.remove(key)
+            boxes[key] = (float(x1), float(y1), float(x2), float(y2))
+            (i, j) = (floor(x1 / size), floor(y1 / size))
+            if i == floor(x2 / size) and j == floor(y2 / size):
+                # Most shapes fit in a single cell.
+                keys = cells.get((i, j))
+                if keys is None:
+                    cells[(i, j)] = {key}
+                else:
+                    keys.add(key)
+            else:
+                del boxes[key]
+                self.insert(key, (x1, y1, x2, y2))
+
+    def remove(self, key):
+        """Remove a key.
+
+        Arguments:
+            key - a key previously inserted. Unknown keys are ignored.
+
+        """
+        bbox = self._boxes.pop(key, None)
+        if bbox is None:
+            return
+        if key in self._large:
+            self._large.discard(key)
+            return
+        for cell in _cells(self._span(*bbox)):
+            keys = self._cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
+
+    def move(self, key, dx, dy):
+        """Move the bounding box for a key by dx and dy."""
+        (x1, y1, x2, y2) = self._boxes[key]
+        self.insert(key, (x1 + dx, y1 + dy, x2 + dx, y2 + dy))
+
+    def bbox(self, key):
+        """Return the bounding box for a key."""
+        return self._boxes[key]
+
+    def clear(self):
+        """Remove every key."""
+        self._boxes.clear()
+        self._cells.clear()
+        self._large.clear()
+
+    def in_rect(self, x1, y1, x2, y2):
+        """Return the keys whose bounding boxes overlap a rectangle.
+
+        Returns:
+            A set of keys.
+
+        """
+        boxes = self._boxes
+        return {
+            key for key in self._candidates(self._span(x1, y1, x2, y2))
+            if _overlaps(boxes[key], x1, y1, x2, y2)
+        }
+
+    def within(self, x, y, radius):
+        """Return the keys whose bounding boxes are near a point.
+
+        Arguments:
+            x, y - the coordinates of the point
+            radius - the largest distance from the point to the
+                     nearest edge of a bounding box. Boxes containing
+                     the point are at distance 0.
+
+        Returns:
+            A set of keys.
+
+        """
+        boxes = self._boxes
+        return {
+            key for key in self._candidates(
+                self._span(x - radius, y - radius, x + radius, y + radius)
+            )
+            if _distance(boxes[key], x, y) <= radius
+        }
+
+    def nearest(self, x, y, max_distance=None):
+        """Return the key whose bounding box is nearest a point.
+
+        Arguments:
+            x, y - the coordinates of the point
+            max_distance (optional) - a number. Keys farther away
+                                      than this are ignored.
+
+        Returns:
+            A key or None if no key is close enough.
+
+        """
+        limit = math.inf if max_distance is None else max_distance
+        boxes = self._boxes
+        best = (math.inf, None)
+        for key in self._large:
+            best = min(best, (_distance(boxes[key], x, y), key), key=_first)
+        i = math.floor(x / self.cell_size)
+        j = math.floor(y / self.cell_size)
+        ring = 0
+        # Every box in ring r of cells around the point's cell is at
+        # least (r - 1) cells away, so the search stops once that's
+        # farther than the best box found so far.
+        while (ring - 1) * self.cell_size <= min(best[0], limit):
+            if 8 * ring > len(self._cells):
+                # The ring has more cells than the grid holds: check
+                # every remaining box at once.
+                for (key, bbox) in boxes.items():
+                    best = min(best, (_distance(bbox, x, y), key), key=_first)
+                break
+            for cell in _ring(i, j, ring):
+                for key in self._cells.get(cell, ()):
+                    best = min(
+                        best, (_distance(boxes[key], x, y), key), key=_first
+                    )
+            ring += 1
+        return best[1] if best[0] <= limit else None
+
+    def __contains__(self, key):
+        return key in self._boxes
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def _span(self, x1, y1, x2, y2):
+        size = self.cell_size
+        return (math.floor(x1 / size), math.floor(y1 / size),
+                math.floor(x2 / size), math.floor(y2 / size))
+
+    def _candidates(self, span):
+        if _area(span) > len(self._cells):
+            # Looking at every occupied cell is quicker.
+            (i1, j1, i2, j2) = span
+            cells = [
+                keys for ((i, j), keys) in self._cells.items()
+                if i1 <= i <= i2 and j1 <= j <= j2
+            ]
+        else:
+            cells = [
+                self._cells[cell] for cell in _cells(span)
+                if cell in self._cells
+            ]
+        return set(self._large).union(*cells)
+
+def _first(pair):
+    return pair[0]
+
+def _area(span):
+    (i1, j1, i2, j2) = span
+    return (i2 - i1 + 1) * (j2 - j1 + 1)
+
+def _cells(span):
+    (i1, j1, i2, j2) = span
+    return [(i, j) for i in range(i1, i2 + 1) for j in range(j1, j2 + 1)]
+
+def _ring(i, j, ring):
+    if ring == 0:
+        return [(i, j)]
+    cells = [(i + d, j - ring) for d in range(-ring, ring + 1)]
+    cells += [(i + d, j + ring) for d in range(-ring, ring + 1)]
+    cells += [(i - ring, j + d) for d in range(-ring + 1, ring)]
+    cells += [(i + ring, j + d) for d in range(-ring + 1, ring)]
+    return cells
+
+def _overlaps(bbox, x1, y1, x2, y2):
+    return bbox[0] <= x2 and x1 <= bbox[2] and bbox[1] <= y2 and y1 <= bbox[3]
+
+def _distance(bbox, x, y):
+    dx = max(bbox[0] - x, 0, x - bbox[2])
+    dy = max(bbox[1] - y, 0, y - bbox[3])
+    return math.hypot(dx, dy)
@@ -92,21 +92,36 @@ Example - Widget Options - /examples/widget_options.py:
 from ticklish_ui.widgets.application import *
 from ticklish_ui.widgets.buttons import *
 from ticklish_ui.widgets.canvas import *
+from ticklish_ui.widgets.canvasindex import *
 from ticklish_ui.widgets.checkbuttons import *
 from ticklish_ui.widgets.combobox import *
+from ticklish_ui.widgets.datagrid import *
+from ticklish_ui.widgets.drawing import *
 from ticklish_ui.widgets.dropdown import *
 from ticklish_ui.widgets.entry import *
 from ticklish_ui.widgets.factories import *
+from ticklish_ui.widgets.fileview import *
 from ticklish_ui.widgets.frames import *
+from ticklish_ui.widgets.highlighting import *
 from ticklish_ui.widgets.label import *
 from ticklish_ui.widgets.listbox import *
 from ticklish_ui.widgets.notebook import *
 from ticklish_ui.widgets.panedwindow import *
+from ticklish_ui.widgets.population import *
 from ticklish_ui.widgets.progressbar import *
 from ticklish_ui.widgets.radiobuttons import *
+from ticklish_ui.widgets.raster import *
 from ticklish_ui.widgets.separator import *
 from ticklish_ui.widgets.scale import *
+from ticklish_ui.widgets.scene import *
 from ticklish_ui.widgets.scrollbars import *
+from ticklish_ui.widgets.sorting import *
 from ticklish_ui.widgets.text import *
+from ticklish_ui.widgets.textproxy import *
+from ticklish_ui.widgets.textsearch import *
+from ticklish_ui.widgets.tiles import *
+from ticklish_ui.widgets.timeseries import *
 from ticklish_ui.widgets.toplevel import *
 from ticklish_ui.widgets.treeview import *
+from ticklish_ui.widgets.viewport import *
+from ticklish_ui.widgets.virtual import *
@@ -32,7 +32,9 @@
 import tkinter as tk
 import tkinter.ttk as ttk
 import ticklish_ui.events as events
-from ticklish_ui.widgets.factories import ContainerFactory
+from ticklish_ui.batch import Batch
+from ticklish_ui.registry import WidgetRegistry
+from ticklish_ui.widgets.factories import ContainerFactory, bulk_construction
 
 class Application(ContainerFactory, tk.Tk):
     """The root window for all ticklish UIs.
@@ -40,18 +42,29 @@ class Application(ContainerFactory, tk.Tk):
     This class wraps the tkinter.Tk class so every ticklish UI must
     contain exactly one instance of Application.
 
+    Widgets created by ticklish, including those in Toplevel windows,
+    are added to the Application's widget registry, the widgets
+    attribute, which can be used to look them up by name, tag or
+    group. See WidgetRegistry for details.
+
     """
-    def __init__(self, title, *rows):
+    def __init__(self, title, *rows, layout='pack'):
         """Initialize the Application.
 
         Arguments:
             title - a string, the name of the window displayed in the
                     titlebar.
             *rows - any number of rows given as lists of ticklish widgets.
+            layout (optional) - either 'pack' (the default) or 'grid'.
+                                See ContainerFactory for details.
 
         """
         super().__init__(None, rows)
-        self.create_widget(None)
+        self.layout = layout
+        self.widgets = WidgetRegistry()
+        self.widgets.watch(self)
+        with bulk_construction():
+            self.create_widget(None)
         self.title(title)
         self.style = ttk.Style()
         self.style.theme_use('default')
@@ -94,6 +107,27 @@ class Application(ContainerFactory, tk.Tk):
             self.bind_all(sequence, stream.insert)
         super().event_generate(sequence, **args)
 
+    def batch(self, frame=None):
+        """Create a Batch for coalescing widget updates.
+
+        See Batch for details.
+
+        Example:
+            with app.batch() as batch:
+                for label in app.widgets.by_tag('status'):
+                    batch.configure(label, text='OK')
+
+        Arguments:
+            frame (optional) - an int. If given, the batch flushes
+                               itself this many milliseconds after the
+                               first update is queued.
+
+        Returns:
+            A new Batch object.
+
+        """
+        return Batch(self, frame)
+
     def get_event_stream(self, event_sequence):
         """Bind an event stream to the Application.
 
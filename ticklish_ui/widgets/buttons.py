@@ -47,10 +47,16 @@ class CloseButton(Button):
     """Wrapper for the tkinter.ttk.Button class.
 
     CloseButton is a ticklish addition which closes the toplevel
-    window that contains it when clicked.
+    window that contains it when clicked. Windows which belong to a
+    DialogPool are hidden and returned to the pool instead of being
+    destroyed.
 
     """
     def create_widget(self, parent):
         button = super().create_widget(parent)
-        button['command'] = lambda: button.winfo_toplevel().destroy()
+
+        def close():
+            toplevel = button.winfo_toplevel()
+            getattr(toplevel, 'close', toplevel.destroy)()
+        button['command'] = close
         return button
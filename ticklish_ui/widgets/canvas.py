@@ -29,11 +29,83 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 """Defines the ticklish_ui Canvas widget. """
+import functools
 import tkinter as tk
+from ticklish_ui.widgets.canvasindex import spatial_index
+from ticklish_ui.widgets.drawing import draw_many
 from ticklish_ui.widgets.factories import WidgetFactory
+from ticklish_ui.widgets.raster import RasterLayer
+from ticklish_ui.widgets.scene import canvas_scene
+from ticklish_ui.widgets.tiles import TileLayer
+from ticklish_ui.widgets.viewport import Viewport
 
 class Canvas(WidgetFactory):
-    """ Wrapper for the tkinter.Canvas class. """
+    """ Wrapper for the tkinter.Canvas class.
+
+    The widget's draw_many() method creates many items of the same
+    type with a single Tcl call, which is much faster than creating
+    them one at a time. See draw_many() for details.
+
+    Example:
+        segments = [(0, 0, 10, 10), (10, 10, 20, 0), (20, 0, 30, 10)]
+        ids = canvas.draw_many('line', segments, fill='blue')
+
+    The widget's spatial_index() method returns a CanvasIndex which
+    keeps the bounding box of every item in a grid, updated as items
+    are created, moved and deleted, so finding the items near a
+    point only looks at the items close to it.
+
+    Example:
+        index = canvas.spatial_index()
+        item = index.nearest(event.x, event.y, max_distance=5)
+
+    The widget's scene() method returns a Scene, which binds model
+    objects to the items drawing them and, when objects change,
+    updates only their items instead of redrawing everything. See
+    Scene for details.
+
+    Example:
+        scene = canvas.scene(layers=['edges', 'vertices'])
+        scene.draw(vertex, 'oval', (x - 3, y - 3, x + 3, y + 3),
+                   layer='vertices', fill='black')
+
+    For data too dense to draw as items, the widget's raster_layer()
+    method creates a RasterLayer, an image below the other items
+    into which points and heatmaps are drawn with NumPy and sent to
+    Tk in a single call.
+
+    Example:
+        layer = canvas.raster_layer(640, 480)
+        layer.density(xs, ys, extent=(-3, -3, 3, 3))
+        layer.show()
+
+    Static backgrounds, like grid lines or maps, can be drawn once
+    into cached image tiles by the widget's tile_layer() method, which
+    creates a TileLayer. Only the tiles in view are drawn and shown,
+    however complex the background is. See TileLayer for details.
+
+    Example:
+        def grid_lines(raster, left, top):
+            lines = [(x - left, 0, x - left, 256)
+                     for x in range(left - left % 10, left + 256, 10)]
+            raster.lines(lines, (200, 200, 200))
+
+        canvas.tile_layer(grid_lines)
+
+    Setting the 'viewport' option to True attaches a Viewport, as the
+    widget's viewport attribute, for scenes too large to draw as
+    items. Only the visible part of the scene is drawn, and dragging
+    with the left mouse button pans while the mouse wheel zooms.
+
+    Example:
+        app = Application(
+            'Floor Plan',
+            [Canvas(800, 600).options(name='plan', viewport=True)],
+        )
+
+        app.widgets['plan'].viewport.add_many('line', walls)
+
+    """
     def __init__(self, width, height):
         """Initialize the Canvas.
 
@@ -45,3 +117,42 @@ class Canvas(WidgetFactory):
         super().__init__(tk.Canvas)
         self.kwargs['width'] = width
         self.kwargs['height'] = height
+        self.viewport = False
+
+    def options(self, **kwargs):
+        if 'viewport' in kwargs:
+            self.viewport = kwargs.pop('viewport')
+        return super().options(**kwargs)
+
+    def create_widget(self, parent):
+        widget = super().create_widget(parent)
+        if self.viewport:
+            widget.viewport = Viewport(widget)
+            _bind_viewport(widget)
+        widget.draw_many = functools.partial(draw_many, widget)
+        widget.spatial_index = functools.partial(spatial_index, widget)
+        widget.scene = functools.partial(canvas_scene, widget)
+        widget.raster_layer = functools.partial(RasterLayer, widget)
+        widget.tile_layer = functools.partial(TileLayer, widget)
+        return widget
+
+def _bind_viewport(canvas):
+    # Pan by dragging with the left button and zoom with the wheel.
+    def press(event):
+        canvas.drag_start = (event.x, event.y)
+
+    def drag(event):
+        (x, y) = canvas.drag_start
+        canvas.drag_start = (event.x, event.y)
+        canvas.viewport.pan(event.x - x, event.y - y)
+
+    def wheel(event):
+        if event.num == 5 or event.delta < 0:
+            canvas.viewport.zoom(1 / 1.25, event.x, event.y)
+        else:
+            canvas.viewport.zoom(1.25, event.x, event.y)
+
+    canvas.bind('<ButtonPress-1>', press, add='+')
+    canvas.bind('<B1-Motion>', drag, add='+')
+    for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+        canvas.bind(sequence, wheel, add='+')
@@ -0,0 +1,201 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Find the items of a Canvas near a point without checking them all.
+
+Tk's find closest and find overlapping commands look at every item on
+the Canvas, so hit testing on mouse motion slows down as items are
+added. A CanvasIndex keeps the bounding box of every item in a
+SpatialGrid, so queries only look at the items near the point.
+
+Like a TextProxy, a CanvasIndex sits between the widget's Tcl command
+and its implementation and sees every item created, moved, reshaped
+or deleted, whether by Python, by a Batch or by draw_many(). The
+bounding boxes of new and reshaped items are read lazily, all at
+once, on the next query. draw_many() skips the index entirely and
+hands it the whole range of new items instead.
+
+"""
+from ticklish_ui.spatial import SpatialGrid
+
+# Commands which can change the bounding boxes of existing items,
+# and the number of arguments below which they only query them.
+_RESHAPING = {
+    'coords': 2, 'dchars': 2, 'insert': 3, 'itemconfigure': 3,
+    'moveto': 1, 'rchars': 4, 'scale': 5,
+}
+
+def spatial_index(canvas, cell_size=64):
+    """Return the CanvasIndex for a Canvas, creating it if needed.
+
+    Arguments:
+        canvas - a tkinter.Canvas
+        cell_size (optional) - the cell size of the SpatialGrid, in
+                               pixels, used when creating the index.
+
+    Example:
+        index = spatial_index(canvas)
+        item = index.nearest(event.x, event.y, max_distance=5)
+
+    """
+    index = getattr(canvas, 'canvas_index', None)
+    if index is None:
+        index = canvas.canvas_index = CanvasIndex(canvas, cell_size)
+    return index
+
+class CanvasIndex:
+    """A spatial index of the items on a Canvas.
+
+    Queries take canvas coordinates; use the Canvas's canvasx() and
+    canvasy() methods to convert the coordinates of an event on a
+    scrolled Canvas. Items are found by their bounding boxes, as
+    reported by the Canvas's bbox command, so hidden items and items
+    with no size, like empty text, are never found.
+
+    Create a CanvasIndex with spatial_index(), so a widget only ever
+    has one.
+
+    """
+    def __init__(self, canvas, cell_size=64):
+        """Index the items of a Canvas.
+
+        Arguments:
+            canvas - a tkinter.Canvas
+            cell_size (optional) - the cell size of the SpatialGrid,
+                                   in pixels.
+
+        """
+        self.canvas = canvas
+        self.grid = SpatialGrid(cell_size)
+        self.command = str(canvas)
+        self.original = f'{self.command}_ticklish_original'
+        canvas.tk.call('rename', self.command, self.original)
+        canvas.tk.createcommand(self.command, self._dispatch)
+        canvas.bind('<Destroy>', self._on_destroy, add='+')
+        self.stale = set(self._find('all'))
+
+    def call(self, *args):
+        """Run a widget command without updating the index."""
+        return self.canvas.tk.call(self.original, *args)
+
+    def created(self, items):
+        """Index items created without going through the index.
+
+        Arguments:
+            items - an iterable of item ids, such as the range
+                    returned by draw_many(), which creates its items
+                    by calling the original widget command.
+
+        """
+        self.stale.update(items)
+
+    def nearest(self, x, y, max_distance=None):
+        """Return the id of the item nearest a point.
+
+        Arguments:
+            x, y - the canvas coordinates of the point
+            max_distance (optional) - a number. Items farther away
+                                      than this are ignored.
+
+        Returns:
+            An item id or None if no item is close enough.
+
+        """
+        self._refresh()
+        return self.grid.nearest(x, y, max_distance)
+
+    def in_rect(self, x1, y1, x2, y2):
+        """Return the ids of the items overlapping a rectangle.
+
+        Returns:
+            A tuple of item ids, oldest first.
+
+        """
+        self._refresh()
+        return tuple(sorted(self.grid.in_rect(x1, y1, x2, y2)))
+
+    def within(self, x, y, radius):
+        """Return the ids of the items within radius of a point.
+
+        Returns:
+            A tuple of item ids, oldest first.
+
+        """
+        self._refresh()
+        return tuple(sorted(self.grid.within(x, y, radius)))
+
+    def _dispatch(self, operation, *args):
+        if operation == 'delete':
+            items = [item for tag in args for item in self._find(tag)]
+            result = self.call(operation, *args)
+            for item in items:
+                self.grid.remove(item)
+            self.stale.difference_update(items)
+            return result
+        if operation == 'move':
+            # Distances can be given in any Tk units, like '1c'.
+            (dx, dy) = (self.canvas.winfo_fpixels(args[1]),
+                        self.canvas.winfo_fpixels(args[2]))
+        result = self.call(operation, *args)
+        if operation == 'create':
+            self.stale.add(int(result))
+        elif operation == 'move':
+            for item in self._find(args[0]):
+                if item in self.grid:
+                    self.grid.move(item, dx, dy)
+        elif len(args) >= _RESHAPING.get(operation, len(args) + 1):
+            self.stale.update(self._find(args[0]))
+        return result
+
+    def _find(self, tag):
+        items = self.call('find', 'withtag', tag)
+        return [int(item) for item in self.canvas.tk.splitlist(items)]
+
+    def _refresh(self):
+        # Read the bounding boxes of every stale item in one call.
+        if not self.stale:
+            return
+        items = list(self.stale)
+        self.stale.clear()
+        splitlist = self.canvas.tk.splitlist
+        boxes = splitlist(self.canvas.tk.call(
+            'lmap', 'item', items, f'{self.original} bbox $item'
+        ))
+        found = []
+        for (item, bbox) in zip(items, boxes):
+            bbox = splitlist(bbox)
+            if bbox:
+                found.append((item, bbox))
+            else:
+                self.grid.remove(item)
+        self.grid.insert_many(found)
+
+    def _on_destroy(self, event):
+        if event.widget is self.canvas:
+            self.canvas.tk.deletecommand(self.command)
@@ -32,7 +32,7 @@
 import tkinter as tk
 import tkinter.ttk as ttk
 from ticklish_ui.widgets.frames import Frame
-from ticklish_ui.widgets.factories import WidgetFactory
+from ticklish_ui.widgets.factories import WidgetFactory, register
 
 class Checkbutton(WidgetFactory):
     """Wrapper for the tkinter.ttk.Checkbutton class.
@@ -112,3 +112,11 @@ class CheckGroup(Frame):
             check_rows.append(check_row)
         super().__init__(*check_rows)
         self.kwargs['name'] = group_name
+        self.group_name = group_name
+
+    def create_widget(self, parent):
+        widget = super().create_widget(parent)
+        for row in widget.widget_rows.values():
+            for button in row:
+                register(button, group=self.group_name)
+        return widget
@@ -0,0 +1,244 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Defines the ticklish_ui DataGrid widget. """
+from array import array
+import tkinter.ttk as ttk
+from ticklish_ui.batch import Batch
+from ticklish_ui.widgets.factories import WidgetFactory
+from ticklish_ui.widgets.virtual import VirtualRows
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class DataGrid(WidgetFactory):
+    """A table of rows and columns backed by columnar arrays.
+
+    Data is given as a dict mapping column names to sequences of
+    values, one value per row. Each column is stored as a NumPy array
+    when NumPy is installed and otherwise as an array.array, or a
+    list for columns which aren't numeric. Nothing is stored in Tk
+    except the visible cells: like a virtual Listbox the DataGrid is
+    a Treeview showing a window onto the rows, see VirtualRows, so it
+    scrolls just as fast over millions of rows as over a few.
+
+    Cells are displayed by passing their values to str() or, if one
+    is given for the column, to a function in the 'formatters'
+    option, a dict mapping column names to functions.
+
+    Example:
+        app = Application(
+            'DataGrid',
+            [DataGrid({
+                'id': range(1000000),
+                'price': [random.random() * 100 for _ in range(1000000)],
+            }).options(
+                name='grid', height=25,
+                formatters={'price': lambda price: f'{price:.2f}'},
+            ),
+             Scrollbar('vertical').options(name='bar')],
+        )
+
+        grid = app.widgets['grid']
+        app.widgets['bar']['command'] = grid.yview
+        grid['yscrollcommand'] = app.widgets['bar'].set
+
+    The columns, as stored, are available as the widget's data
+    attribute. The widget's sort_by() method sorts the rows by a
+    column and set_filter() shows only the rows selected by a mask,
+    a sequence of bools with one per row. Both work on whole columns
+    at once, with NumPy if it's available, so with NumPy a filter can
+    be computed directly from the data:
+
+    Example:
+        grid.sort_by('price', reverse=True)
+        grid.set_filter(grid.data['price'] > 50)
+
+    The selection is tracked by logical row, as for VirtualRows, and
+    the widget's selected_rows() method translates it into indices
+    into the columns. Sorting and filtering keep the selected rows
+    selected as long as they're still shown.
+
+    """
+    def __init__(self, columns):
+        """Initialize the DataGrid.
+
+        Arguments:
+            columns - a dict mapping column names to sequences of
+                      values. Every column must have the same length.
+        """
+        super().__init__(ttk.Treeview)
+        self.columns = columns
+        self.formatters = {}
+
+    def options(self, **kwargs):
+        if 'formatters' in kwargs:
+            self.formatters = kwargs.pop('formatters')
+        return super().options(**kwargs)
+
+    def create_widget(self, parent):
+        yscrollcommand = self.kwargs.pop('yscrollcommand', None)
+        self.kwargs['columns'] = list(self.columns)
+        self.kwargs.setdefault('show', 'headings')
+        grid = super().create_widget(parent)
+        batch = Batch(grid)
+        for name in self.columns:
+            batch.call(grid, 'heading', name, {'text': name})
+        batch.flush()
+        _GridRows(grid, self.columns, self.formatters, yscrollcommand)
+        return grid
+
+def column_array(values):
+    """Return values stored as compactly as possible.
+
+    Values become a NumPy array if NumPy is installed. Otherwise an
+    array.array is used for integers and floats and a list for
+    anything else.
+
+    """
+    if numpy is not None:
+        return numpy.asarray(values)
+    if isinstance(values, array):
+        return values
+    values = list(values)
+    for typecode in ('q', 'd'):
+        try:
+            return array(typecode, values)
+        except (TypeError, OverflowError):
+            pass
+    return values
+
+class _GridRows(VirtualRows):
+    EXPORTS = VirtualRows.EXPORTS + (
+        'set_columns', 'sort_by', 'set_filter', 'selected_rows'
+    )
+
+    def __init__(self, treeview, columns, formatters, yscrollcommand=None):
+        self.formatters = formatters
+        self.data = {}
+        self.order = None
+        self.mask = None
+        self.view = None
+        super().__init__(treeview, yscrollcommand)
+        self.set_columns(columns)
+
+    def row_data(self, index):
+        row = self._row(index)
+        return {'values': [
+            self.formatters.get(name, str)(column[row])
+            for (name, column) in self.data.items()
+        ]}
+
+    def set_columns(self, columns):
+        """Replace the data, keeping the existing column names."""
+        self.data = {name: column_array(columns[name]) for name in columns}
+        self.treeview.data = self.data
+        (self.order, self.mask, self.view) = (None, None, None)
+        self.selection.clear()
+        self.set_count(self._row_count())
+
+    def sort_by(self, column, reverse=False):
+        """Sort the rows by the values in column.
+
+        Sorting is stable, so rows with equal values keep their
+        relative order, except that reversing an already sorted
+        column with NumPy reverses equal rows as well.
+
+        Arguments:
+            column - the name of a column
+            reverse (optional) - a bool, True to sort in descending
+                                 order
+
+        """
+        values = self.data[column]
+        if numpy is not None:
+            self.order = numpy.argsort(values, kind='stable')
+            if reverse:
+                self.order = self.order[::-1]
+        else:
+            self.order = sorted(
+                range(len(values)), key=values.__getitem__, reverse=reverse
+            )
+        self._update_view()
+
+    def set_filter(self, mask=None):
+        """Show only the rows where mask is true.
+
+        Arguments:
+            mask (optional) - a sequence of bools, one for every row,
+                              or None to show all rows
+
+        """
+        if mask is not None and numpy is not None:
+            mask = numpy.asarray(mask, dtype=bool)
+        self.mask = mask
+        self._update_view()
+
+    def selected_rows(self):
+        """Return the indices, into the columns, of the selected rows."""
+        return [self._row(i) for i in self.selection]
+
+    def _row(self, index):
+        return index if self.view is None else int(self.view[index])
+
+    def _update_view(self):
+        selected = self.selected_rows()
+        order = self.order
+        if self.mask is None:
+            self.view = order
+        elif numpy is not None:
+            if order is None:
+                order = numpy.arange(self._row_count())
+            self.view = order[self.mask[order]]
+        else:
+            if order is None:
+                order = range(self._row_count())
+            self.view = array('q', (i for i in order if self.mask[i]))
+        count = self._row_count() if self.view is None else len(self.view)
+        self.selection.clear()
+        self.selection.resize(count)
+        if selected:
+            self.selection.select(self._positions(selected))
+        self._offset = 0
+        self.set_count(count)
+
+    def _positions(self, rows):
+        if self.view is None:
+            return rows
+        if numpy is not None:
+            positions = numpy.full(self._row_count(), -1)
+            positions[self.view] = numpy.arange(len(self.view))
+            return [int(p) for p in positions[rows] if p >= 0]
+        positions = {row: position for (position, row) in enumerate(self.view)}
+        return [positions[row] for row in rows if row in positions]
+
+    def _row_count(self):
+        return min((len(column) for column in self.data.values()), default=0)
@@ -0,0 +1,106 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Create many Canvas items with a single Tcl call.
+
+Each create_line(), create_oval() or similar call on a Canvas is a
+round trip from Python to Tcl, so drawing tens of thousands of items
+one at a time spends most of its time making calls. draw_many()
+builds a single script which creates all of them at once.
+
+"""
+from ticklish_ui.batch import tcl_quote
+
+def draw_many(canvas, kind, coords, item_options=None, **options):
+    """Create one Canvas item for each row of coords.
+
+    Arguments:
+        canvas - a tkinter.Canvas
+        kind - the type of item to create: 'line', 'oval',
+               'rectangle', 'text' or any other Canvas item type.
+        coords - a sequence of rows of coordinates, one row per item,
+                 for example [(x1, y1, x2, y2), ...] for lines. A
+                 two dimensional NumPy array works too.
+        item_options (optional) - a dict mapping option names to
+                                  sequences with one value per item,
+                                  for options which differ between
+                                  items, like the text of text items.
+        **options - options given to every item
+
+    Returns:
+        A range of the ids of the new items, in the order of coords.
+
+    Example:
+        points = [(10, 10), (40, 20), (70, 30)]
+        ids = draw_many(canvas, 'text', points, anchor='w',
+                        item_options={'text': ['a', 'b', 'c']})
+        canvas.itemconfigure(ids[0], fill='red')
+
+    """
+    if hasattr(coords, 'tolist'):
+        coords = coords.tolist()
+    # Creating items through a CanvasIndex costs a Python call per
+    # item, so the index is bypassed and given the new items at once.
+    index = getattr(canvas, 'canvas_index', None)
+    command = str(canvas) if index is None else index.original
+    common = ' '.join(
+        f'-{name} {tcl_quote(value)}' for (name, value) in options.items()
+    )
+    rows = [f'{command} create {kind} {" ".join(map(str, row))} {common}'
+            for row in coords]
+    if not rows:
+        return range(0)
+    for (name, values) in (item_options or {}).items():
+        if hasattr(values, 'tolist'):
+            values = values.tolist()
+        if len(values) != len(rows):
+            raise ValueError(
+                f'{len(values)} values of {name} for {len(rows)} items'
+            )
+        rows = [f'{row} -{name} {tcl_quote(value)}'
+                for (row, value) in zip(rows, values)]
+    # Items are numbered consecutively, so the id of the last item
+    # gives the ids of the rest.
+    last = int(canvas.tk.eval('\n'.join(rows)))
+    items = range(last - len(rows) + 1, last + 1)
+    if index is not None:
+        index.created(items)
+    return items
+
+def canvas_size(canvas):
+    """Return the width and height of a Canvas in pixels.
+
+    Before the Canvas is first shown its requested size is returned.
+
+    """
+    (width, height) = (canvas.winfo_width(), canvas.winfo_height())
+    if width <= 1:
+        width = int(canvas.cget('width'))
+        height = int(canvas.cget('height'))
+    return (width, height)
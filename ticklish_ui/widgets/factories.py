@@ -29,9 +29,133 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 """Defines the ticklish_ui WidgetFactory and ContainerFactory base classes. """
+import contextlib
 import tkinter as tk
 import tkinter.ttk as ttk
 
+class _DeferredGeometry:
+    """Geometry management calls held back by bulk_construction()."""
+    def __init__(self):
+        self.depth = 0
+        self.calls = []
+        self.callbacks = []
+
+    def clear(self):
+        """Discard everything that was held back."""
+        self.calls = []
+        self.callbacks = []
+
+    def flush(self):
+        """Apply held back calls and perform a single layout pass."""
+        calls, callbacks = self.calls, self.callbacks
+        self.clear()
+        masters = {}
+        for (widget, method, kwargs) in calls:
+            key = (str(widget.master), method)
+            if key not in masters:
+                masters[key] = (
+                    widget.master, _propagate(widget.master, method)
+                )
+                _propagate(widget.master, method, False)
+            getattr(widget, method)(**kwargs)
+        for ((_, method), (master, flag)) in masters.items():
+            _propagate(master, method, flag)
+        if callbacks:
+            callbacks[0][0].update_idletasks()
+            for (_, callback) in callbacks:
+                callback()
+
+_DEFERRED = _DeferredGeometry()
+
+def _propagate(master, method, *flag):
+    if method == 'grid':
+        return master.grid_propagate(*flag)
+    return master.pack_propagate(*flag)
+
+@contextlib.contextmanager
+def bulk_construction():
+    """Defer geometry management while building a widget tree.
+
+    Inside the context pack() and grid() calls made by ticklish
+    factories are held back, along with anything that needs the
+    final geometry of the widgets, like the scroll region of a
+    Scrollable. When the outermost context exits, geometry
+    propagation is turned off, all of the held back calls are made,
+    propagation is restored to its previous setting and a single
+    layout pass is done.
+
+    Application and Toplevel build their contents inside this context
+    automatically so it's only needed when creating widgets from
+    factories directly.
+
+    Example:
+        with bulk_construction():
+            Frame(
+                [Scrollable([Label('A')], [Label('B')])],
+                [Scrollable([Label('C')], [Label('D')])],
+            ).create_widget(app).pack()
+
+    """
+    _DEFERRED.depth += 1
+    try:
+        yield
+    except BaseException:
+        _DEFERRED.depth -= 1
+        if _DEFERRED.depth == 0:
+            _DEFERRED.clear()
+        raise
+    _DEFERRED.depth -= 1
+    if _DEFERRED.depth == 0:
+        _DEFERRED.flush()
+
+def register(widget, tags=(), group=None):
+    """Add a widget to its Application's widget registry.
+
+    Widgets whose root window isn't a ticklish Application are
+    ignored.
+
+    Arguments:
+        widget - the widget to register
+        tags (optional) - an iterable of strings, the widget's tags
+        group (optional) - a string, the group the widget belongs to
+
+    """
+    registry = getattr(widget.nametowidget('.'), 'widgets', None)
+    if registry is not None:
+        registry.register(widget, tags, group)
+
+def manage_geometry(widget, method, **kwargs):
+    """Call a geometry manager method, possibly deferred.
+
+    Arguments:
+        widget - the widget to manage
+        method - a string, either 'pack' or 'grid'
+        kwargs - the options passed along to the geometry manager
+
+    """
+    if _DEFERRED.depth:
+        _DEFERRED.calls.append((widget, method, kwargs))
+    else:
+        getattr(widget, method)(**kwargs)
+
+def after_layout(widget, callback):
+    """Call a function once widget geometry has been computed.
+
+    Inside bulk_construction() the callback is delayed until the
+    single layout pass at the end of construction. Otherwise the
+    layout is updated immediately and the callback called right away.
+
+    Arguments:
+        widget - any widget in the tree being constructed
+        callback - a function taking no arguments
+
+    """
+    if _DEFERRED.depth:
+        _DEFERRED.callbacks.append((widget, callback))
+    else:
+        widget.update_idletasks()
+        callback()
+
 class WidgetFactory:
     """Base class for most non-toplevel widgets.
 
@@ -85,6 +209,7 @@ class WidgetFactory:
         widget = self.widget_type(parent, **self.kwargs)
         widget.tags = tags
         widget.bindtags(tuple(tags) + widget.bindtags())
+        register(widget, tags)
         return widget
 
 class ContainerFactory(WidgetFactory):
@@ -93,6 +218,37 @@ class ContainerFactory(WidgetFactory):
     ContainerFactory differs from WidgetFactory in that it is
     responsible for creating itself and all of it's children.
 
+    By default each row of child widgets is packed into its own frame
+    named 'rowN'. Setting the 'layout' option to 'grid' instead places
+    every child directly in the container using grid(), one grid row
+    per ticklish row. This halves the number of widgets tkinter has to
+    create and lay out which can make a noticeable difference for
+    large UIs.
+
+    In grid layout there are no row frames but the usual 'rowN' paths
+    still work with the nametowidget() method of Application and
+    Toplevel windows. Every container also gets a widget_rows
+    attribute, a dictionary mapping each row name to the list of
+    widgets in that row, regardless of the layout used. Since every
+    widget in a grid layout shares the same parent, widget names must
+    be unique across all of the rows.
+
+    Example:
+        app = Application(
+            'Grid Layout',
+
+            # .row1
+            [Label('Enter some text below:')],
+
+            # .row2
+            [Entry().options(name='user_text')],
+
+            layout='grid'
+        )
+
+        # There is no row2 frame but the lookup still works.
+        entry = app.nametowidget('.row2.user_text')
+
     """
     def __init__(self, container_type, rows):
         """Initialize the ContainerFactory.
@@ -104,23 +260,97 @@ class ContainerFactory(WidgetFactory):
         """
         super().__init__(container_type)
         self.child_rows = rows
+        self.layout = 'pack'
+        self.widget_rows = {}
+
+    def options(self, **kwargs):
+        if 'layout' in kwargs:
+            self.layout = kwargs.pop('layout')
+        return super().options(**kwargs)
 
     def create_widget(self, parent):
+        if self.layout not in ('pack', 'grid'):
+            raise ValueError(
+                f"layout must be 'pack' or 'grid', not {self.layout!r}"
+            )
         tags_string = self.kwargs['tags']
         tags = tuple(tags_string.strip().split(' '))
         del self.kwargs['tags']
         if self.widget_type:
             container = self.widget_type(parent, **self.kwargs)
             container.bindtags(tags + container.bindtags())
+            register(container, tags)
         else:
             container = self
+        container.widget_rows = {}
+        names = set()
         count = 0
         for row in self.child_rows:
             count += 1
-            frame = ttk.Frame(container, name=f'row{count}')
-            frame.bindtags(tags + frame.bindtags())
-            frame.pack(fill=tk.BOTH)
-            for factory in row:
-                widget = factory.options(tags=tags_string).create_widget(frame)
-                widget.pack(side=tk.LEFT)
+            widgets = []
+            if self.layout == 'grid':
+                for column, factory in enumerate(row):
+                    name = factory.kwargs.get('name')
+                    if name is not None and name in names:
+                        raise ValueError(
+                            f"duplicate widget name {name!r} in grid layout"
+                        )
+                    names.add(name)
+                    widget = factory.options(tags=tags_string).create_widget(container)
+                    manage_geometry(
+                        widget, 'grid', row=count - 1, column=column, sticky=tk.W
+                    )
+                    widgets.append(widget)
+            else:
+                frame = ttk.Frame(container, name=f'row{count}')
+                frame.bindtags(tags + frame.bindtags())
+                register(frame, tags)
+                manage_geometry(frame, 'pack', fill=tk.BOTH)
+                for factory in row:
+                    widget = factory.options(tags=tags_string).create_widget(frame)
+                    manage_geometry(widget, 'pack', side=tk.LEFT)
+                    widgets.append(widget)
+            container.widget_rows[f'row{count}'] = widgets
         return container
+
+    def nametowidget(self, name):
+        """Return the widget identified by name.
+
+        Behaves like the tkinter nametowidget() method except that
+        'rowN' path components which refer to rows of a container
+        using grid layout are looked up in the container's
+        widget_rows, so paths like '.row2.user_text' work no matter
+        which layout was used.
+
+        Arguments:
+            name - a string, the tkinter path name of a widget.
+
+        Returns:
+            The widget with the given path name.
+
+        Raises:
+            KeyError - if no widget with that path name exists.
+
+        """
+        name = str(name)
+        if name.startswith('.'):
+            widget = tk.Misc.nametowidget(self, '.')
+            name = name[1:]
+        else:
+            widget = self
+        row = None
+        for component in name.split('.'):
+            if not component:
+                break
+            if row is not None:
+                matches = [w for w in row if w.winfo_name() == component]
+                if not matches:
+                    raise KeyError(component)
+                widget, row = matches[0], None
+            elif component in widget.children:
+                widget = widget.children[component]
+            elif component in getattr(widget, 'widget_rows', {}):
+                row = widget.widget_rows[component]
+            else:
+                raise KeyError(component)
+        return widget
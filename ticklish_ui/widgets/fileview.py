@@ -0,0 +1,306 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""View files too large to load into a Text widget.
+
+Loading a file of several gigabytes into a tkinter.Text means reading
+all of it into memory and then copying it into Tk, which is slow and
+needs several times the size of the file in memory. Instead, the file
+is memory mapped and a LineIndex records where every line starts,
+built in a background thread so the first lines can be shown
+straight away. The Text widget only ever holds the lines around the
+visible ones and is refilled as it scrolls.
+
+"""
+from array import array
+import bisect
+import mmap
+import threading
+import tkinter as tk
+from ticklish_ui.batch import Batch
+from ticklish_ui.widgets.virtual import scroll_target
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class LineIndex:
+    """The offsets of the lines in a memory mapped file.
+
+    The index is built in a background thread started when the
+    LineIndex is created. Until it's finished, done is False and
+    count only includes the lines found so far. Looking up a line by
+    number takes constant time and finding the line containing an
+    offset takes O(log n) time.
+
+    """
+    CHUNK_SIZE = 1 << 24
+
+    def __init__(self, path, encoding='utf-8'):
+        """Map the file and start indexing it.
+
+        Lines are found by looking for newline bytes, so the encoding
+        must be ASCII compatible, like UTF-8 or Latin-1.
+
+        Arguments:
+            path - the path to the file
+            encoding (optional) - the encoding used by read()
+
+        Raises:
+            ValueError - if the encoding isn't ASCII compatible, like
+                         UTF-16.
+
+        """
+        if '\n'.encode(encoding) != b'\n':
+            raise ValueError(
+                f'{encoding!r} is not an ASCII compatible encoding'
+            )
+        self.encoding = encoding
+        with open(path, 'rb') as file:
+            self.size = file.seek(0, 2)
+            self.map = None
+            if self.size:
+                self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.offsets = array('q', [0])
+        self.done = not self.size
+        self.closed = False
+        self.lock = threading.Lock()
+        if not self.done:
+            threading.Thread(target=self._build, daemon=True).start()
+
+    @property
+    def count(self):
+        """The number of lines indexed so far."""
+        if self.done and self.offsets[-1] < self.size:
+            return len(self.offsets)
+        return len(self.offsets) - 1
+
+    def span(self, line):
+        """Return the (start, end) offsets of a line, counting from 0."""
+        end = line + 1
+        return (
+            self.offsets[line],
+            self.offsets[end] if end < len(self.offsets) else self.size
+        )
+
+    def line_at(self, offset):
+        """Return the number of the line containing offset."""
+        return bisect.bisect_right(self.offsets, offset) - 1
+
+    def read(self, first, last):
+        """Return the text of lines first up to, not including, last.
+
+        The newline ending the last line is left out.
+
+        """
+        if first >= last or self.map is None:
+            return ''
+        data = self.map[self.span(first)[0]:self.span(last - 1)[1]]
+        if data.endswith(b'\n'):
+            data = data[:-1]
+        return data.decode(self.encoding, errors='replace')
+
+    def close(self):
+        """Stop indexing and unmap the file."""
+        with self.lock:
+            self.closed = True
+            if self.done and self.map is not None:
+                self.map.close()
+                self.map = None
+
+    def _build(self):
+        for start in range(0, self.size, self.CHUNK_SIZE):
+            if self.closed:
+                break
+            end = min(start + self.CHUNK_SIZE, self.size)
+            if numpy is not None:
+                chunk = numpy.frombuffer(
+                    self.map, dtype=numpy.uint8,
+                    count=end - start, offset=start
+                )
+                found = numpy.flatnonzero(chunk == ord('\n')) + (start + 1)
+                del chunk
+                self.offsets.frombytes(found.astype(numpy.int64).tobytes())
+            else:
+                position = self.map.find(b'\n', start, end)
+                while position != -1:
+                    self.offsets.append(position + 1)
+                    position = self.map.find(b'\n', position + 1, end)
+        with self.lock:
+            self.done = True
+            if self.closed:
+                self.map.close()
+                self.map = None
+
+class FileView:
+    """Shows a window of lines from a LineIndex in a Text widget.
+
+    The Text widget's yview() method and yscrollcommand option are
+    replaced so that they work in terms of the lines of the whole
+    file, so a Scrollbar can be attached as usual. The widget also
+    gets a goto_line() method and a line_index attribute, the
+    LineIndex. The widget is read only.
+
+    """
+    POLL_INTERVAL = 100
+
+    def __init__(self, text, path, encoding='utf-8'):
+        """Attach a file to a Text widget.
+
+        Arguments:
+            text - a tkinter.Text, which should be empty
+            path - the path of the file to view
+            encoding (optional) - the encoding of the file
+
+        """
+        self.text = text
+        self.index = LineIndex(path, encoding)
+        self.height = int(text.cget('height'))
+        self.loaded = range(0)
+        self.top = 0
+        self.yscrollcommand = None
+        self.reloading = None
+        tk.Text.configure(
+            text, state=tk.DISABLED, yscrollcommand=self._on_scroll
+        )
+        text.yview = self.yview
+        text.configure = text.config = self.configure
+        text.goto_line = self.goto_line
+        text.line_index = self.index
+        text.bind('<Destroy>', lambda e: self.index.close(), add='+')
+        self._poll()
+
+    def goto_line(self, line):
+        """Scroll line, counting from 1, to the top of the view."""
+        self._scroll_to(line - 1)
+
+    def yview(self, *args):
+        """Query or change the vertical position of the view.
+
+        Works like the tkinter yview() method but in terms of the
+        lines of the whole file.
+
+        """
+        if not args:
+            return self._fractions()
+        self._scroll_to(
+            scroll_target(args, self.top, self.index.count, self.height)
+        )
+        return None
+
+    def configure(self, cnf=None, **kwargs):
+        """Configure the Text widget.
+
+        Works like the tkinter configure() method except that the
+        yscrollcommand option is handled by the FileView.
+
+        """
+        options = dict(cnf, **kwargs) if isinstance(cnf, dict) else kwargs
+        if 'yscrollcommand' not in options:
+            result = tk.Text.configure(self.text, cnf, **kwargs)
+        else:
+            self.yscrollcommand = options.pop('yscrollcommand')
+            self._report()
+            result = None
+            if options:
+                result = tk.Text.configure(self.text, **options)
+        if 'height' in options:
+            self.height = int(self.text.cget('height'))
+            self._load(self.top)
+        return result
+
+    def _margin(self):
+        # The number of lines loaded above and below the visible ones.
+        return 2 * self.height
+
+    def _poll(self):
+        # Show lines as soon as they've been indexed and keep the
+        # scrollbar in step with the growing index.
+        if not self.text.winfo_exists():
+            return
+        wanted = min(self.index.count, self.top + self.height + self._margin())
+        if self.loaded.stop < wanted:
+            self._load(self.top)
+        self._report()
+        if not self.index.done:
+            self.text.after(self.POLL_INTERVAL, self._poll)
+
+    def _scroll_to(self, top):
+        top = max(0, min(top, self.index.count - self.height))
+        self.top = top
+        if top in self.loaded and (top + self.height <= self.loaded.stop
+                                   or self.loaded.stop == self.index.count):
+            tk.Text.yview(self.text, f'{top - self.loaded.start + 1}.0')
+        else:
+            self._load(top)
+        self._report()
+
+    def _load(self, top):
+        self.loaded = range(
+            max(0, top - self._margin()),
+            min(self.index.count, top + self.height + self._margin())
+        )
+        batch = Batch(self.text)
+        batch.call(self.text, 'configure', {'state': tk.NORMAL})
+        batch.call(self.text, 'delete', '1.0', 'end')
+        batch.call(
+            self.text, 'insert', '1.0',
+            self.index.read(self.loaded.start, self.loaded.stop)
+        )
+        batch.call(self.text, 'configure', {'state': tk.DISABLED})
+        batch.call(self.text, 'yview', f'{top - self.loaded.start + 1}.0')
+        batch.flush()
+
+    def _on_scroll(self, first, _last_ignored):
+        # Called by Tk whenever the loaded lines scroll, whether by
+        # the mouse wheel, the keyboard or yview().
+        loaded = self.loaded
+        self.top = loaded.start + round(float(first) * len(loaded))
+        self._report()
+        edge = self._margin() // 2
+        near_start = loaded.start > 0 and self.top < loaded.start + edge
+        near_end = (loaded.stop < self.index.count
+                    and self.top + self.height > loaded.stop - edge)
+        if (near_start or near_end) and self.reloading is None:
+            self.reloading = self.text.after_idle(self._reload)
+
+    def _reload(self):
+        self.reloading = None
+        self._load(self.top)
+
+    def _fractions(self):
+        count = self.index.count
+        if count == 0:
+            return (0.0, 1.0)
+        return (self.top / count, min(count, self.top + self.height) / count)
+
+    def _report(self):
+        if self.yscrollcommand is not None:
+            self.yscrollcommand(*self._fractions())
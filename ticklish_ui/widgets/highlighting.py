@@ -0,0 +1,185 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Highlight the contents of a Text widget a little at a time.
+
+Highlighting a whole document after every keystroke takes longer the
+longer the document gets. A Highlighter instead keeps track of which
+lines have changed, using a TextProxy, and tokenizes only those lines
+while the UI is idle, a few milliseconds at a time, starting with the
+visible ones. Tags are applied with one tag add command per tag,
+carrying every range for that tag, rather than one command per token.
+
+"""
+import time
+from ticklish_ui.batch import Batch
+from ticklish_ui.widgets.textproxy import text_proxy
+
+class Highlighter:
+    """Applies tags to the lines of a Text widget as they change.
+
+    Tokenizing is done by a function taking the text of a line, and
+    the state at the end of the previous line, and returning a tuple
+    (tokens, state). tokens is an iterable of (tag, start, end)
+    tuples giving the columns to tag and state is anything the
+    tokenizer needs to continue with the next line, for instance
+    whether the line ended inside a multi-line string, or None. The
+    state before the first line is None. When a line's state changes
+    the following line is tokenized again too, so an edit is followed
+    for as many lines as it affects and no further.
+
+    Example:
+        def tokenize(line, state):
+            tokens = [
+                ('number', match.start(), match.end())
+                for match in re.finditer(r'\\d+', line)
+            ]
+            return (tokens, None)
+
+        text.tag_configure('number', foreground='blue')
+        Highlighter(text, tokenize)
+
+    Lines scrolled into view are tokenized before any others. Lines
+    whose previous line hasn't been tokenized yet are highlighted
+    using that line's last known state and are tokenized again once
+    the state is known.
+
+    """
+    # Maximum number of lines read from the widget at once.
+    CHUNK_SIZE = 200
+
+    def __init__(self, text, tokenize, budget=8):
+        """Start highlighting a Text widget.
+
+        Arguments:
+            text - a tkinter.Text
+            tokenize - the tokenizer function, described above
+            budget (optional) - an int, the maximum time in
+                                milliseconds to spend highlighting
+                                before letting the event loop run
+
+        """
+        self.tokenize = tokenize
+        self.budget = budget / 1000
+        self.proxy = text_proxy(text)
+        count = self.proxy.line_count()
+        self.states = [None] * count
+        self.clean = bytearray(count)
+        self.tags = set()
+        self.scheduled = None
+        self.proxy.edits.map(self._on_edit)
+        text.highlighter = self
+        self._schedule()
+
+    def set_tokenizer(self, tokenize):
+        """Replace the tokenizer function and highlight every line again."""
+        self.tokenize = tokenize
+        self.rehighlight()
+
+    def rehighlight(self):
+        """Tokenize every line again."""
+        self.clean = bytearray(len(self.clean))
+        self._schedule()
+
+    def _on_edit(self, edit):
+        first = edit.first - 1
+        last = first + edit.removed
+        # The last line keeps the state the replaced lines ended in,
+        # so the lines after the edit are only tokenized again if the
+        # edit changes it.
+        self.states[first:last] = (
+            [None] * (edit.added - 1) + self.states[last - 1:last]
+        )
+        self.clean[first:last] = bytes(edit.added)
+        self._schedule()
+
+    def _schedule(self):
+        if self.scheduled is None:
+            self.scheduled = self.proxy.text.after_idle(self._step)
+
+    def _step(self):
+        self.scheduled = None
+        if not self.proxy.text.winfo_exists():
+            return
+        deadline = time.perf_counter() + self.budget
+        (top, bottom) = self._visible_lines()
+        for (start, stop) in ((top, bottom), (0, len(self.clean))):
+            line = self.clean.find(0, start, stop)
+            while line != -1 and time.perf_counter() < deadline:
+                line = self.clean.find(0, self._highlight(line, stop), stop)
+        if self.clean.find(0) != -1:
+            self._schedule()
+
+    def _visible_lines(self):
+        call = self.proxy.call
+        top = call('index', '@0,0')
+        bottom = call('index', f'@0,{self.proxy.text.winfo_height()}')
+        return (_line(top) - 1, _line(bottom))
+
+    def _highlight(self, start, stop):
+        # Tokenize the run of dirty lines beginning at start and
+        # return the line after it.
+        end = self.clean.find(1, start, min(stop, start + self.CHUNK_SIZE))
+        if end == -1:
+            end = min(stop, start + self.CHUNK_SIZE)
+        lines = str(self.proxy.call(
+            'get', f'{start + 1}.0', f'{end}.end'
+        )).split('\n')
+        ranges = {tag: [] for tag in self.tags}
+        for (i, line) in enumerate(lines, start):
+            exact = i == 0 or self.clean[i - 1]
+            (tokens, state) = self.tokenize(
+                line, self.states[i - 1] if i else None
+            )
+            for (tag, first, last) in tokens:
+                ranges.setdefault(tag, []).extend(
+                    (f'{i + 1}.{first}', f'{i + 1}.{last}')
+                )
+            if exact:
+                self.clean[i] = 1
+                if state != self.states[i] and i + 1 < len(self.clean):
+                    self.clean[i + 1] = 0
+            self.states[i] = state
+        self.tags.update(ranges)
+        self._apply(ranges, start, end)
+        return end
+
+    def _apply(self, ranges, start, end):
+        text = self.proxy.text
+        batch = Batch(text)
+        for (tag, indices) in ranges.items():
+            batch.call(
+                text, 'tag', 'remove', tag, f'{start + 1}.0', f'{end}.end'
+            )
+            if indices:
+                batch.call(text, 'tag', 'add', tag, *indices)
+        batch.flush()
+
+def _line(index):
+    return int(str(index).split('.', maxsplit=1)[0])
@@ -29,9 +29,16 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 """Defines the ticklish_ui Listbox widget. """
+import bisect
+import collections.abc
+import functools
 import tkinter as tk
 import tkinter.ttk as ttk
-from ticklish_ui.widgets.factories import WidgetFactory
+from ticklish_ui.indexing import SubstringIndex
+from ticklish_ui.widgets.factories import WidgetFactory, manage_geometry
+from ticklish_ui.widgets.population import populate
+from ticklish_ui.widgets.sorting import SortKeys, sort_rows
+from ticklish_ui.widgets.virtual import VirtualRows
 
 class Listbox(WidgetFactory):
     """A wrapper for the tkinter.ttk.Treeview class.
@@ -40,19 +47,337 @@ class Listbox(WidgetFactory):
     iid property is set to be the same as its text so a call to the
     widget's focus() method will return the item text.
 
+    For very large lists set the 'virtual' option to True. A virtual
+    Listbox keeps its items in Python and only creates as many
+    Treeview items as it has rows (set with the 'height' option),
+    reusing them as the list scrolls. The focus() method still
+    returns the focused item's text. Attach a scrollbar using the
+    yview() method and yscrollcommand option as usual.
+
+    Example:
+        app = Application(
+            'Virtual Listbox',
+            [Listbox([f'Item {i}' for i in range(1000000)])
+             .options(name='items', virtual=True, height=20),
+             Scrollbar('vertical').options(name='bar')],
+        )
+
+        listbox = app.widgets['items']
+        scrollbar = app.widgets['bar']
+        scrollbar['command'] = listbox.yview
+        listbox['yscrollcommand'] = scrollbar.set
+
+    A virtual Listbox also provides the methods of VirtualRows, like
+    selected_indices(), and set_items() which replaces its contents.
+
+    If items is an iterator or generator, rather than a list, a
+    Listbox which isn't virtual is filled in chunks in the background
+    so the UI stays responsive. The 'budget' option sets the number of
+    milliseconds spent inserting items before the event loop is
+    allowed to run, 8 by default. Progress is reported through the
+    widget's progress stream. See populate() for details.
+
+    Example:
+        app = Application(
+            'Chunked Listbox',
+            [Listbox(f'Item {i}' for i in range(100000))
+             .options(name='items')],
+        )
+
+        (app.widgets['items'].progress
+         .filter(lambda progress: progress.done)
+         .map(lambda progress: print(f'{progress.count} items'))
+        )
+
+    Every Listbox has a set_filter() method which hides the items not
+    containing the given text, ignoring case. Filtering uses a
+    SubstringIndex so it stays fast for large lists, and when the new
+    text extends the previous filter only the items which matched
+    before are checked again. Filtering never recreates items:
+    non-matching items are detached from the Treeview and reattached
+    when the filter changes. An empty string removes the filter.
+    Items which arrive while a Listbox is still being filled are
+    filtered as they are inserted.
+
+    Example:
+        app = Application(
+            'Filtered Listbox',
+            [Entry().options(name='filter')],
+            [Listbox(words).options(name='words')],
+        )
+
+        (app.get_event_stream('<KeyRelease>')
+         .by_name('filter')
+         .map(lambda e: app.widgets['words'].set_filter(e.widget.get()))
+        )
+
+    Every Listbox also has a sort_by() method which reorders its
+    items, keeping the current filter and, for a virtual Listbox, the
+    selection. Sorting happens in Python and the Treeview is updated
+    with a single command. Keys are cached between sorts and can be
+    computed in a worker thread by passing threaded=True.
+
+    Example:
+        app.widgets['words'].sort_by(key=len, reverse=True)
+
     """
     def __init__(self, items):
         """ Initialize the Listbox.
 
         Arguments:
-            items - a list of strings to be displayed in the Listbox.
+            items - a list of strings to be displayed in the Listbox,
+                    or an iterator producing them.
         """
         super().__init__(ttk.Treeview)
         self.items = items
+        self.virtual = False
+        self.budget = 8
+
+    def options(self, **kwargs):
+        if 'virtual' in kwargs:
+            self.virtual = kwargs.pop('virtual')
+        if 'budget' in kwargs:
+            self.budget = kwargs.pop('budget')
+        return super().options(**kwargs)
 
     def create_widget(self, parent):
-        tree = super().create_widget(parent)
-        for i in range(len(self.items)):
-            tree.insert('', i, iid=self.items[i], text=self.items[i])
-        tree.pack(side=tk.LEFT)
+        if self.virtual:
+            yscrollcommand = self.kwargs.pop('yscrollcommand', None)
+            tree = super().create_widget(parent)
+            items = self.items
+            if isinstance(items, collections.abc.Iterator):
+                items = list(items)
+            _VirtualListbox(tree, items, yscrollcommand)
+        elif isinstance(self.items, collections.abc.Iterator):
+            tree = super().create_widget(parent)
+            items = []
+            progress = populate(tree, (
+                ('insert', '', 'end', {'id': item, 'text': item})
+                for item in _record(self.items, items)
+            ), self.budget)
+            progress.map(_ListboxItems(tree, items).hide_unmatched)
+        else:
+            tree = super().create_widget(parent)
+            for i in range(len(self.items)):
+                tree.insert('', i, iid=self.items[i], text=self.items[i])
+            _ListboxItems(tree, list(self.items))
+        manage_geometry(tree, 'pack', side=tk.LEFT)
         return tree
+
+def _record(iterator, items):
+    for item in iterator:
+        items.append(item)
+        yield item
+
+class _ListboxItems:
+    """Filters and sorts the items of a Listbox which isn't virtual."""
+    def __init__(self, treeview, items):
+        self.treeview = treeview
+        self.items = items
+        self.filter = _Filter(items)
+        self.keys = SortKeys()
+        treeview.set_filter = self.set_filter
+        treeview.sort_by = self.sort_by
+
+    def set_filter(self, text):
+        """Show only the items containing text."""
+        matches = self.filter.apply(text)
+        if matches is None:
+            matches = range(len(self.items))
+        ttk.Treeview.set_children(
+            self.treeview, '', *[self.items[i] for i in matches]
+        )
+
+    def hide_unmatched(self, _progress=None):
+        """Detach newly inserted items which don't match the filter."""
+        unmatched = self.filter.extend()
+        if unmatched:
+            ttk.Treeview.detach(
+                self.treeview, *[self.items[i] for i in unmatched]
+            )
+
+    def sort_by(self, key=None, reverse=False, threaded=False):
+        """Sort the items.
+
+        See SortKeys.order() and sort_rows() for the arguments.
+
+        """
+        count = len(self.items)
+
+        def reorder(order):
+            if len(self.items) != count:
+                self.sort_by(key, reverse, threaded)
+                return
+            self.items[:] = [self.items[i] for i in order]
+            query = self.filter.query
+            self.filter.reset(self.items)
+            self.set_filter(query)
+
+        sort_rows(
+            self.treeview,
+            functools.partial(
+                self.keys.order, [(item, item) for item in self.items],
+                key, reverse
+            ),
+            reorder,
+            threaded
+        )
+
+class _Filter:
+    """Tracks which items match a filter string."""
+    def __init__(self, items):
+        self.reset(items)
+
+    def reset(self, items):
+        """Start over with a new list of items."""
+        self.items = items
+        self.index = SubstringIndex()
+        self.query = ''
+        self.matches = None
+
+    def apply(self, query):
+        """Return the indices of the matching items.
+
+        Returns None, rather than every index, for an empty query.
+
+        """
+        if not query:
+            (self.query, self.matches) = ('', None)
+            return None
+        for i in range(len(self.index), len(self.items)):
+            self.index.add(i, self.items[i])
+        within = None
+        if self.matches is not None and self.query.casefold() in query.casefold():
+            within = self.matches
+        self.matches = self.index.search(query, within)
+        self.query = query
+        return self.matches
+
+    def extend(self):
+        """Match the items added since the filter was last applied.
+
+        The matching items are added to the current matches.
+
+        Returns:
+            A list of the indices of the new items which don't match,
+            always empty when there's no filter.
+
+        """
+        if self.matches is None:
+            return []
+        query = self.query.casefold()
+        unmatched = []
+        for i in range(len(self.index), len(self.items)):
+            self.index.add(i, self.items[i])
+            if query in self.index.text(i):
+                self.matches.append(i)
+            else:
+                unmatched.append(i)
+        return unmatched
+
+class _VirtualListbox(VirtualRows):
+    EXPORTS = VirtualRows.EXPORTS + (
+        'set_items', 'set_filter', 'sort_by', 'selected_items', 'focus'
+    )
+
+    def __init__(self, treeview, items, yscrollcommand=None):
+        self.items = items
+        self.filter = _Filter(items)
+        self.keys = SortKeys()
+        self.view = None
+        super().__init__(treeview, yscrollcommand)
+        self.set_count(len(items))
+
+    def row_data(self, index):
+        return {'text': self.items[self._item_index(index)]}
+
+    def set_items(self, items):
+        """Replace the items displayed by the Listbox."""
+        self.items = items
+        self.filter.reset(items)
+        self.view = None
+        self.selection.clear()
+        self.set_count(len(items))
+
+    def set_filter(self, text):
+        """Show only the items containing text."""
+        selected = [self._item_index(i) for i in self.selection]
+        self.view = self.filter.apply(text)
+        count = len(self.items if self.view is None else self.view)
+        if selected:
+            positions = self._positions()
+            self.selection.clear()
+            self.selection.resize(count)
+            self.selection.select(
+                positions[i] for i in selected if i in positions
+            )
+        self._offset = 0
+        self.set_count(count)
+
+    def sort_by(self, key=None, reverse=False, threaded=False):
+        """Sort the items.
+
+        See SortKeys.order() and sort_rows() for the arguments.
+
+        """
+        items = self.items
+
+        def reorder(order):
+            if self.items is not items:
+                self.sort_by(key, reverse, threaded)
+                return
+            moved = [0] * len(order)
+            for (position, index) in enumerate(order):
+                moved[index] = position
+            selected = [moved[self._item_index(i)] for i in self.selection]
+            query = self.filter.query
+            self.set_items([items[i] for i in order])
+            if query:
+                self.set_filter(query)
+            positions = self._positions()
+            self.selection.select(
+                positions[i] for i in selected if i in positions
+            )
+
+        sort_rows(
+            self.treeview,
+            functools.partial(
+                self.keys.order, [(item, item) for item in items],
+                key, reverse
+            ),
+            reorder,
+            threaded
+        )
+
+    def selected_items(self):
+        """Return the selected items, in order."""
+        return [
+            self.items[self._item_index(i)] for i in self.selected_indices()
+        ]
+
+    def focus(self, item=None):
+        """Query or set the focused item by its text.
+
+        Setting the focus to an item hidden by the filter does nothing.
+
+        """
+        if item is None:
+            index = self.index_of(ttk.Treeview.focus(self.treeview))
+            return '' if index is None else self.items[self._item_index(index)]
+        position = self.items.index(item)
+        if self.view is not None:
+            # The view lists the indices of the matching items in order.
+            index = position
+            position = bisect.bisect_left(self.view, index)
+            if position == len(self.view) or self.view[position] != index:
+                return ''
+        row = self.see_index(position)
+        return ttk.Treeview.focus(self.treeview, row)
+
+    def _item_index(self, position):
+        return position if self.view is None else self.view[position]
+
+    def _positions(self):
+        if self.view is None:
+            return {i: i for i in range(len(self.items))}
+        return {item: position for (position, item) in enumerate(self.view)}
@@ -0,0 +1,116 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Fill widgets a chunk at a time without blocking the UI.
+
+Inserting a large number of items into a widget all at once freezes
+the UI until every item has been inserted. populate() instead inserts
+items in chunks, each limited to a small time budget, giving tkinter
+the chance to handle events and redraw in between.
+
+"""
+import collections
+import itertools
+import time
+import ticklish_ui.events as events
+from ticklish_ui.batch import Batch
+
+class Progress(collections.namedtuple('Progress', 'widget count done')):
+    """A progress report from populate().
+
+    Attributes:
+        widget - the widget being populated
+        count - an int, the number of items inserted so far
+        done - a bool, True once every item has been inserted
+
+    """
+
+def populate(widget, commands, budget=8, chunk_size=64):
+    """Run widget commands a chunk at a time.
+
+    The widget gets a progress attribute, an EventStream, which
+    receives a Progress object after every chunk. The last one has
+    its done attribute set to True.
+
+    Example:
+        (listbox.progress
+         .filter(lambda p: p.done)
+         .map(lambda p: print(f'Inserted {p.count} items'))
+        )
+
+    Population starts the next time the event loop runs so there's
+    time to attach to the progress stream after calling populate().
+
+    Arguments:
+        widget - the widget to populate
+        commands - an iterable of tuples, each one a widget command
+                   and its arguments as accepted by Batch.call()
+        budget (optional) - an int, the maximum time in milliseconds
+                            to spend inserting items before letting
+                            the event loop run
+        chunk_size (optional) - an int, the number of commands sent
+                                to Tcl at a time
+
+    Returns:
+        The progress EventStream.
+
+    """
+    widget.progress = events.EventStream()
+    _Population(widget, iter(commands), budget, chunk_size).schedule()
+    return widget.progress
+
+class _Population:
+    def __init__(self, widget, commands, budget, chunk_size):
+        self.widget = widget
+        self.commands = commands
+        self.budget = budget / 1000
+        self.chunk_size = chunk_size
+        self.count = 0
+
+    def schedule(self):
+        """Run the next chunk once the event loop has had a turn."""
+        self.widget.after(1, self.step)
+
+    def step(self):
+        """Insert items until the time budget runs out."""
+        if not self.widget.winfo_exists():
+            return
+        deadline = time.perf_counter() + self.budget
+        done = False
+        while not done and time.perf_counter() < deadline:
+            batch = Batch(self.widget)
+            for command in itertools.islice(self.commands, self.chunk_size):
+                batch.call(self.widget, *command)
+            done = len(batch) < self.chunk_size
+            self.count += len(batch)
+            batch.flush()
+        self.widget.progress.insert(Progress(self.widget, self.count, done))
+        if not done:
+            self.schedule()
@@ -32,7 +32,7 @@
 import tkinter as tk
 import tkinter.ttk as ttk
 from ticklish_ui.widgets.frames import Frame
-from ticklish_ui.widgets.factories import WidgetFactory
+from ticklish_ui.widgets.factories import WidgetFactory, register
 
 class Radiobutton(WidgetFactory):
     """ Wrapper for the tkinter.ttk.Radiobutton class. """
@@ -90,14 +90,16 @@ class RadioGroup(Frame):
             button_rows.append(buttons)
         super().__init__(*button_rows)
         self.kwargs['name'] = group_name
+        self.group_name = group_name
 
     def create_widget(self, parent):
         widget = super().create_widget(parent)
         widget.variable = tk.StringVar()
-        for row in widget.winfo_children():
-            for button in row.winfo_children():
+        for row in widget.widget_rows.values():
+            for button in row:
                 button.configure(variable=widget.variable)
                 tags = list(button.bindtags())
                 tags.insert(1, 'TRadiobutton')
                 button.bindtags(tags)
+                register(button, group=self.group_name)
         return widget
@@ -0,0 +1,397 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Draw dense data into an image rather than as Canvas items.
+
+Every Canvas item costs memory and redraw time, so a scatter plot of
+a million points can't be drawn as a million ovals. A Raster instead
+renders points and heatmaps into an RGBA pixel buffer, which a
+RasterLayer shows on a Canvas as a single image item. Sending the
+buffer to Tk is one call, with the pixels encoded as a PNG, so the
+number of Tk items stays the same however much data there is, and
+ordinary Canvas items can still be drawn on top.
+
+The buffer is a NumPy array when NumPy is installed, and drawing is
+vectorized. Without NumPy it's a bytearray and drawing is much
+slower.
+
+"""
+import math
+import struct
+import tkinter as tk
+import zlib
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Evenly spaced colors of the default colormap, from low to high.
+_VIRIDIS = [
+    (68, 1, 84), (59, 82, 139), (33, 145, 140), (94, 201, 98),
+    (253, 231, 37),
+]
+
+def encode_png(pixels, width, height, level=1):
+    """Return RGBA pixels encoded as a PNG image.
+
+    Arguments:
+        pixels - bytes, 4 per pixel, row by row from the top left
+        width - an int
+        height - an int
+        level (optional) - the zlib compression level. The default,
+                           1, is the fastest.
+
+    """
+    stride = 4 * width
+    rows = b''.join(
+        b'\0' + pixels[row * stride:(row + 1) * stride]
+        for row in range(height)
+    )
+    return b''.join([
+        b'\x89PNG\r\n\x1a\n',
+        _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)),
+        _chunk(b'IDAT', zlib.compress(rows, level)),
+        _chunk(b'IEND', b''),
+    ])
+
+def _chunk(kind, data):
+    checksum = zlib.crc32(kind + data) & 0xffffffff
+    return struct.pack('>I', len(data)) + kind + data + struct.pack(
+        '>I', checksum
+    )
+
+class Raster:
+    """An RGBA pixel buffer for drawing points and heatmaps.
+
+    Colors are (red, green, blue) or (red, green, blue, alpha)
+    tuples of ints from 0 to 255. Colormaps are sequences of colors,
+    evenly spaced from the lowest value to the highest, and default
+    to viridis.
+
+    Points are given in data coordinates, mapped to the buffer by an
+    extent: an (x_min, y_min, x_max, y_max) tuple of the data shown,
+    with y_max at the top as on a chart. Without an extent points are
+    in pixels, counting from the top left.
+
+    Example:
+        raster = Raster(400, 300)
+        raster.clear((255, 255, 255))
+        raster.scatter(xs, ys, (0, 0, 255), extent=(0, 0, 1, 1))
+        png = raster.png()
+
+    """
+    def __init__(self, width, height):
+        """Initialize the Raster, fully transparent.
+
+        Arguments:
+            width - an int
+            height - an int
+
+        """
+        self.width = width
+        self.height = height
+        if numpy is not None:
+            self.pixels = numpy.zeros((height, width, 4), numpy.uint8)
+        else:
+            self.pixels = bytearray(4 * width * height)
+
+    def clear(self, color=(0, 0, 0, 0)):
+        """Set every pixel to color."""
+        color = _rgba(color)
+        if numpy is not None:
+            self.pixels[:, :] = color
+        else:
+            self.pixels[:] = bytes(color) * (self.width * self.height)
+
+    def scatter(self, xs, ys, color, extent=None, size=1):
+        """Draw a square of size pixels for each point.
+
+        Arguments:
+            xs, ys - sequences of the points' coordinates
+            color - the points' color
+            extent (optional) - the extent of the data
+            size (optional) - an int, the width of each point
+
+        """
+        color = _rgba(color)
+        (columns, rows) = self._to_pixels(xs, ys, extent)
+        offsets = range(-(size // 2), size - size // 2)
+        for dx in offsets:
+            for dy in offsets:
+                self._put(columns, rows, color, (dx, dy))
+
+    def lines(self, segments, color, extent=None):
+        """Draw one pixel wide line segments.
+
+        Arguments:
+            segments - a sequence of (x1, y1, x2, y2) rows, or a two
+                       dimensional NumPy array
+            color - the lines' color
+            extent (optional) - the extent of the data
+
+        """
+        color = _rgba(color)
+        if numpy is not None:
+            segments = numpy.asarray(segments, numpy.float64).reshape(-1, 4)
+            (x1, y1, x2, y2) = segments.T
+        else:
+            (x1, y1, x2, y2) = zip(*segments) if segments else ((),) * 4
+        start = self._to_pixels(x1, y1, extent)
+        end = self._to_pixels(x2, y2, extent)
+        self._put(*_interpolate(*start, *end), color, (0, 0))
+
+    def fill_rect(self, rect, color, extent=None):
+        """Fill a rectangle, given as (x1, y1, x2, y2), with color."""
+        color = _rgba(color)
+        (columns, rows) = self._to_pixels(rect[0::2], rect[1::2], extent)
+        (left, right) = (max(0, min(columns)),
+                         min(self.width, max(columns) + 1))
+        (top, bottom) = (max(0, min(rows)), min(self.height, max(rows) + 1))
+        if left >= right or top >= bottom:
+            return
+        if numpy is not None:
+            self.pixels[top:bottom, left:right] = color
+            return
+        for row in range(top, bottom):
+            start = 4 * (row * self.width + left)
+            self.pixels[start:start + 4 * (right - left)] = (
+                bytes(color) * (right - left)
+            )
+
+    def density(self, xs, ys, extent=None, colormap=None):
+        """Draw the number of points at each pixel with a colormap.
+
+        Counts are shown on a log scale, so single points stay
+        visible next to dense clusters. Pixels with no points are
+        left unchanged.
+
+        Arguments:
+            xs, ys - sequences of the points' coordinates
+            extent (optional) - the extent of the data
+            colormap (optional) - a sequence of colors
+
+        """
+        (columns, rows) = self._to_pixels(xs, ys, extent)
+        if numpy is not None:
+            inside = self._inside(columns, rows)
+            counts = numpy.bincount(
+                rows[inside] * self.width + columns[inside],
+                minlength=self.width * self.height,
+            ).reshape(self.height, self.width)
+            self._paint(numpy.log1p(counts), counts > 0, colormap)
+            return
+        counts = [0] * (self.width * self.height)
+        for (column, row) in zip(columns, rows):
+            if 0 <= column < self.width and 0 <= row < self.height:
+                counts[row * self.width + column] += 1
+        self._paint([math.log1p(count) for count in counts],
+                    [count > 0 for count in counts], colormap)
+
+    def heatmap(self, values, value_range=None, colormap=None):
+        """Fill the buffer with a grid of values.
+
+        The grid is stretched to cover the whole buffer.
+
+        Arguments:
+            values - a two dimensional sequence, a list of rows from
+                     the top, or a NumPy array. NaN values are left
+                     unchanged.
+            value_range (optional) - the (lowest, highest) values
+                                     of the colormap. Defaults to the
+                                     range of values.
+            colormap (optional) - a sequence of colors
+
+        """
+        if numpy is not None:
+            values = numpy.asarray(values, dtype=numpy.float64)
+            rows = numpy.arange(self.height) * values.shape[0] // self.height
+            columns = numpy.arange(self.width) * values.shape[1] // self.width
+            grid = values[rows][:, columns]
+            self._paint(grid, ~numpy.isnan(grid), colormap, value_range)
+            return
+        values = [list(row) for row in values]
+        grid = [
+            values[row * len(values) // self.height]
+            [column * len(values[0]) // self.width]
+            for row in range(self.height) for column in range(self.width)
+        ]
+        self._paint(grid, [not math.isnan(value) for value in grid], colormap,
+                    value_range)
+
+    def png(self):
+        """Return the buffer encoded as a PNG image."""
+        return encode_png(bytes(self.pixels), self.width, self.height)
+
+    def _to_pixels(self, xs, ys, extent):
+        if extent is None:
+            (x_scale, y_scale, x_min, y_max) = (1, -1, 0, 0)
+        else:
+            (x_min, y_min, x_max, y_max) = extent
+            x_scale = self.width / (x_max - x_min)
+            y_scale = self.height / (y_max - y_min)
+        if numpy is not None:
+            xs = numpy.asarray(xs, dtype=numpy.float64)
+            ys = numpy.asarray(ys, dtype=numpy.float64)
+            return (numpy.floor((xs - x_min) * x_scale).astype(numpy.int64),
+                    numpy.floor((y_max - ys) * y_scale).astype(numpy.int64))
+        return ([math.floor((x - x_min) * x_scale) for x in xs],
+                [math.floor((y_max - y) * y_scale) for y in ys])
+
+    def _inside(self, columns, rows):
+        return ((columns >= 0) & (columns < self.width)
+                & (rows >= 0) & (rows < self.height))
+
+    def _put(self, columns, rows, color, offset):
+        (dx, dy) = offset
+        if numpy is not None:
+            (columns, rows) = (columns + dx, rows + dy)
+            inside = self._inside(columns, rows)
+            self.pixels[rows[inside], columns[inside]] = color
+            return
+        for (column, row) in zip(columns, rows):
+            (column, row) = (column + dx, row + dy)
+            if 0 <= column < self.width and 0 <= row < self.height:
+                start = 4 * (row * self.width + column)
+                self.pixels[start:start + 4] = bytes(color)
+
+    def _paint(self, grid, mask, colormap, value_range=None):
+        # Color the pixels where mask is true by the values in grid.
+        table = _colormap(colormap)
+        if numpy is not None:
+            indices = _indices(grid[mask], value_range)
+            self.pixels[mask] = numpy.array(table, numpy.uint8)[indices]
+            return
+        shown = [value for (value, keep) in zip(grid, mask) if keep]
+        positions = [i for (i, keep) in enumerate(mask) if keep]
+        for (i, index) in zip(positions, _indices(shown, value_range)):
+            self.pixels[4 * i:4 * i + 4] = bytes(table[index])
+
+def _indices(values, value_range):
+    # Return the colormap entries, from 0 to 255, for values.
+    if value_range is None and len(values) == 0:
+        value_range = (0, 1)
+    elif value_range is None:
+        value_range = (min(values), max(values))
+    (low, high) = value_range
+    scale = 255 / ((high - low) or 1)
+    if numpy is not None:
+        scaled = (values - low) * scale
+        return numpy.clip(scaled, 0, 255).astype(numpy.intp)
+    return [min(255, max(0, int((value - low) * scale))) for value in values]
+
+def _interpolate(columns, rows, ends, end_rows):
+    # Return the pixels along lines from (columns, rows) to (ends,
+    # end_rows), one per step in the longer direction.
+    if numpy is not None:
+        steps = numpy.maximum(abs(ends - columns), abs(end_rows - rows)) + 1
+        line = numpy.repeat(numpy.arange(len(steps)), steps)
+        position = numpy.arange(steps.sum()) - numpy.repeat(
+            numpy.cumsum(steps) - steps, steps
+        )
+        fraction = position / numpy.maximum(steps - 1, 1)[line]
+        return (
+            numpy.rint(columns[line] + (ends - columns)[line] * fraction)
+            .astype(numpy.int64),
+            numpy.rint(rows[line] + (end_rows - rows)[line] * fraction)
+            .astype(numpy.int64),
+        )
+    (xs, ys) = ([], [])
+    for (x1, y1, x2, y2) in zip(columns, rows, ends, end_rows):
+        steps = max(abs(x2 - x1), abs(y2 - y1))
+        for step in range(steps + 1):
+            fraction = step / (steps or 1)
+            xs.append(round(x1 + (x2 - x1) * fraction))
+            ys.append(round(y1 + (y2 - y1) * fraction))
+    return (xs, ys)
+
+def _rgba(color):
+    return tuple(color) + (255,) * (4 - len(color))
+
+def _colormap(stops):
+    # Interpolate a sequence of colors into a table of 256.
+    stops = [_rgba(color) for color in (stops or _VIRIDIS)]
+    if len(stops) == 1:
+        return stops * 256
+    table = []
+    for i in range(256):
+        position = i * (len(stops) - 1) / 255
+        (index, fraction) = (min(int(position), len(stops) - 2),
+                             position - min(int(position), len(stops) - 2))
+        (start, end) = (stops[index], stops[index + 1])
+        table.append(tuple(
+            round(a + (b - a) * fraction) for (a, b) in zip(start, end)
+        ))
+    return table
+
+class RasterLayer(Raster):
+    """A Raster shown on a Canvas as an image item.
+
+    The image is placed below every other item on the Canvas, so
+    lines, text and other items can be drawn over it. Nothing
+    changes on screen until show() is called, which sends the whole
+    buffer to Tk in one call.
+
+    Keep a reference to the layer: as with any tkinter PhotoImage,
+    the image disappears if it's garbage collected.
+
+    Example:
+        layer = canvas.raster_layer(640, 480)
+        layer.density(xs, ys, extent=(-3, -3, 3, 3))
+        layer.show()
+        canvas.create_text(320, 20, text='1,000,000 points')
+
+    """
+    def __init__(self, canvas, width, height, position=(0, 0), tags=()):
+        """Create the layer's image on a Canvas.
+
+        Arguments:
+            canvas - a tkinter.Canvas
+            width, height - the size of the layer in pixels
+            position (optional) - the (x, y) canvas coordinates of the
+                                  layer's top left corner
+            tags (optional) - tags for the image item
+
+        """
+        super().__init__(width, height)
+        self.canvas = canvas
+        self.image = tk.PhotoImage(master=canvas, width=width, height=height)
+        self.item = canvas.create_image(
+            *position, image=self.image, anchor=tk.NW, tags=tags
+        )
+        canvas.tag_lower(self.item)
+
+    def show(self):
+        """Show the current contents of the buffer."""
+        self.image.configure(data=self.png(), format='png')
+
+    def remove(self):
+        """Delete the layer's image from the Canvas."""
+        self.canvas.delete(self.item)
+        self.image = None
@@ -0,0 +1,284 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Keep Canvas items in step with model objects.
+
+Redrawing a Canvas by deleting every item and creating them all again
+costs time proportional to the whole scene, however little of it
+changed. A Scene instead remembers which item draws each object and
+how it was last drawn, so redrawing only sends the coords and
+itemconfigure calls needed for the objects which actually changed,
+all in one script. Tk then only repaints the regions those items
+cover.
+
+"""
+from ticklish_ui.batch import Batch
+
+def canvas_scene(canvas, layers=()):
+    """Return the Scene for a Canvas, creating it if needed.
+
+    Arguments:
+        canvas - a tkinter.Canvas
+        layers (optional) - a sequence of layer names, bottom first,
+                            used when creating the Scene.
+
+    Example:
+        scene = canvas_scene(canvas, layers=['edges', 'vertices'])
+
+    """
+    scene = getattr(canvas, 'retained_scene', None)
+    if scene is None:
+        scene = canvas.retained_scene = Scene(canvas, layers)
+    return scene
+
+class Scene:
+    """A retained set of Canvas items, one per model object.
+
+    Each object is drawn with draw(), giving the type of item, its
+    coordinates, its options and the layer it belongs to, and
+    removed with erase(). Objects are matched by identity, so any
+    object can be drawn, including ones which can't be hashed like
+    most dataclasses. Calling draw() again for an object updates its
+    item; there's no need to erase it first.
+
+    Changes are sent to Tk together, the next time the application
+    is idle or when flush() is called.
+
+    Layers are drawn in the order they're listed in the layers
+    attribute, bottom first, with layers used for the first time
+    added to the top. Every item is tagged with the name of its
+    layer, so whole layers can be changed with a single call, either
+    with configure_layer() or directly on the Canvas.
+
+    Example:
+        scene = canvas.scene(layers=['edges', 'vertices'])
+
+        def redraw(graph):
+            for vertex in graph.vertices:
+                (x, y) = (vertex.x, vertex.y)
+                scene.draw(vertex, 'oval', (x - 3, y - 3, x + 3, y + 3),
+                           layer='vertices', fill='black')
+            for edge in graph.edges:
+                scene.draw(edge, 'line', (edge.start.x, edge.start.y,
+                                          edge.end.x, edge.end.y),
+                           layer='edges')
+
+    """
+    def __init__(self, canvas, layers=()):
+        """Initialize the Scene.
+
+        Arguments:
+            canvas - a tkinter.Canvas
+            layers (optional) - a sequence of layer names, bottom
+                                first.
+
+        """
+        self.canvas = canvas
+        self.layers = list(layers)
+        self.batch = Batch(canvas)
+        self._entries = {}
+        self._objects = {}
+        self._dirty = {}
+        self._after_id = None
+
+    def draw(self, obj, kind, coords, layer='default', **options):
+        """Draw, or redraw, an object.
+
+        Arguments:
+            obj - the object drawn
+            kind - the type of Canvas item: 'line', 'oval' and so on
+            coords - the item's coordinates, either flat, as in
+                     (x1, y1, x2, y2), or as pairs
+            layer (optional) - the name of the item's layer
+            **options - the item's options. Options left out when
+                        redrawing an object keep their values.
+
+        """
+        if layer not in self.layers:
+            self.layers.append(layer)
+        tags = options.get('tags', ())
+        if isinstance(tags, str):
+            tags = self.canvas.tk.splitlist(tags)
+        options['tags'] = (layer,) + tuple(tags)
+        entry = self._entries.get(id(obj))
+        if entry is None:
+            entry = self._entries[id(obj)] = _Entry(obj)
+        elif entry.wanted is not None:
+            options = {**entry.wanted[3], **options}
+        entry.wanted = (kind, _flatten(coords), layer, options)
+        self._mark(entry)
+
+    def erase(self, obj):
+        """Remove an object's item. Unknown objects are ignored."""
+        entry = self._entries.get(id(obj))
+        if entry is not None:
+            entry.wanted = None
+            self._mark(entry)
+
+    def clear(self):
+        """Remove every object's item."""
+        for entry in self._entries.values():
+            entry.wanted = None
+            self._mark(entry)
+
+    def item(self, obj):
+        """Return the id of an object's item, or None if it has none.
+
+        Objects drawn since the last flush have no item yet.
+
+        """
+        entry = self._entries.get(id(obj))
+        return None if entry is None else entry.item
+
+    def object_at(self, item):
+        """Return the object drawn by an item, or None."""
+        return self._objects.get(int(item))
+
+    def configure_layer(self, layer, **options):
+        """Set options for every item in a layer with one call.
+
+        Example:
+            scene.configure_layer('edges', fill='gray')
+
+        """
+        for entry in self._entries.values():
+            for state in (entry.wanted, entry.drawn):
+                if state is not None and state[2] == layer:
+                    state[3].update(options)
+        self.batch.itemconfigure(self.canvas, layer, **options)
+        self._schedule()
+
+    def flush(self):
+        """Send every change since the last flush to Tk."""
+        if self._after_id is not None:
+            self.canvas.after_cancel(self._after_id)
+            self._after_id = None
+        canvas = self.canvas
+        batch = self.batch
+        creates = []
+        lowest = len(self.layers)
+        for entry in self._dirty.values():
+            (wanted, drawn) = (entry.wanted, entry.drawn)
+            if entry.stale():
+                batch.call(canvas, 'delete', entry.item)
+                del self._objects[entry.item]
+                entry.item = None
+            if wanted is None:
+                del self._entries[id(entry.obj)]
+            elif entry.item is None:
+                creates.append(entry)
+            else:
+                self._update(entry)
+                if wanted[2] != drawn[2]:
+                    lowest = min(lowest, self.layers.index(wanted[2]))
+            entry.drawn = wanted
+        self._dirty = {}
+        order = {layer: i for (i, layer) in enumerate(self.layers)}
+        creates.sort(key=lambda entry: order[entry.wanted[2]])
+        for entry in creates:
+            (kind, coords, layer, options) = entry.wanted
+            batch.call(canvas, 'create', kind, coords, options)
+            lowest = min(lowest, order[layer])
+        last = batch.flush()
+        # Items are numbered consecutively and the creates come last,
+        # so the id of the last item gives the ids of the rest.
+        for (i, entry) in enumerate(creates, int(last or 0) - len(creates)):
+            entry.item = i + 1
+            self._objects[entry.item] = entry.obj
+        # New items are created on top of every layer. Raising each
+        # layer above theirs, in order, puts them back underneath.
+        for layer in self.layers[lowest + 1:]:
+            batch.call(canvas, 'raise', layer)
+        batch.flush()
+
+    def _update(self, entry):
+        (coords, options) = entry.changes()
+        if coords is not None:
+            self.batch.coords(self.canvas, entry.item, *coords)
+        if options:
+            self.batch.itemconfigure(self.canvas, entry.item, **options)
+
+    def _mark(self, entry):
+        self._dirty[id(entry.obj)] = entry
+        self._schedule()
+
+    def _schedule(self):
+        if self._after_id is None:
+            self._after_id = self.canvas.after_idle(self._flush_idle)
+
+    def _flush_idle(self):
+        self._after_id = None
+        self.flush()
+
+class _Entry:
+    """How an object should be drawn and how it was last drawn.
+
+    Both are (kind, coords, layer, options) tuples, or None.
+
+    """
+    __slots__ = ('obj', 'item', 'wanted', 'drawn')
+
+    def __init__(self, obj):
+        self.obj = obj
+        self.item = None
+        self.wanted = None
+        self.drawn = None
+
+    def stale(self):
+        """Return True if the item must be deleted."""
+        return self.item is not None and (
+            self.wanted is None or _kind(self.wanted) != _kind(self.drawn)
+        )
+
+    def changes(self):
+        """Return the new coords, or None, and the changed options."""
+        return _changes(self.wanted, self.drawn)
+
+def _kind(state):
+    return state[0]
+
+def _changes(wanted, drawn):
+    (_, coords, _, options) = wanted
+    (_, drawn_coords, _, drawn_options) = drawn
+    changed = {
+        name: value for (name, value) in options.items()
+        if drawn_options.get(name) != value
+    }
+    return (None if coords == drawn_coords else coords, changed)
+
+def _flatten(coords):
+    if hasattr(coords, 'tolist'):
+        coords = coords.tolist()
+    flat = []
+    for value in coords:
+        if isinstance(value, (list, tuple)):
+            flat.extend(float(v) for v in value)
+        else:
+            flat.append(float(value))
+    return tuple(flat)
@@ -32,6 +32,7 @@
 import tkinter as tk
 import tkinter.ttk as ttk
 from ticklish_ui.widgets.factories import WidgetFactory, ContainerFactory
+from ticklish_ui.widgets.factories import after_layout, manage_geometry, register
 
 class Scrollbar(WidgetFactory):
     """ Wrapper for the tkinter.ttk.Scrollbar class. """
@@ -121,6 +122,8 @@ class Scrollable(ContainerFactory):
                 self.vertical = kwargs[key]
             elif key == 'horizontal':
                 self.horizontal = kwargs[key]
+            elif key == 'layout':
+                self.layout = kwargs[key]
             elif key == 'tags':
                 new_tags = f"{self.kwargs['tags']} {kwargs['tags']}"
                 self.kwargs[key] = new_tags
@@ -135,13 +138,16 @@ class Scrollable(ContainerFactory):
         )
         tags = tuple(self.kwargs['tags'].strip().split(' '))
         canvas.bindtags(tags + canvas.bindtags())
+        register(scrollable, tags)
+        register(canvas, tags)
         content = super().create_widget(canvas)
         if self.vertical:
             v_bar = ttk.Scrollbar(
                 scrollable, name='verticalscroll',
                 orient='vertical', command=canvas.yview
             )
-            v_bar.grid(row=0, column=1, sticky='ns')
+            manage_geometry(v_bar, 'grid', row=0, column=1, sticky='ns')
+            register(v_bar)
             canvas['yscrollcommand'] = v_bar.set
 
 
@@ -150,13 +156,15 @@ class Scrollable(ContainerFactory):
                 scrollable, name='horizontalscroll',
                 orient='horizontal', command=canvas.xview
             )
-            h_bar.grid(row=1, column=0, sticky='ew')
+            manage_geometry(h_bar, 'grid', row=1, column=0, sticky='ew')
+            register(h_bar)
             canvas['xscrollcommand'] = h_bar.set
 
-        scrollable.pack(fill='both')
-        canvas.grid(row=0, column=0)
+        manage_geometry(scrollable, 'pack', fill='both')
+        manage_geometry(canvas, 'grid', row=0, column=0)
         canvas.create_window(0, 0, anchor='nw', window=content)
 
-        scrollable.update_idletasks()
-        canvas['scrollregion'] = canvas.bbox('all')
+        def set_scrollregion():
+            canvas['scrollregion'] = canvas.bbox('all')
+        after_layout(scrollable, set_scrollregion)
         return scrollable
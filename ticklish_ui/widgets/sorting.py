@@ -0,0 +1,149 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Sort the rows of a widget on the Python side.
+
+Sorting the contents of a Treeview by reading every value back out of
+Tk, and moving each item into place one command at a time, costs a
+round trip to Tcl per row. SortKeys.order() instead sorts values
+already held in Python and returns the new order so the widget can be
+rearranged with a single script. Keys can be expensive to compute so
+they're remembered between sorts and, using sort_rows(), can be
+computed in a worker thread while the UI keeps running.
+
+"""
+import collections
+import concurrent.futures
+import threading
+
+# Milliseconds between checks for a threaded sort finishing.
+_POLL_INTERVAL = 10
+
+_WORKER = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+class SortKeys:
+    """Remembers the keys computed for rows when sorting them.
+
+    Keys are stored for each row along with the value they were
+    computed from and are only computed again when that value
+    changes. Keys for the SIZE most recently used key functions are
+    kept.
+
+    """
+    SIZE = 4
+
+    def __init__(self):
+        self.caches = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def compute(self, key, rows):
+        """Return a dict mapping each row id to a (value, key) tuple.
+
+        Arguments:
+            key - a function taking a value and returning its sort
+                  key, or None to sort on the values themselves
+            rows - an iterable of (row id, value) tuples
+
+        """
+        with self.lock:
+            cache = self.caches.pop(key, {})
+        keys = {}
+        for (row, value) in rows:
+            cached = cache.get(row)
+            if cached is None or cached[0] != value:
+                cached = (value, value if key is None else key(value))
+            keys[row] = cached
+        with self.lock:
+            self.caches[key] = keys
+            while len(self.caches) > self.SIZE:
+                self.caches.popitem(last=False)
+        return keys
+
+    def order(self, rows, key=None, reverse=False):
+        """Return the order rows sort in, as a list of indices into rows.
+
+        Sorting is stable so rows with equal keys keep their relative
+        order.
+
+        Arguments:
+            rows - a sequence of (row id, value) tuples
+            key (optional) - a function taking a value and returning
+                             its sort key, the value itself is used
+                             by default
+            reverse (optional) - a bool, True to sort in descending
+                                 order
+
+        """
+        keys = self.compute(key, rows)
+        return sorted(
+            range(len(rows)),
+            key=lambda i: keys[rows[i][0]][1],
+            reverse=reverse
+        )
+
+def sort_rows(widget, order, callback, threaded=False):
+    """Run a sort and pass the new order to callback.
+
+    Typically order is SortKeys.order() with its arguments bound:
+
+    Example:
+        sort_rows(
+            treeview,
+            functools.partial(keys.order, rows, key=int, reverse=True),
+            reorder,
+            threaded=True
+        )
+
+    If threaded is True order is run in a worker thread shared by all
+    widgets. The callback is still run from the event loop, once
+    sorting is done, so it's safe for it to update widgets. Anything
+    the key function needs must be safe to use from another thread;
+    in particular it mustn't use tkinter. An exception raised while
+    sorting is re-raised in the event loop.
+
+    Arguments:
+        widget - the widget being sorted
+        order - a function taking no arguments and returning the
+                sorted order
+        callback - a function taking the sorted order
+        threaded (optional) - a bool, True to sort in a worker thread
+
+    """
+    if not threaded:
+        callback(order())
+        return
+    future = _WORKER.submit(order)
+
+    def poll():
+        if not future.done():
+            widget.after(_POLL_INTERVAL, poll)
+        elif widget.winfo_exists():
+            callback(future.result())
+
+    widget.after(_POLL_INTERVAL, poll)
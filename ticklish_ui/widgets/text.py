@@ -29,11 +29,72 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 """Defines the ticklish_ui Text widget. """
+import functools
 import tkinter as tk
+from ticklish_ui.batch import Batch
 from ticklish_ui.widgets.factories import WidgetFactory
+from ticklish_ui.widgets.fileview import FileView
+from ticklish_ui.widgets.highlighting import Highlighter
+from ticklish_ui.widgets.textsearch import search_index
 
 class Text(WidgetFactory):
-    """ Wrapper for the tkinter.Text class. """
+    """ Wrapper for the tkinter.Text class.
+
+    Setting the 'max_lines' or 'append_stream' option turns the Text
+    into a log viewer. Lines are added with the widget's append()
+    method, or by inserting them into the append_stream, and are
+    collected and written to the widget at most once per frame,
+    however quickly they arrive. Once there are more than max_lines
+    lines the oldest ones are deleted, in bulk, as new ones are added
+    so the widget never grows without limit. The view only follows
+    new lines if it was already scrolled to the end; otherwise it's
+    left alone so earlier lines can be read.
+
+    Example:
+        log = Stream()
+
+        app = Application(
+            'Log',
+            [Text().options(max_lines=10000, append_stream=log)],
+        )
+
+        log.insert('Service started')
+
+    Setting the 'file' option to a path shows that file, read only,
+    without loading it into the widget. The file is memory mapped and
+    only the lines around the visible ones are put in the widget, so
+    even files of many gigabytes open immediately. The 'encoding'
+    option gives the file's encoding, UTF-8 by default, which must be
+    ASCII compatible. See FileView for details.
+
+    Example:
+        app = Application(
+            'Viewer',
+            [Text().options(name='view', file='server.log'),
+             Scrollbar('vertical').options(name='bar')],
+        )
+
+        view = app.widgets['view']
+        app.widgets['bar']['command'] = view.yview
+        view['yscrollcommand'] = app.widgets['bar'].set
+        view.goto_line(1000000)
+
+    Setting the 'highlighter' option to a tokenizer function
+    highlights the text as it changes, tokenizing only the changed
+    lines while the UI is idle. The tags the tokenizer returns are
+    configured as usual with tag_configure(). See Highlighter for
+    details.
+
+    The widget's search_index() method returns a TextSearch which
+    indexes the widget's lines and keeps up with every change to
+    them, so finding or highlighting every occurrence of a string
+    only looks at the lines which can contain it.
+
+    Example:
+        text.search_index().highlight_all('error', tag='found')
+        text.tag_configure('found', background='yellow')
+
+    """
     def __init__(self, text=None):
         """ Initialize the Text widget.
 
@@ -43,9 +104,90 @@ class Text(WidgetFactory):
         super().__init__(tk.Text)
         self.kwargs['highlightthickness'] = 0
         self.text = text
+        self.max_lines = None
+        self.append_stream = None
+        self.file = None
+        self.encoding = 'utf-8'
+        self.highlighter = None
+
+    def options(self, **kwargs):
+        if 'max_lines' in kwargs:
+            self.max_lines = kwargs.pop('max_lines')
+        if 'append_stream' in kwargs:
+            self.append_stream = kwargs.pop('append_stream')
+        if 'file' in kwargs:
+            self.file = kwargs.pop('file')
+        if 'encoding' in kwargs:
+            self.encoding = kwargs.pop('encoding')
+        if 'highlighter' in kwargs:
+            self.highlighter = kwargs.pop('highlighter')
+        return super().options(**kwargs)
 
     def create_widget(self, parent):
+        yscrollcommand = None
+        if self.file is not None:
+            yscrollcommand = self.kwargs.pop('yscrollcommand', None)
         widget = super().create_widget(parent)
-        if self.text:
+        if self.file is not None:
+            FileView(widget, self.file, self.encoding)
+            if yscrollcommand is not None:
+                widget.configure(yscrollcommand=yscrollcommand)
+        elif self.text:
             widget.insert('0.0', self.text)
+        if self.max_lines is not None or self.append_stream is not None:
+            log = _Log(widget, self.max_lines)
+            if self.append_stream is not None:
+                self.append_stream.map(log.append)
+        if self.highlighter is not None:
+            Highlighter(widget, self.highlighter)
+        widget.search_index = functools.partial(search_index, widget)
         return widget
+
+# Milliseconds to collect appended lines for before writing them.
+_FRAME = 16
+
+class _Log:
+    """Appends lines to a Text widget, keeping at most max_lines."""
+    def __init__(self, text, max_lines):
+        self.text = text
+        self.max_lines = max_lines
+        self.pending = []
+        self.after_id = None
+        text.append = self.append
+
+    def append(self, line):
+        """Add a line to the end of the log."""
+        self.pending.append(str(line))
+        if self.after_id is None:
+            self.after_id = self.text.after(_FRAME, self.flush)
+
+    def flush(self):
+        """Write the pending lines to the widget."""
+        self.after_id = None
+        if not self.pending or not self.text.winfo_exists():
+            return
+        # Entries can hold several lines of their own.
+        lines = '\n'.join(self.pending).split('\n')
+        self.pending = []
+        if self.max_lines is not None and len(lines) > self.max_lines:
+            lines = lines[-self.max_lines:]
+        following = self.text.yview()[1] >= 1.0
+        batch = Batch(self.text)
+        disabled = str(self.text.cget('state')) == tk.DISABLED
+        if disabled:
+            batch.call(self.text, 'configure', {'state': tk.NORMAL})
+        text = '\n'.join(lines)
+        # The widget can be edited by others too, so it's asked how
+        # much text it holds rather than keeping count.
+        if self.text.compare('end-1c', '!=', '1.0'):
+            text = '\n' + text
+        batch.call(self.text, 'insert', 'end', text)
+        if self.max_lines is not None:
+            # Tk clamps the index to 1.0 when there are fewer lines.
+            batch.call(self.text, 'delete', '1.0',
+                       f'end-1c linestart -{self.max_lines - 1} lines')
+        if disabled:
+            batch.call(self.text, 'configure', {'state': tk.DISABLED})
+        if following:
+            batch.call(self.text, 'see', 'end')
+        batch.flush()
@@ -0,0 +1,146 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Track the changes made to a Text widget.
+
+The <<Modified>> event only says that a Text widget has changed, not
+what changed, so anything kept in step with the text has to look at
+all of it again. A TextProxy instead sits between the widget's Tcl
+command and its implementation, the same technique IDLE uses, and
+reports which lines every insert, delete and replace touched,
+whether it came from Python, from a Batch or from Tk's own key
+bindings.
+
+"""
+import collections
+from ticklish_ui.events import Stream
+
+class Edit(collections.namedtuple('Edit', 'widget first removed added')):
+    """A change to the lines of a Text widget.
+
+    Lines first to first + removed - 1, counting from 1 as Tk does,
+    were replaced by lines first to first + added - 1. The replaced
+    lines needn't have changed completely; an insert within a single
+    line is reported as one line removed and one added.
+
+    Attributes:
+        widget - the Text widget
+        first - an int, the first line changed
+        removed - an int, the number of lines before the change
+        added - an int, the number of lines after the change
+
+    """
+
+def text_proxy(text):
+    """Return the TextProxy for a Text widget, creating it if needed."""
+    proxy = getattr(text, 'proxy', None)
+    if proxy is None:
+        proxy = text.proxy = TextProxy(text)
+    return proxy
+
+class TextProxy:
+    """Reports the lines changed in a Text widget.
+
+    Every change is sent through the proxy's edits stream as an
+    Edit. Use text_proxy() rather than creating a TextProxy directly
+    so that a widget only ever has one.
+
+    Example:
+        text_proxy(text).edits.map(
+            lambda edit: print(edit.first, edit.removed, edit.added)
+        )
+
+    Undo and redo are reported as a change to every line.
+
+    """
+    def __init__(self, text):
+        """Install the proxy.
+
+        Arguments:
+            text - a tkinter.Text
+
+        """
+        self.text = text
+        self.edits = Stream()
+        self.command = str(text)
+        self.original = f'{self.command}_ticklish_original'
+        text.tk.call('rename', self.command, self.original)
+        text.tk.createcommand(self.command, self._dispatch)
+        text.bind('<Destroy>', self._on_destroy, add='+')
+
+    def call(self, *args):
+        """Run a widget command without reporting any changes it makes."""
+        return self.text.tk.call(self.original, *args)
+
+    def remove(self):
+        """Uninstall the proxy, restoring the widget's own command."""
+        self.text.tk.deletecommand(self.command)
+        self.text.tk.call('rename', self.original, self.command)
+        self.text.proxy = None
+
+    def line_count(self):
+        """Return the number of lines in the widget."""
+        end = str(self.call('index', 'end - 1c'))
+        return int(end.split('.', maxsplit=1)[0])
+
+    def _dispatch(self, operation, *args):
+        if operation not in ('insert', 'delete', 'replace', 'edit'):
+            return self.call(operation, *args)
+        before = self.line_count()
+        if operation == 'edit':
+            result = self.call(operation, *args)
+            if args and args[0] in ('undo', 'redo'):
+                self._report(1, before, self.line_count())
+            return result
+        first = self._line(args[0])
+        if operation == 'insert':
+            last = first
+        elif len(args) == 1:
+            last = self._line(f'{args[0]} + 1c')
+        elif operation == 'delete':
+            last = self._line(args[-1])
+        else:
+            last = self._line(args[1])
+        result = self.call(operation, *args)
+        removed = last - first + 1
+        self._report(first, removed, removed + self.line_count() - before)
+        return result
+
+    def _line(self, index):
+        # Tk never edits after the final newline, so 'end' counts as
+        # the last line.
+        line = int(str(self.call('index', index)).split('.', maxsplit=1)[0])
+        return min(line, self.line_count())
+
+    def _report(self, first, removed, added):
+        self.edits.insert(Edit(self.text, first, removed, added))
+
+    def _on_destroy(self, event):
+        if event.widget is self.text:
+            self.text.tk.deletecommand(self.command)
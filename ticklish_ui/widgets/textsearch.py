@@ -0,0 +1,219 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Search the contents of a Text widget without scanning it.
+
+Tk's search command scans the text from the starting index every time
+it's called, so finding every occurrence of a string in a large
+document means scanning all of it, one call per match. A TextSearch
+instead keeps each line of the widget in a SubstringIndex, updated
+line by line from the edits reported by a TextProxy, so finding every
+occurrence only looks at the lines which can contain it.
+
+"""
+from array import array
+import bisect
+from ticklish_ui.batch import Batch
+from ticklish_ui.indexing import SubstringIndex
+from ticklish_ui.widgets.textproxy import text_proxy
+
+def search_index(text):
+    """Return the TextSearch for a Text widget, creating it if needed.
+
+    Example:
+        index = search_index(text)
+        index.highlight_all('error')
+        text.tag_configure('search', background='yellow')
+
+    """
+    index = getattr(text, 'text_search', None)
+    if index is None:
+        index = text.text_search = TextSearch(text)
+    return index
+
+class TextSearch:
+    """An index of the lines in a Text widget.
+
+    Searches ignore case. Lines are given ids which stay the same as
+    lines above them are inserted or deleted; as long as lines are
+    only added at the end of the text, as in a log, finding the line
+    number for an id takes O(log n) time. After other edits line
+    numbers are found with a table rebuilt on the next search.
+
+    Create a TextSearch with search_index(), so a widget only ever
+    has one.
+
+    """
+    def __init__(self, text):
+        """Index the contents of a Text widget.
+
+        Arguments:
+            text - a tkinter.Text
+
+        """
+        self.proxy = text_proxy(text)
+        self.index = SubstringIndex()
+        self.expanded = {}
+        self.ordered = True
+        self.positions = None
+        lines = str(self.proxy.call('get', '1.0', 'end - 1c')).split('\n')
+        for (key, line) in enumerate(lines):
+            self._add(key, line)
+        self.ids = array('q', range(len(lines)))
+        self.next_id = len(lines)
+        self.proxy.edits.map(self._on_edit)
+
+    def find_all(self, query):
+        """Return the ranges of text containing query.
+
+        Arguments:
+            query - a string
+
+        Returns:
+            A list of (start, end) tuples of Tk indices, in the order
+            they appear in the text. An empty query matches nothing.
+
+        """
+        if not query:
+            return []
+        query = query.casefold()
+        keys = self.index.search(query)
+        if not self.ordered:
+            # Keys come back in the order they were added.
+            keys.sort(key=self._line_of)
+        matches = []
+        for key in keys:
+            line = self._line_of(key) + 1
+            text = self.index.text(key)
+            starts = None
+            if key in self.expanded:
+                starts = _folded_starts(self.expanded[key])
+            column = text.find(query)
+            while column != -1:
+                (first, last) = (column, column + len(query))
+                if starts is not None:
+                    first = bisect.bisect_right(starts, first) - 1
+                    last = bisect.bisect_left(starts, last)
+                match = (f'{line}.{first}', f'{line}.{last}')
+                # Both halves of the 'ss' folded from 'ß' give one range.
+                if not matches or matches[-1] != match:
+                    matches.append(match)
+                column = text.find(query, column + 1)
+        return matches
+
+    def highlight_all(self, query, tag='search'):
+        """Tag every occurrence of query, removing the tag elsewhere.
+
+        The tag is applied with a single tag add command.
+
+        Arguments:
+            query - a string
+            tag (optional) - the name of the tag, 'search' by default
+
+        Returns:
+            The ranges tagged, as returned by find_all().
+
+        """
+        matches = self.find_all(query)
+        text = self.proxy.text
+        batch = Batch(text)
+        batch.call(text, 'tag', 'remove', tag, '1.0', 'end')
+        if matches:
+            batch.call(
+                text, 'tag', 'add', tag,
+                *[index for match in matches for index in match]
+            )
+        batch.flush()
+        return matches
+
+    def _on_edit(self, edit):
+        first = edit.first - 1
+        last = first + edit.removed
+        old = self.ids[first:last]
+        lines = str(self.proxy.call(
+            'get', f'{edit.first}.0', f'{edit.first + edit.added - 1}.end'
+        )).split('\n')
+        ids = [None] * len(lines)
+        # Lines at either end of an edit are often unchanged, like the
+        # last line when appending or the new first line when deleting
+        # the first lines. They keep their ids, which keeps the ids in
+        # order for logs.
+        if self._unchanged(old[0], lines[0]):
+            ids[0] = old.pop(0)
+        if old and ids[-1] is None and self._unchanged(old[-1], lines[-1]):
+            ids[-1] = old.pop()
+        for key in old:
+            self.index.remove(key)
+            self.expanded.pop(key, None)
+        for (i, line) in enumerate(lines):
+            if ids[i] is None:
+                ids[i] = self.next_id
+                self.next_id += 1
+                self._add(ids[i], line)
+        self.ids[first:last] = array('q', ids)
+        nearby = self.ids[max(0, first - 1):first + len(ids) + 1]
+        self.ordered = self.ordered and all(
+            a < b for (a, b) in zip(nearby, nearby[1:])
+        )
+        self.positions = None
+
+    def _add(self, key, line):
+        self.index.add(key, line)
+        # Case folding can lengthen characters, like 'ß' to 'ss', and
+        # then columns in the folded line aren't columns in the Text.
+        # Those lines are kept as they are to map the columns back.
+        if len(self.index.text(key)) != len(line):
+            self.expanded[key] = line
+
+    def _unchanged(self, key, line):
+        # Lines which fold the same, like 'ss' and 'ß', can still have
+        # different columns, so kept lines must match too.
+        folded = line.casefold()
+        kept = line if len(folded) != len(line) else None
+        return (self.index.text(key) == folded
+                and self.expanded.get(key) == kept)
+
+    def _line_of(self, key):
+        # Return the line number, counting from 0, of a line id.
+        if self.ordered:
+            return bisect.bisect_left(self.ids, key)
+        if self.positions is None:
+            self.positions = {key: i for (i, key) in enumerate(self.ids)}
+        return self.positions[key]
+
+def _folded_starts(line):
+    # Return the offset in the case folded line where each character
+    # of line starts, followed by the length of the folded line.
+    starts = array('q')
+    offset = 0
+    for char in line:
+        starts.append(offset)
+        offset += len(char.casefold())
+    starts.append(offset)
+    return starts
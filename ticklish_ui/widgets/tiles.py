@@ -0,0 +1,253 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Draw a static Canvas background once, as cached image tiles.
+
+A background made of thousands of items, like grid lines or a map,
+costs time on every redraw and every scroll. A TileLayer instead
+draws the background into a Raster one square tile at a time and
+shows each tile as a single image item. Only the tiles in view are
+drawn and shown; drawn tiles are kept in a cache, up to a memory
+limit, so scrolling back over them costs nothing. Tiles are only
+drawn again after invalidate() is called.
+
+"""
+import collections
+import math
+import tkinter as tk
+from ticklish_ui.batch import Batch
+from ticklish_ui.widgets.drawing import canvas_size
+from ticklish_ui.widgets.raster import Raster
+
+class TileLayer:
+    """A background drawn into cached PhotoImage tiles.
+
+    The background is drawn by a function, render(raster, left, top),
+    which draws the part of the background whose top left corner is
+    at canvas coordinates (left, top) into a Raster, in the Raster's
+    pixel coordinates. It's called once for each tile as the tile
+    first comes into view, a few tiles at a time while the
+    application is idle, and again after the tile is invalidated.
+
+    The layer follows scrolling through the Canvas's xscrollcommand
+    and yscrollcommand, so it replaces the Canvas's configure()
+    method. Scrollbars can still be attached in the usual way. A
+    Canvas can only have one TileLayer.
+
+    Example:
+        def grid_lines(raster, left, top):
+            lines = [(x - left, 0, x - left, 256)
+                     for x in range(left - left % 10, left + 256, 10)]
+            raster.lines(lines, (200, 200, 200))
+
+        layer = canvas.tile_layer(grid_lines)
+
+    """
+    TILES_PER_PASS = 4
+
+    def __init__(self, canvas, render, tile_size=256,
+                 max_bytes=64 * 1024 * 1024):
+        """Attach a TileLayer to a Canvas.
+
+        Arguments:
+            canvas - a tkinter.Canvas
+            render - a function drawing part of the background
+            tile_size (optional) - an int, the width and height of a
+                                   tile in pixels.
+            max_bytes (optional) - an int, roughly the most memory
+                                   used for cached tiles. Tiles in
+                                   view are kept whatever the limit.
+
+        """
+        self.canvas = canvas
+        self.render = render
+        self.cache = _TileCache(tile_size, max_bytes)
+        # {tile: (item, image)} for the tiles shown.
+        self.shown = {}
+        self.spare = []
+        self.commands = {
+            'xscrollcommand': canvas.cget('xscrollcommand') or None,
+            'yscrollcommand': canvas.cget('yscrollcommand') or None,
+        }
+        self.after_id = None
+        tk.Canvas.configure(
+            canvas,
+            xscrollcommand=lambda *view: self._on_scroll('xscrollcommand',
+                                                         view),
+            yscrollcommand=lambda *view: self._on_scroll('yscrollcommand',
+                                                         view),
+        )
+        canvas.configure = canvas.config = self.configure
+        canvas.bind('<Configure>', lambda e: self._schedule(), add='+')
+        self._schedule()
+
+    def configure(self, cnf=None, **kwargs):
+        """Configure the Canvas.
+
+        Works like the tkinter configure() method except that the
+        xscrollcommand and yscrollcommand options are handled by the
+        TileLayer.
+
+        """
+        if isinstance(cnf, str) or (cnf is None and not kwargs):
+            return tk.Canvas.configure(self.canvas, cnf)
+        options = dict(cnf or {}, **kwargs)
+        for name in self.commands:
+            if name in options:
+                self.commands[name] = options.pop(name)
+        result = None
+        if options:
+            result = tk.Canvas.configure(self.canvas, options)
+        self._schedule()
+        return result
+
+    def invalidate(self, rect=None):
+        """Draw tiles again, keeping them on screen until they're redrawn.
+
+        Arguments:
+            rect (optional) - the (x1, y1, x2, y2) canvas coordinates
+                              of the area which changed. Every tile
+                              is drawn again by default.
+
+        """
+        self.cache.discard(rect)
+        self._schedule()
+
+    def update(self):
+        """Show the tiles in view, drawing up to TILES_PER_PASS of them.
+
+        Called automatically whenever the view changes.
+
+        """
+        self.after_id = None
+        if not self.canvas.winfo_exists():
+            return
+        visible = self._visible()
+        for tile in [tile for tile in self.shown if tile not in visible]:
+            self.spare.append(self.shown.pop(tile)[0])
+        size = self.cache.tile_size
+        batch = Batch(self.canvas)
+        rendered = 0
+        for tile in visible:
+            image = self.cache.get(tile)
+            if image is None and rendered < self.TILES_PER_PASS:
+                image = self._render(tile, visible)
+                rendered += 1
+            if image is None:
+                continue
+            if tile in self.shown:
+                (item, old) = self.shown[tile]
+                if old is image:
+                    continue
+            elif self.spare:
+                item = self.spare.pop()
+                batch.coords(self.canvas, item, tile[0] * size,
+                             tile[1] * size)
+            else:
+                item = self.canvas.create_image(
+                    tile[0] * size, tile[1] * size, anchor=tk.NW,
+                    tags='tile_layer',
+                )
+                self.canvas.tag_lower(item)
+            batch.itemconfigure(self.canvas, item, image=str(image),
+                                state=tk.NORMAL)
+            self.shown[tile] = (item, image)
+        for item in self.spare:
+            batch.itemconfigure(self.canvas, item, state=tk.HIDDEN)
+        batch.flush()
+        if len(self.shown) < len(visible) or rendered:
+            self._schedule()
+
+    def _visible(self):
+        size = self.cache.tile_size
+        (width, height) = canvas_size(self.canvas)
+        (left, top) = (self.canvas.canvasx(0), self.canvas.canvasy(0))
+        columns = range(math.floor(left / size),
+                        math.floor((left + width - 1) / size) + 1)
+        rows = range(math.floor(top / size),
+                     math.floor((top + height - 1) / size) + 1)
+        return {(i, j) for i in columns for j in rows}
+
+    def _render(self, tile, visible):
+        size = self.cache.tile_size
+        raster = Raster(size, size)
+        self.render(raster, tile[0] * size, tile[1] * size)
+        image = tk.PhotoImage(master=self.canvas, width=size, height=size)
+        image.configure(data=raster.png(), format='png')
+        self.cache.put(tile, image, visible)
+        return image
+
+    def _on_scroll(self, name, view):
+        command = self.commands[name]
+        if command is not None:
+            if isinstance(command, str):
+                # A Tcl command prefix, like '.bar set'.
+                words = self.canvas.tk.splitlist(command)
+                self.canvas.tk.call(*words, *view)
+            else:
+                command(*view)
+        self._schedule()
+
+    def _schedule(self):
+        if self.after_id is None:
+            self.after_id = self.canvas.after_idle(self.update)
+
+class _TileCache:
+    """PhotoImages of drawn tiles, least recently used first."""
+    def __init__(self, tile_size, max_bytes):
+        self.tile_size = tile_size
+        self.limit = max(1, max_bytes // (4 * tile_size ** 2))
+        self.images = collections.OrderedDict()
+
+    def get(self, tile):
+        """Return the image for a tile, or None if it isn't cached."""
+        image = self.images.get(tile)
+        if image is not None:
+            self.images.move_to_end(tile)
+        return image
+
+    def put(self, tile, image, keep):
+        """Cache an image, evicting tiles not in keep if over the limit."""
+        self.images[tile] = image
+        for old in list(self.images):
+            if len(self.images) <= self.limit:
+                break
+            if old not in keep:
+                del self.images[old]
+
+    def discard(self, rect=None):
+        """Forget the tiles overlapping rect, or every tile."""
+        if rect is None:
+            self.images.clear()
+            return
+        size = self.tile_size
+        (i1, j1, i2, j2) = [math.floor(value / size) for value in rect]
+        for (i, j) in list(self.images):
+            if i1 <= i <= i2 and j1 <= j <= j2:
+                del self.images[(i, j)]
@@ -0,0 +1,386 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Defines the ticklish_ui TimeSeries widget. """
+from array import array
+import math
+import tkinter as tk
+from ticklish_ui.batch import Batch
+from ticklish_ui.widgets.drawing import canvas_size
+from ticklish_ui.widgets.factories import WidgetFactory
+from ticklish_ui.widgets.virtual import scroll_target
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class TimeSeries(WidgetFactory):
+    """A Canvas plotting a stream of samples as a line.
+
+    However many samples there are, the line is drawn with at most
+    four points per pixel column: the first, lowest, highest and
+    last values of the samples falling in that column. These are
+    kept up to date as samples arrive, so appending samples only
+    costs time for the new ones and redrawing costs time for the
+    columns on screen, not for the samples they summarize. With
+    NumPy installed, samples added in bulk are summarized with
+    vectorized operations.
+
+    Samples are (time, value) pairs, added with the widget's append()
+    and extend() methods or by inserting them into the stream given
+    in the 'stream' option. A plain number counts as a value whose
+    time is the number of samples added before it. Times must never
+    decrease.
+
+    The 'window' option sets how much time the width of the widget
+    covers. While the newest sample is on screen the chart scrolls
+    to follow new samples; otherwise the view stays where it is. The
+    widget's xview() method scrolls through the samples, so a
+    Scrollbar can be attached by giving its set() method as the
+    'xscrollcommand' option. Without a window every sample is shown.
+
+    The 'y_range' option fixes the (lowest, highest) values shown,
+    which otherwise fit the visible samples, 'max_samples' limits the
+    number of samples kept, dropping the oldest ones first, and
+    'line_options' is a dict of options for the line item.
+
+    Example:
+        samples = Stream()
+
+        app = Application(
+            'Sensor',
+            [TimeSeries(800, 200).options(
+                name='chart', stream=samples, window=10.0,
+                line_options={'fill': 'blue'},
+            )],
+        )
+
+        samples.insert((time.monotonic(), read_sensor()))
+
+    """
+    def __init__(self, width, height):
+        """Initialize the TimeSeries.
+
+        Arguments:
+            width - an int
+            height - an int
+
+        """
+        super().__init__(tk.Canvas)
+        self.kwargs['width'] = width
+        self.kwargs['height'] = height
+        self.kwargs['highlightthickness'] = 0
+        self.stream = None
+        self.window = None
+        self.y_range = None
+        self.max_samples = 10000000
+        self.line_options = {}
+
+    def options(self, **kwargs):
+        if 'stream' in kwargs:
+            self.stream = kwargs.pop('stream')
+        if 'window' in kwargs:
+            self.window = kwargs.pop('window')
+        if 'y_range' in kwargs:
+            self.y_range = kwargs.pop('y_range')
+        if 'max_samples' in kwargs:
+            self.max_samples = kwargs.pop('max_samples')
+        if 'line_options' in kwargs:
+            self.line_options = kwargs.pop('line_options')
+        return super().options(**kwargs)
+
+    def create_widget(self, parent):
+        xscrollcommand = self.kwargs.pop('xscrollcommand', None)
+        widget = super().create_widget(parent)
+        widget.create_line(
+            0, 0, 0, 0, self.line_options, tags='time_series',
+            state=tk.HIDDEN,
+        )
+        chart = _Chart(widget, _Series(self.window, self.max_samples),
+                       self.y_range, xscrollcommand)
+        if self.stream is not None:
+            self.stream.map(chart.append)
+        return widget
+
+# Milliseconds to collect samples for before redrawing.
+_FRAME = 16
+
+class _Chart:
+    """Draws a _Series on a Canvas, at most once per frame."""
+    def __init__(self, canvas, series, y_range, xscrollcommand):
+        self.canvas = canvas
+        self.series = series
+        self.y_range = y_range
+        self.xscrollcommand = xscrollcommand
+        # The last column shown, or None to follow new samples.
+        self.right = None
+        # Samples added so far, which keeps counting as old samples
+        # are dropped, so implicit times never go backwards.
+        self.count = 0
+        self.after_id = None
+        canvas.append = self.append
+        canvas.extend = self.extend
+        canvas.xview = self.xview
+        canvas.bind('<Configure>', lambda e: self._schedule(), add='+')
+
+    def append(self, sample):
+        """Add a sample, a (time, value) pair or a value."""
+        if isinstance(sample, (tuple, list)):
+            (time, value) = sample
+        else:
+            (time, value) = (self.count, sample)
+        self.count += 1
+        self.series.extend([time], [value])
+        self._schedule()
+
+    def extend(self, times, values=None):
+        """Add many samples.
+
+        Arguments:
+            times - a sequence of times, or of values if values is
+                    left out, in which case each value's time is the
+                    number of samples added before it.
+            values (optional) - a sequence of values
+
+        """
+        if values is None:
+            values = times
+            times = range(self.count, self.count + len(values))
+        self.count += len(values)
+        self.series.extend(times, values)
+        self._schedule()
+
+    def xview(self, *args):
+        """Query or change the horizontal position of the view.
+
+        Works like the tkinter xview() method but in terms of the
+        pixel columns of the whole series.
+
+        """
+        if not args:
+            return self._fractions()
+        # Nothing has been drawn yet, so there's nothing to scroll.
+        right = self._right()
+        if right is None:
+            return None
+        columns = canvas_size(self.canvas)[0]
+        (first, last) = self.series.extent()
+        left = scroll_target(args, right - columns + 1 - first,
+                             last - first + 1, columns) + first
+        right = max(first, min(left, last - columns + 1)) + columns - 1
+        self.right = None if right >= last else right
+        self.redraw()
+        return None
+
+    def redraw(self):
+        """Draw the visible columns now."""
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        if not self.canvas.winfo_exists():
+            return
+        (columns, height) = canvas_size(self.canvas)
+        self.series.update(columns)
+        right = self._right()
+        coords = []
+        if right is not None:
+            coords = self._coords(right - columns + 1, right, height)
+        batch = Batch(self.canvas)
+        if not coords:
+            batch.call(self.canvas, 'itemconfigure', 'time_series',
+                       {'state': tk.HIDDEN})
+        else:
+            batch.call(self.canvas, 'coords', 'time_series', coords)
+            batch.call(self.canvas, 'itemconfigure', 'time_series',
+                       {'state': tk.NORMAL})
+        batch.flush()
+        if self.xscrollcommand is not None:
+            self.xscrollcommand(*self._fractions())
+
+    def _coords(self, left, right, height):
+        bins = self.series.bins
+        visible = [(column - left, bins[column])
+                   for column in range(left, right + 1) if column in bins]
+        if not visible:
+            return []
+        if self.y_range is None:
+            low = min(summary[1] for (_, summary) in visible)
+            high = max(summary[2] for (_, summary) in visible)
+        else:
+            (low, high) = self.y_range
+        if high == low:
+            (low, high) = (low - 1, high + 1)
+        scale = (height - 1) / (high - low)
+        coords = []
+        for (x, summary) in visible:
+            for value in summary:
+                coords.append(x)
+                coords.append(height - 1 - (value - low) * scale)
+        # A line needs two points.
+        return coords * 2 if len(coords) == 2 else coords
+
+    def _right(self):
+        if not self.series.bins:
+            return None
+        if self.right is None:
+            return self.series.extent()[1]
+        return self.right
+
+    def _fractions(self):
+        right = self._right()
+        if right is None:
+            return (0.0, 1.0)
+        columns = canvas_size(self.canvas)[0]
+        (first, last) = self.series.extent()
+        count = last - first + 1
+        return (max(0.0, (right - columns + 1 - first) / count),
+                min(1.0, (right + 1 - first) / count))
+
+    def _schedule(self):
+        if self.after_id is None:
+            self.after_id = self.canvas.after(_FRAME, self.redraw)
+
+class _Series:
+    """Samples and a summary of the samples in each pixel column.
+
+    Samples are grouped into bins, each covering size units of time,
+    with sample t in bin floor(t / size). Each bin is summarized by
+    a [first, lowest, highest, last] list of the values in it.
+
+    """
+    def __init__(self, window, max_samples):
+        self.samples = (array('d'), array('d'))
+        self.binned = 0
+        self.bins = {}
+        self.size = None
+        self.window = window
+        self.max_samples = max_samples
+
+    def extend(self, times, values):
+        """Add samples, to be summarized by the next update()."""
+        for (samples, new) in zip(self.samples, (times, values)):
+            if numpy is not None and isinstance(new, numpy.ndarray):
+                samples.frombytes(new.astype(numpy.float64).tobytes())
+            else:
+                samples.extend(float(value) for value in new)
+
+    def update(self, columns):
+        """Summarize the samples added since the last update.
+
+        Arguments:
+            columns - an int, the width of the view in pixels
+
+        """
+        (times, values) = self.samples
+        if len(times) > self.max_samples * 5 // 4:
+            excess = len(times) - self.max_samples
+            del times[:excess]
+            del values[:excess]
+            self.binned = 0
+        if not times:
+            self.bins = {}
+        elif self.binned == 0 or self._resized(columns):
+            self._rebin(columns)
+        else:
+            if self.binned < len(times):
+                for (column, summary) in _summarize(
+                        times[self.binned:], values[self.binned:],
+                        self.size):
+                    _merge(self.bins, column, summary)
+                self.binned = len(times)
+            if self._resized(columns):
+                self._rebin(columns)
+            while self.window is None and _width(self.extent()) > columns:
+                self.size *= 2
+                self.bins = _halve(self.bins)
+
+    def extent(self):
+        """Return the first and last bins."""
+        (times, _) = self.samples
+        return (math.floor(times[0] / self.size),
+                math.floor(times[-1] / self.size))
+
+    def __len__(self):
+        return len(self.samples[0])
+
+    def _resized(self, columns):
+        if self.window is not None:
+            return self.size != self.window / columns
+        # Halving keeps at least half of the columns in use.
+        return 2 * _width(self.extent()) < columns
+
+    def _rebin(self, columns):
+        (times, values) = self.samples
+        if self.window is not None:
+            self.size = self.window / columns
+        else:
+            span = times[-1] - times[0]
+            self.size = span / max(1, columns - 1) or 1.0
+        self.bins = dict(_summarize(times, values, self.size))
+        self.binned = len(times)
+
+def _width(extent):
+    return extent[1] - extent[0] + 1
+
+def _summarize(times, values, size):
+    # Return (bin, summary) pairs for samples in time order.
+    if numpy is not None:
+        times = numpy.frombuffer(times, dtype=numpy.float64)
+        values = numpy.frombuffer(values, dtype=numpy.float64)
+        columns = numpy.floor(times / size).astype(numpy.int64)
+        starts = numpy.flatnonzero(numpy.diff(columns)) + 1
+        starts = numpy.concatenate(([0], starts))
+        ends = numpy.append(starts[1:], len(values)) - 1
+        return zip(columns[starts].tolist(), map(list, zip(
+            values[starts].tolist(),
+            numpy.minimum.reduceat(values, starts).tolist(),
+            numpy.maximum.reduceat(values, starts).tolist(),
+            values[ends].tolist(),
+        )))
+    bins = {}
+    for (time, value) in zip(times, values):
+        _merge(bins, math.floor(time / size), [value] * 4)
+    return bins.items()
+
+def _merge(bins, column, summary):
+    old = bins.get(column)
+    if old is None:
+        bins[column] = summary
+    else:
+        bins[column] = [old[0], min(old[1], summary[1]),
+                        max(old[2], summary[2]), summary[3]]
+
+def _halve(bins):
+    # Summarize bins twice the size from bins.
+    halved = {}
+    for (column, summary) in bins.items():
+        _merge(halved, column // 2, summary)
+    return halved
@@ -28,21 +28,163 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-"""Defines the ticklish_ui Toplevel widget. """
+"""Defines the ticklish_ui Toplevel widget and DialogPool. """
 import tkinter as tk
-from ticklish_ui.widgets.factories import ContainerFactory
+from ticklish_ui.widgets.factories import ContainerFactory, bulk_construction
 
 class Toplevel(ContainerFactory, tk.Toplevel):
-    """ Wrapper for the tkinter.Toplevel class. """
-    def __init__(self, title, *rows):
+    """Wrapper for the tkinter.Toplevel class.
+
+    Toplevel windows belonging to a DialogPool are returned to the
+    pool, rather than destroyed, when closed with a CloseButton or the
+    window manager's close button.
+
+    """
+    def __init__(self, title, *rows, layout='pack'):
         """Initialize the Toplevel window.
 
         Arguments:
             title - a string, the name of the window displayed in the
                     titlebar.
             *rows - any number of rows given as lists of ticklish widgets.
+            layout (optional) - either 'pack' (the default) or 'grid'.
+                                See ContainerFactory for details.
 
         """
         super().__init__(None, rows)
-        self.create_widget(None)
+        self.layout = layout
+        self.pool = None
+        registry = getattr(self.nametowidget('.'), 'widgets', None)
+        if registry is not None:
+            registry.watch(self)
         self.title(title)
+        with bulk_construction():
+            self.create_widget(None)
+
+    def close(self):
+        """Close the window.
+
+        Windows which belong to a DialogPool are withdrawn and
+        returned to the pool. Any other window is destroyed.
+
+        """
+        if self.pool is None:
+            self.destroy()
+        else:
+            self.pool.release(self)
+
+class DialogPool:
+    """Reuse Toplevel windows instead of creating them every time.
+
+    DialogPool is a ticklish addition for dialogs which are opened and
+    closed frequently. Creating a Toplevel, and all of the widgets it
+    contains, every time a dialog is shown is relatively slow and
+    leaves a trail of Tcl commands and Python callbacks behind when
+    the window is destroyed. Instead, closing a pooled dialog with a
+    CloseButton or the window manager hides it and the next call to
+    open() shows it again.
+
+    Since the same window is reused, anything that changes from one
+    use to the next should be set by the populate function passed to
+    open().
+
+    Example:
+        from ticklish_ui import *
+
+        app = Application(
+            'Example GUI',
+
+            # .row1
+            [Label('Enter some text below:')],
+
+            # .row2
+            [Entry().options(name='user_text')],
+
+            # .row3
+            [Button('OK').options(name='ok'), CloseButton('Quit')],
+        )
+
+        popups = DialogPool(lambda: Toplevel(
+            'Your Text',
+
+            # .row1
+            [Label('').options(name='text')],
+
+            # .row2
+            [CloseButton('OK')],
+        ))
+
+        def populate(dialog):
+            text = app.nametowidget('.row2.user_text').get()
+            dialog.nametowidget('row1.text')['text'] = text
+
+        (app.get_event_stream('<ButtonRelease-1>')
+         .by_name('ok')
+         .map(lambda e: popups.open(populate))
+        )
+
+        app.mainloop()
+
+    """
+    def __init__(self, factory, size=None):
+        """Initialize the DialogPool.
+
+        Arguments:
+            factory - a function taking no arguments which returns a
+                      new Toplevel. Called whenever the pool is empty.
+            size (optional) - an int, the maximum number of hidden
+                              windows to keep. Windows closed when
+                              the pool is full are destroyed. By
+                              default there is no limit.
+
+        """
+        self.factory = factory
+        self.size = size
+        self.idle = []
+
+    def open(self, populate=None):
+        """Show a dialog, reusing a hidden one if possible.
+
+        Arguments:
+            populate (optional) - a function taking the dialog as its
+                                  only argument, called before the
+                                  dialog is shown to fill in its
+                                  contents.
+
+        Returns:
+            The dialog, a Toplevel.
+
+        """
+        dialog = None
+        while self.idle and dialog is None:
+            dialog = self.idle.pop()
+            if not dialog.winfo_exists():
+                dialog = None
+        if dialog is None:
+            dialog = self.factory()
+            dialog.pool = self
+            dialog.protocol('WM_DELETE_WINDOW', dialog.close)
+        if populate:
+            populate(dialog)
+        dialog.deiconify()
+        return dialog
+
+    def release(self, dialog):
+        """Hide a dialog and return it to the pool.
+
+        Arguments:
+            dialog - a Toplevel previously returned by open().
+
+        """
+        if self.size is not None and len(self.idle) >= self.size:
+            dialog.destroy()
+        else:
+            dialog.withdraw()
+            self.idle.append(dialog)
+
+    def clear(self):
+        """Destroy all of the hidden dialogs in the pool."""
+        idle, self.idle = self.idle, []
+        for dialog in idle:
+            if dialog.winfo_exists():
+                dialog.destroy()
@@ -29,32 +29,419 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 """Defines the ticklish_ui Treeview widget. """
+import collections.abc
+import functools
 import tkinter.ttk as ttk
+from ticklish_ui.batch import Batch
+from ticklish_ui.indexing import SubstringIndex
 from ticklish_ui.widgets.factories import WidgetFactory
+from ticklish_ui.widgets.population import populate
+from ticklish_ui.widgets.sorting import SortKeys, sort_rows
 
 class Treeview(WidgetFactory):
-    """Wrapper class for tkinter.ttk.Treeview."""
+    """Wrapper class for tkinter.ttk.Treeview.
+
+    Items are given either as a MenuSpecification or directly, as
+    strings and (name, children) tuples. Each item's iid is the same
+    as its text. A (name, children, options) tuple also sets item
+    options, such as 'text', 'values', 'tags' or 'open', for the item.
+
+    If the items are given as a single iterator or generator the
+    Treeview is filled in chunks in the background so the UI stays
+    responsive. The 'budget' option sets the number of milliseconds
+    spent inserting items before the event loop is allowed to run, 8
+    by default. Progress is reported through the widget's progress
+    stream. See populate() for details.
+
+    For hierarchies too large to insert up front the Treeview can be
+    given a single function, the children provider, instead of
+    items. The provider takes the iid of an item, '' for the root,
+    and returns an iterable of that item's children. Each child is
+    either a string, a leaf whose iid and text are the string, or a
+    tuple (iid, has_children) or (iid, has_children, text). Children
+    are only requested when their parent is first opened; until then
+    a placeholder child keeps the parent's expand arrow visible. The
+    children of an item can also be loaded explicitly with the
+    widget's load_children() method.
+
+    Setting the 'evict' option to True deletes the children of an
+    item when it's closed, so they're requested again next time it's
+    opened. This keeps memory use down when browsing huge
+    hierarchies.
+
+    Trees that aren't loaded lazily can be updated in place with the
+    widget's apply() method. It takes a new list of items, in the same
+    form the Treeview was created with, and compares it to the items
+    currently in the tree using their iids. Only the differences are
+    sent to Tk, as a single script: new items are inserted, missing
+    ones deleted, changed options updated and moved items reordered.
+    Refreshing live data then costs in proportion to what changed
+    rather than to the size of the tree.
+
+    The widget's sort_by() method sorts the children of every item by
+    a column, '#0' being the item text. Values are taken from the
+    Treeview's own copy of the items rather than read back from Tk and
+    the items are rearranged with a single script. Keys are cached
+    between sorts and, for expensive key functions, can be computed in
+    a worker thread by passing threaded=True.
+
+    Example:
+        tree.heading('size', command=lambda: tree.sort_by('size', key=int))
+
+    The text of every item is kept in a SubstringIndex, so searching
+    the tree with the widget's find() method doesn't need to walk it
+    through Tk. find() returns each matching iid along with its
+    ancestors and, with expand=True, opens just the branches leading
+    to the matches. In a lazily loaded tree only the items loaded so
+    far are searched.
+
+    Example:
+        for (iid, ancestors) in tree.find('report', expand=True):
+            print(' / '.join(ancestors + (iid,)))
+
+    Example:
+        import os
+        from ticklish_ui import *
+
+        def children(path):
+            with os.scandir(path or '/') as entries:
+                return sorted(
+                    (entry.path, entry.is_dir(), entry.name)
+                    for entry in entries
+                )
+
+        Application(
+            'Lazy Treeview',
+            [Treeview(children).options(evict=True)],
+        ).mainloop()
+
+    """
 
     def __init__(self, *items):
         """Initialize the Treeview.
 
         Arguments:
+            *items - a MenuSpecification, or any number of items. Each
+                     item is either a string, a (name, children) tuple
+                     where children is a list of items, or a (name,
+                     children, options) tuple. A single
+                     iterator producing items, or a children provider
+                     function, may also be given.
         """
         super().__init__(ttk.Treeview)
+        self.budget = 8
+        self.evict = False
         try:
             self.items = items[0].finalize()
-        except AttributeError:
+        except (AttributeError, IndexError):
             self.items = items
 
+    def options(self, **kwargs):
+        if 'budget' in kwargs:
+            self.budget = kwargs.pop('budget')
+        if 'evict' in kwargs:
+            self.evict = kwargs.pop('evict')
+        return super().options(**kwargs)
+
     def create_widget(self, parent):
         treeview = super().create_widget(parent)
-        self._insert_items(treeview, '', self.items)
+        model = _TreeModel(treeview)
+        treeview.model = model
+        treeview.sort_by = model.sort_by
+        treeview.find = model.find
+        if len(self.items) == 1 and callable(self.items[0]):
+            _LazyChildren(treeview, model, self.items[0], self.evict)
+            return treeview
+        if (len(self.items) == 1
+                and isinstance(self.items[0], collections.abc.Iterator)):
+            populate(
+                treeview,
+                _item_commands(model, '', self.items[0]),
+                self.budget
+            )
+        else:
+            batch = Batch(treeview)
+            for command in _item_commands(model, '', self.items):
+                batch.call(treeview, *command)
+            batch.flush()
+        treeview.apply = model.apply
         return treeview
 
-    def _insert_items(self, treeview, parent, items):
-        for item in items:
-            if isinstance(item, tuple):
-                treeview.insert(parent, 'end', iid=item[0], text=item[0])
-                self._insert_items(treeview, item[0], item[1])
+def _item_commands(model, parent, items):
+    """Generate insert commands for items, recording them in model."""
+    for item in items:
+        (iid, children, options) = _normalize(item)
+        model.add(parent, iid, options)
+        yield ('insert', parent, 'end', {'id': iid, **options})
+        yield from _item_commands(model, iid, children)
+
+def _normalize(item):
+    """Return an item as an (iid, children, options) tuple."""
+    if not isinstance(item, tuple):
+        return (item, (), {'text': item})
+    if len(item) == 2:
+        return (item[0], item[1], {'text': item[0]})
+    return (item[0], item[1], {'text': item[0], **item[2]})
+
+# Values for item options that are no longer given.
+_ITEM_DEFAULTS = {'open': False}
+
+class _TreeModel:
+    """Python side copy of the items in a Treeview."""
+    def __init__(self, treeview, indexed=True):
+        self.treeview = treeview
+        self.parents = {}
+        self.children = {'': []}
+        self.options = {}
+        self.version = 0
+        self.keys = SortKeys()
+        self.index = SubstringIndex() if indexed else None
+
+    def add(self, parent, iid, options):
+        """Record that iid was inserted at the end of parent."""
+        self.parents[iid] = parent
+        self.children[parent].append(iid)
+        self.children[iid] = []
+        self.options[iid] = options
+        self.version += 1
+        if self.index is not None:
+            self.index.add(iid, options.get('text', ''))
+
+    def remove_children(self, parent):
+        """Forget all the descendants of parent."""
+        for iid in self.children[parent]:
+            self.remove_children(iid)
+            del self.parents[iid]
+            del self.children[iid]
+            del self.options[iid]
+            self.index.remove(iid)
+        self.children[parent] = []
+        self.version += 1
+
+    def apply(self, items):
+        """Update the tree to contain exactly the given items.
+
+        Arguments:
+            items - a list of items, as given to Treeview, or a
+                    MenuSpecification.
+        """
+        if hasattr(items, 'finalize'):
+            items = items.finalize()
+        new = _TreeModel(self.treeview, indexed=False)
+        collections.deque(_item_commands(new, '', items), maxlen=0)
+        batch = Batch(self.treeview)
+        added = set()
+        for (iid, parent) in new.parents.items():
+            text = new.options[iid].get('text', '')
+            if iid not in self.parents:
+                added.add(iid)
+                self.index.add(iid, text)
+                batch.call(
+                    self.treeview, 'insert', parent, 'end',
+                    {'id': iid, **new.options[iid]}
+                )
+            elif new.options[iid] != self.options[iid]:
+                if text != self.options[iid].get('text', ''):
+                    self.index.add(iid, text)
+                batch.call(
+                    self.treeview, 'item', iid,
+                    _changes(self.options[iid], new.options[iid])
+                )
+        for (parent, iids) in new.children.items():
+            # Items moving to another parent or being deleted are taken
+            # care of by those commands.
+            current = [
+                iid for iid in self.children.get(parent, ())
+                if new.parents.get(iid) == parent
+            ]
+            if iids != current + [iid for iid in iids if iid in added]:
+                batch.call(self.treeview, 'children', parent, iids)
+        removed = []
+        for (iid, parent) in self.parents.items():
+            if iid not in new.parents:
+                self.index.remove(iid)
+                if not parent or parent in new.parents:
+                    removed.append(iid)
+        if removed:
+            batch.call(self.treeview, 'delete', removed)
+        batch.flush()
+        (self.parents, self.children, self.options) = (
+            new.parents, new.children, new.options
+        )
+        self.version += 1
+
+    def find(self, query, expand=False):
+        """Return the items whose text contains query, ignoring case.
+
+        Arguments:
+            query - a string
+            expand (optional) - a bool, True to open the ancestors of
+                                every match and scroll the first match
+                                into view
+
+        Returns:
+            A list of (iid, ancestors) tuples, in the order the items
+            were added, where ancestors is a tuple of iids from the
+            top level item down to the match's parent. An empty query
+            matches nothing.
+
+        """
+        if not query:
+            return []
+        matches = [
+            (iid, self._ancestors(iid)) for iid in self.index.search(query)
+        ]
+        if expand and matches:
+            batch = Batch(self.treeview)
+            opened = set()
+            for (_, ancestors) in matches:
+                for iid in ancestors:
+                    if iid not in opened:
+                        opened.add(iid)
+                        batch.call(self.treeview, 'item', iid, {'open': True})
+            batch.call(self.treeview, 'see', matches[0][0])
+            batch.flush()
+        return matches
+
+    def sort_by(self, column, key=None, reverse=False, threaded=False):
+        """Sort the children of every item by the values in column.
+
+        Arguments:
+            column - the name of a column, or '#0' for the item text
+            key (optional) - a function taking a value and returning
+                             its sort key
+            reverse (optional) - a bool, True to sort in descending
+                                 order
+            threaded (optional) - a bool, True to compute keys in a
+                                  worker thread. See sort_rows().
+
+        """
+        if column == '#0':
+            values = (
+                options.get('text', '') for options in self.options.values()
+            )
+        else:
+            columns = self.treeview.tk.splitlist(self.treeview.cget('columns'))
+            if column not in columns:
+                raise ValueError(f'Unknown column: {column}')
+            values = (
+                _column_value(options, columns.index(column))
+                for options in self.options.values()
+            )
+        iids = list(self.options)
+        version = self.version
+
+        def reorder(order):
+            if self.version != version:
+                self.sort_by(column, key, reverse, threaded)
+                return
+            position = [0] * len(order)
+            for (i, row) in enumerate(order):
+                position[row] = i
+            position = dict(zip(iids, position))
+            batch = Batch(self.treeview)
+            for (parent, children) in self.children.items():
+                ordered = sorted(children, key=position.__getitem__)
+                if ordered != children:
+                    self.children[parent] = ordered
+                    batch.call(self.treeview, 'children', parent, ordered)
+            batch.flush()
+            self.version += 1
+
+        sort_rows(
+            self.treeview,
+            functools.partial(
+                self.keys.order, list(zip(iids, values)), key, reverse
+            ),
+            reorder,
+            threaded
+        )
+
+    def _ancestors(self, iid):
+        ancestors = []
+        parent = self.parents[iid]
+        while parent:
+            ancestors.append(parent)
+            parent = self.parents[parent]
+        return tuple(reversed(ancestors))
+
+def _column_value(options, index):
+    """Return the value an item displays in a column."""
+    values = options.get('values', ())
+    return values[index] if index < len(values) else ''
+
+def _changes(old, new):
+    """Return the item options needed to turn old into new."""
+    changes = {
+        option: _ITEM_DEFAULTS.get(option, '')
+        for option in old if option not in new
+    }
+    changes.update(
+        (option, value) for (option, value) in new.items()
+        if old.get(option) != value
+    )
+    return changes
+
+class _LazyChildren:
+    """Loads the children of Treeview items when they're opened."""
+    def __init__(self, treeview, model, provider, evict):
+        self.treeview = treeview
+        self.model = model
+        self.provider = provider
+        self.placeholders = {'': None}
+        self.count = 0
+        treeview.bind('<<TreeviewOpen>>', self._on_open, add='+')
+        if evict:
+            treeview.bind('<<TreeviewClose>>', self._on_close, add='+')
+        treeview.load_children = self.load
+        treeview.evict_children = self.evict
+        self.load('')
+
+    def load(self, parent):
+        """Insert the children of parent unless they already have been."""
+        if parent not in self.placeholders:
+            return
+        batch = Batch(self.treeview)
+        placeholder = self.placeholders.pop(parent)
+        if placeholder is not None:
+            batch.call(self.treeview, 'delete', [placeholder])
+        for child in self.provider(parent):
+            if isinstance(child, tuple):
+                (iid, has_children, text) = (child + (child[0],))[:3]
             else:
-                treeview.insert(parent, 'end', iid=item, text=item)
+                (iid, has_children, text) = (child, False, child)
+            self.model.add(parent, iid, {'text': text})
+            batch.call(
+                self.treeview, 'insert', parent, 'end',
+                {'id': iid, 'text': text}
+            )
+            if has_children:
+                self._add_placeholder(batch, iid)
+        batch.flush()
+
+    def evict(self, item):
+        """Delete the children of item so they're loaded again on open."""
+        if item in self.placeholders or not self.model.children.get(item):
+            return
+        batch = Batch(self.treeview)
+        batch.call(self.treeview, 'delete', self.model.children[item])
+        stack = list(self.model.children[item])
+        while stack:
+            descendant = stack.pop()
+            self.placeholders.pop(descendant, None)
+            stack.extend(self.model.children.get(descendant, ()))
+        self.model.remove_children(item)
+        self._add_placeholder(batch, item)
+        batch.flush()
+
+    def _on_open(self, _event_ignored):
+        self.load(self.treeview.focus())
+
+    def _on_close(self, _event_ignored):
+        self.evict(self.treeview.focus())
+
+    def _add_placeholder(self, batch, parent):
+        self.count += 1
+        placeholder = f'ticklish-placeholder-{self.count}'
+        self.placeholders[parent] = placeholder
+        batch.call(self.treeview, 'insert', parent, 'end', {'id': placeholder})
@@ -0,0 +1,376 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+"""Pan and zoom around a scene too large to draw as Canvas items.
+
+Tk keeps every Canvas item in a list and moving, scaling or redrawing
+the Canvas looks at all of them, so a scene of millions of items
+can't be panned or zoomed smoothly. A Viewport keeps the scene in
+Python instead, indexed by a SpatialGrid, and only creates items for
+the parts of it which are visible. Items which scroll out of view
+are hidden and reused for the parts scrolling in. When zoomed out so
+far that more than max_items would be visible, the scene is drawn
+as a grid of shaded cells showing how much is in each.
+
+"""
+import math
+from ticklish_ui.batch import Batch
+from ticklish_ui.spatial import SpatialGrid
+from ticklish_ui.widgets.drawing import canvas_size
+
+class Viewport:
+    """A pannable, zoomable view of a scene on a Canvas.
+
+    The scene is made of primitives, each a Canvas item type with
+    coordinates and options, added with add() or add_many() in world
+    coordinates. The view maps world coordinates to the Canvas with a
+    scale, in pixels per world unit, and the world coordinates shown
+    at the Canvas's top left corner.
+
+    Every item the Viewport creates is tagged 'viewport'. Items are
+    reused for other primitives as the view changes, so the stacking
+    order of primitives isn't kept; items created directly on the
+    Canvas stay where they are and aren't moved by the view.
+
+    Example:
+        viewport = Viewport(canvas)
+        viewport.add_many('line', walls, fill='black')
+        viewport.set_view(0, 0, 0.5)
+        viewport.zoom(2, 320, 240)
+
+    """
+    MAX_ITEMS = 20000
+    CELL_PIXELS = 6
+
+    def __init__(self, canvas, cell_size=64, max_items=None):
+        """Attach a Viewport to a Canvas.
+
+        Arguments:
+            canvas - a tkinter.Canvas
+            cell_size (optional) - a number, in world units, the size
+                                   of a cell of the SpatialGrid
+                                   indexing the scene and of the
+                                   smallest shaded cell.
+            max_items (optional) - an int, the largest number of
+                                   primitives drawn before switching
+                                   to shaded cells. MAX_ITEMS by
+                                   default.
+
+        """
+        self.canvas = canvas
+        self.world = _World(cell_size)
+        self.pool = _ItemPool(canvas)
+        # The world coordinates at the top left, and the scale.
+        self.view = (0.0, 0.0, 1.0)
+        self.shown = {}
+        self.max_items = max_items or self.MAX_ITEMS
+        self.after_id = None
+
+    def add(self, kind, coords, **options):
+        """Add a primitive to the scene and return its key.
+
+        Arguments:
+            kind - a Canvas item type: 'line', 'rectangle' and so on
+            coords - the primitive's world coordinates, flat
+            **options - the item's options
+
+        """
+        return self.add_many(kind, [coords], **options)[0]
+
+    def add_many(self, kind, coords, **options):
+        """Add many primitives of one kind, with the same options.
+
+        Arguments:
+            kind - a Canvas item type
+            coords - a sequence of rows of world coordinates, one row
+                     per primitive, or a two dimensional NumPy array
+            **options - options for every item
+
+        Returns:
+            A range of the keys of the new primitives.
+
+        """
+        tags = options.get('tags', ())
+        if isinstance(tags, str):
+            tags = self.canvas.tk.splitlist(tags)
+        options['tags'] = ('viewport',) + tuple(tags)
+        if hasattr(coords, 'tolist'):
+            coords = coords.tolist()
+        keys = self.world.add(kind, coords, options)
+        self._schedule()
+        return keys
+
+    def remove(self, key):
+        """Remove a primitive from the scene."""
+        self.world.remove(key)
+        item = self.shown.pop(key, None)
+        if item is not None:
+            batch = Batch(self.canvas)
+            self.pool.release(batch, item)
+            batch.flush()
+        self._schedule()
+
+    def set_view(self, x, y, scale):
+        """Show the world from (x, y) at the top left, at a scale.
+
+        Items already shown are moved and scaled by Tk in a single
+        call; only primitives coming into view need new items.
+
+        """
+        (old_x, old_y, old_scale) = self.view
+        ratio = scale / old_scale
+        batch = Batch(self.canvas)
+        if ratio != 1:
+            batch.call(self.canvas, 'scale', 'viewport', 0, 0, ratio, ratio)
+        if (x, y) != (old_x, old_y):
+            batch.call(self.canvas, 'move', 'viewport',
+                       (old_x - x) * scale, (old_y - y) * scale)
+        batch.flush()
+        self.view = (x, y, scale)
+        self._schedule()
+
+    def pan(self, dx, dy):
+        """Move the view by dx and dy pixels."""
+        (x, y, scale) = self.view
+        self.set_view(x - dx / scale, y - dy / scale, scale)
+
+    def zoom(self, factor, x=0, y=0):
+        """Scale the view by factor, keeping canvas point (x, y) fixed."""
+        (world_x, world_y) = self.to_world(x, y)
+        scale = self.view[2] * factor
+        self.set_view(world_x - x / scale, world_y - y / scale, scale)
+
+    def to_world(self, x, y):
+        """Return the world coordinates of a canvas point."""
+        (left, top, scale) = self.view
+        return (left + x / scale, top + y / scale)
+
+    def find(self, x, y, radius=3):
+        """Return the key of the primitive nearest a canvas point.
+
+        Arguments:
+            x, y - canvas coordinates, as in an event
+            radius (optional) - the largest distance, in pixels
+
+        Returns:
+            A key or None if no primitive is close enough.
+
+        """
+        (world_x, world_y) = self.to_world(x, y)
+        return self.world.grid.nearest(
+            world_x, world_y, max_distance=radius / self.view[2]
+        )
+
+    def redraw(self):
+        """Show the primitives in view now, hiding the rest."""
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        wanted = self._wanted()
+        batch = Batch(self.canvas)
+        for key in [key for key in self.shown if key not in wanted]:
+            self.pool.release(batch, self.shown.pop(key))
+        creates = []
+        for (key, (kind, coords, options)) in wanted.items():
+            if key in self.shown:
+                continue
+            coords = self._to_canvas(coords)
+            item = self.pool.acquire(batch, kind, coords, options)
+            if item is None:
+                creates.append((key, kind, coords, options))
+            else:
+                self.shown[key] = item
+        # Queued last, so the result of the batch is the last new id.
+        for (_, kind, coords, options) in creates:
+            batch.call(self.canvas, 'create', kind, coords, options)
+        last = batch.flush()
+        # Items are numbered consecutively.
+        for (item, (key, kind, _, options)) in enumerate(
+                creates, int(last or 0) - len(creates) + 1):
+            self.pool.created(item, kind, options)
+            self.shown[key] = item
+
+    def _wanted(self):
+        # Return {key: (kind, coords, options)} for what's in view.
+        (left, top, scale) = self.view
+        (width, height) = canvas_size(self.canvas)
+        rect = (left, top, left + width / scale, top + height / scale)
+        level = self.world.level_for(scale, self.CELL_PIXELS)
+        cells = self.world.cells_in(level, rect)
+        if sum(count for (_, count) in cells) <= self.max_items:
+            primitives = self.world.primitives
+            return {key: primitives[key]
+                    for key in self.world.grid.in_rect(*rect)}
+        return {cell: self.world.shade(cell) for (cell, _) in cells}
+
+    def _to_canvas(self, coords):
+        (left, top, scale) = self.view
+        return [(value - (left if i % 2 == 0 else top)) * scale
+                for (i, value) in enumerate(coords)]
+
+    def _schedule(self):
+        if self.after_id is None:
+            self.after_id = self.canvas.after_idle(self.redraw)
+
+class _World:
+    """The primitives of a scene, indexed for fast lookups.
+
+    Primitives are counted by the cell their centre is in at each of
+    a number of levels, where cells at level n are 2**n times the
+    size of those at level 0. Coarser levels are rebuilt on demand
+    from level 0 after the scene changes.
+
+    """
+    def __init__(self, cell_size):
+        self.grid = SpatialGrid(cell_size)
+        self.primitives = {}
+        # [(counts, largest count)] for each level built.
+        self.levels = [({}, 0)]
+        self.next_key = 0
+
+    def add(self, kind, rows, options):
+        """Add primitives and return their keys."""
+        keys = range(self.next_key, self.next_key + len(rows))
+        self.next_key = keys.stop
+        counts = self.levels[0][0]
+        size = self.grid.cell_size
+        boxes = []
+        for (key, row) in zip(keys, rows):
+            coords = tuple(row)
+            self.primitives[key] = (kind, coords, options)
+            (xs, ys) = (coords[0::2], coords[1::2])
+            bbox = (min(xs), min(ys), max(xs), max(ys))
+            boxes.append((key, bbox))
+            cell = (math.floor((bbox[0] + bbox[2]) / (2 * size)),
+                    math.floor((bbox[1] + bbox[3]) / (2 * size)))
+            counts[cell] = counts.get(cell, 0) + 1
+        self.grid.insert_many(boxes)
+        self.levels = [(counts, 0)]
+        return keys
+
+    def remove(self, key):
+        """Remove a primitive."""
+        (_, coords, _) = self.primitives.pop(key)
+        size = self.grid.cell_size
+        (xs, ys) = (coords[0::2], coords[1::2])
+        cell = (math.floor((min(xs) + max(xs)) / (2 * size)),
+                math.floor((min(ys) + max(ys)) / (2 * size)))
+        counts = self.levels[0][0]
+        counts[cell] -= 1
+        if not counts[cell]:
+            del counts[cell]
+        self.grid.remove(key)
+        self.levels = [(counts, 0)]
+
+    def level_for(self, scale, pixels):
+        """Return the finest level whose cells are at least pixels wide."""
+        size = self.grid.cell_size * scale
+        return max(0, math.ceil(math.log2(pixels / size)))
+
+    def cells_in(self, level, rect):
+        """Return ((level, i, j), count) pairs for cells in rect."""
+        (counts, _) = self._level(level)
+        size = self.grid.cell_size * 2 ** level
+        (i1, j1, i2, j2) = [math.floor(value / size) for value in rect]
+        if (i2 - i1 + 1) * (j2 - j1 + 1) > len(counts):
+            return [((level, i, j), count)
+                    for ((i, j), count) in counts.items()
+                    if i1 <= i <= i2 and j1 <= j <= j2]
+        return [((level, i, j), counts[(i, j)])
+                for i in range(i1, i2 + 1) for j in range(j1, j2 + 1)
+                if (i, j) in counts]
+
+    def shade(self, cell):
+        """Return the (kind, coords, options) drawing a shaded cell."""
+        (level, i, j) = cell
+        (counts, largest) = self._level(level)
+        size = self.grid.cell_size * 2 ** level
+        shade = math.log1p(counts[(i, j)]) / math.log1p(largest)
+        return ('rectangle',
+                (i * size, j * size, (i + 1) * size, (j + 1) * size),
+                _SHADES[round(shade * (len(_SHADES) - 1))])
+
+    def _level(self, level):
+        while len(self.levels) <= level:
+            coarser = {}
+            for ((i, j), count) in self.levels[-1][0].items():
+                cell = (i // 2, j // 2)
+                coarser[cell] = coarser.get(cell, 0) + count
+            self.levels.append((coarser, 0))
+        (counts, largest) = self.levels[level]
+        if not largest and counts:
+            largest = max(counts.values())
+            self.levels[level] = (counts, largest)
+        return (counts, largest)
+
+# Options for shaded cells, from the lightest to the darkest. They're
+# shared so that reused items needn't be reconfigured.
+_SHADES = [
+    {'fill': f'#{value:02x}{value:02x}{value:02x}', 'outline': '',
+     'tags': ('viewport',)}
+    for value in range(224, 31, -12)
+]
+
+class _ItemPool:
+    """Hidden Canvas items waiting to be reused.
+
+    An item is only reused for a primitive of the same kind with the
+    same option names, so setting the new primitive's options leaves
+    none of the old primitive's behind.
+
+    """
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.free = {}
+        # The pool and options of every item.
+        self.options = {}
+
+    def acquire(self, batch, kind, coords, options):
+        """Queue showing a free item and return it, or return None."""
+        pool = (kind, tuple(sorted(options)))
+        free = self.free.get(pool)
+        if not free:
+            return None
+        item = free.pop()
+        batch.coords(self.canvas, item, *coords)
+        if self.options[item][1] is not options:
+            batch.itemconfigure(self.canvas, item, **options)
+        batch.itemconfigure(self.canvas, item, state='normal')
+        self.options[item] = (pool, options)
+        return item
+
+    def created(self, item, kind, options):
+        """Record a new item."""
+        self.options[item] = ((kind, tuple(sorted(options))), options)
+
+    def release(self, batch, item):
+        """Queue hiding an item and make it free for reuse."""
+        pool = self.options[item][0]
+        self.free.setdefault(pool, []).append(item)
+        batch.itemconfigure(self.canvas, item, state='hidden')
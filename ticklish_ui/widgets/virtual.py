@@ -0,0 +1,332 @@
+# BSD 3-Clause License
+#
+# Copyright (c) 2021, Jason DeLaat
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+#    this list of conditions and the following disclaimer in the documentation
+#    and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+#    contributors may be used to endorse or promote products derived from
+#    this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Defines VirtualRows, the base for widgets showing huge numbers of rows.
+
+Inserting an item into a tkinter.ttk.Treeview costs a round trip to
+Tcl and memory in Tk for every item. For lists with hundreds of
+thousands, or millions, of items that quickly becomes unusable.
+
+VirtualRows turns a Treeview into a window onto the data: the
+Treeview only ever contains as many items as it has visible rows.
+Scrolling doesn't move those items, it changes which logical rows they
+show and updates their contents, so the cost of scrolling depends on
+the height of the widget rather than the amount of data. Subclasses
+decide what each logical row displays by overriding row_data().
+
+"""
+import tkinter.ttk as ttk
+from ticklish_ui.batch import Batch
+from ticklish_ui.selection import SelectionModel
+
+def scroll_target(args, top, count, page):
+    """Return the first row to show after a call to yview().
+
+    Arguments:
+        args - the arguments given to yview(): ('moveto', fraction)
+               or ('scroll', amount, 'units' or 'pages')
+        top - an int, the first row currently shown
+        count - an int, the total number of rows
+        page - an int, the number of rows shown at once
+
+    """
+    if args[0] == 'moveto':
+        return round(float(args[1]) * count)
+    amount = int(args[1])
+    if args[2] == 'pages':
+        amount *= max(1, page - 1)
+    return top + amount
+
+class VirtualRows:
+    """Display a window onto a large number of rows in a Treeview.
+
+    The Treeview contains exactly 'height' items, named row0, row1,
+    and so on, which are reused as the widget scrolls. The logical
+    index of the row displayed by any of them is returned by
+    index_of().
+
+    The Treeview's yview() method and yscrollcommand option are
+    replaced so they work in terms of logical rows and a Scrollbar
+    can be attached in the usual way:
+
+    Example:
+        bar['command'] = treeview.yview
+        treeview['yscrollcommand'] = bar.set
+
+    Selected rows are tracked by logical index in a SelectionModel,
+    available as the Treeview's selection_model attribute, so
+    selections survive scrolling and selecting every row is cheap no
+    matter how many rows there are. Only the visible rows are ever
+    selected in Tk. Whenever the selection changes the Treeview
+    receives a <<SelectionChanged>> virtual event and a
+    SelectionChange describing the change is sent through
+    selection_model.changes.
+
+    Example:
+        treeview.selection_model.select_all()
+        treeview.selection_model.changes.map(
+            lambda change: print(change.kind, change.added, change.removed)
+        )
+
+    Clicking rows changes the selection of the visible rows only.
+    Rows outside the view are only changed through selection_model.
+
+    The methods listed in EXPORTS are also made available directly
+    on the Treeview.
+
+    """
+    EXPORTS = ('refresh', 'index_of', 'selected_indices', 'see_index')
+
+    def __init__(self, treeview, yscrollcommand=None):
+        """Attach virtual rows to a Treeview.
+
+        Arguments:
+            treeview - a tkinter.ttk.Treeview, which should be empty.
+            yscrollcommand (optional) - a function called with the
+                                        first and last visible
+                                        fractions whenever the view
+                                        changes, typically the set()
+                                        method of a Scrollbar.
+
+        """
+        self.treeview = treeview
+        self._yscrollcommand = yscrollcommand
+        self._count = 0
+        self._offset = 0
+        self._rows = []
+        self.selection = SelectionModel(0, treeview)
+        self.selection.changes.map(self._on_selection_change)
+        self._create_rows()
+        treeview.selection_model = self.selection
+        treeview.yview = self.yview
+        treeview.configure = treeview.config = self.configure
+        for name in self.EXPORTS:
+            setattr(treeview, name, getattr(self, name))
+        bindings = {
+            '<<TreeviewSelect>>': self._on_select,
+            '<MouseWheel>': self._on_wheel,
+            '<Button-4>': lambda e: self.yview('scroll', -3, 'units'),
+            '<Button-5>': lambda e: self.yview('scroll', 3, 'units'),
+            '<Up>': lambda e: self._step_focus(-1),
+            '<Down>': lambda e: self._step_focus(1),
+            '<Prior>': lambda e: self.yview('scroll', -1, 'pages'),
+            '<Next>': lambda e: self.yview('scroll', 1, 'pages'),
+            '<Home>': lambda e: self.yview('moveto', 0),
+            '<End>': lambda e: self.yview('moveto', 1),
+        }
+        for (sequence, handler) in bindings.items():
+            treeview.bind(sequence, handler, add='+')
+
+    def row_data(self, index):
+        """Return the contents of a logical row.
+
+        Subclasses must override this method.
+
+        Arguments:
+            index - an int, the logical row number
+
+        Returns:
+            A dictionary of item options, typically text and values,
+            as accepted by the Treeview item() method.
+
+        """
+        raise NotImplementedError
+
+    def set_count(self, count):
+        """Set the number of logical rows and redraw.
+
+        Arguments:
+            count - an int
+
+        """
+        self._count = count
+        self.selection.resize(count)
+        self._offset = self._clamp(self._offset)
+        self.refresh()
+
+    def refresh(self):
+        """Redraw the visible rows.
+
+        Call this after changing the data the rows display.
+
+        """
+        rows = self._visible_rows()
+        batch = Batch(self.treeview)
+        for (i, row) in enumerate(rows):
+            batch.call(self.treeview, 'item', row, self.row_data(self._offset + i))
+        batch.call(self.treeview, 'children', '', rows)
+        self._sync_selection(batch)
+        batch.flush()
+        self._report()
+
+    def index_of(self, row):
+        """Return the logical index displayed by a row, or None.
+
+        Arguments:
+            row - a string, the name of one of the Treeview's items
+                  (row0, row1, ...) as returned by identify_row(),
+                  focus() and so on.
+
+        """
+        try:
+            index = self._offset + self._rows.index(row)
+        except ValueError:
+            return None
+        return index if index < self._count else None
+
+    def selected_indices(self):
+        """Return a sorted list of the selected logical rows."""
+        return list(self.selection)
+
+    def see_index(self, index):
+        """Scroll the minimum amount needed to show a logical row.
+
+        Arguments:
+            index - an int, the logical row number
+
+        Returns:
+            The name of the item displaying the logical row.
+
+        """
+        if index < self._offset:
+            self._scroll_to(index)
+        elif index >= self._offset + len(self._rows):
+            self._scroll_to(index - len(self._rows) + 1)
+        return self._rows[index - self._offset]
+
+    def yview(self, *args):
+        """Query or change the vertical position of the view.
+
+        Works like the tkinter yview() method but in terms of logical
+        rows rather than the Treeview items.
+
+        """
+        if not args:
+            return self._fractions()
+        self._scroll_to(
+            scroll_target(args, self._offset, self._count, len(self._rows))
+        )
+        return None
+
+    def configure(self, cnf=None, **kwargs):
+        """Configure the Treeview.
+
+        Works like the tkinter configure() method except that the
+        yscrollcommand option is handled by VirtualRows and changing
+        the height recreates the rows.
+
+        """
+        if isinstance(cnf, dict):
+            kwargs = dict(cnf, **kwargs)
+            cnf = None
+        if 'yscrollcommand' in kwargs:
+            self._yscrollcommand = kwargs.pop('yscrollcommand')
+            self._report()
+            if not kwargs:
+                return None
+        result = ttk.Treeview.configure(self.treeview, cnf, **kwargs)
+        if 'height' in kwargs:
+            self._create_rows()
+            self.refresh()
+        return result
+
+    def _create_rows(self):
+        if self._rows:
+            self.treeview.delete(*self._rows)
+        height = int(self.treeview.cget('height'))
+        self._rows = [f'row{i}' for i in range(height)]
+        batch = Batch(self.treeview)
+        for row in self._rows:
+            batch.call(self.treeview, 'insert', '', 'end', {'id': row})
+        batch.flush()
+        self._offset = self._clamp(self._offset)
+
+    def _clamp(self, offset):
+        return max(0, min(offset, self._count - len(self._rows)))
+
+    def _scroll_to(self, offset):
+        offset = self._clamp(offset)
+        if offset != self._offset:
+            self._offset = offset
+            self.refresh()
+
+    def _fractions(self):
+        if self._count == 0:
+            return (0.0, 1.0)
+        last = min(self._count, self._offset + len(self._rows))
+        return (self._offset / self._count, last / self._count)
+
+    def _report(self):
+        if self._yscrollcommand is not None:
+            self._yscrollcommand(*self._fractions())
+
+    def _browse(self):
+        return str(self.treeview.cget('selectmode')) == 'browse'
+
+    def _visible_rows(self):
+        return self._rows[:max(0, self._count - self._offset)]
+
+    def _sync_selection(self, batch):
+        batch.call(self.treeview, 'selection', 'set', [
+            row for (i, row) in enumerate(self._visible_rows())
+            if self._offset + i in self.selection
+        ])
+
+    def _on_select(self, _event_ignored):
+        selected = set(self.treeview.selection())
+        added = []
+        removed = []
+        for (i, row) in enumerate(self._visible_rows()):
+            (added if row in selected else removed).append(self._offset + i)
+        if self._browse() and added:
+            removed = [i for i in self.selection if i not in added]
+        self.selection.update(added, removed)
+
+    def _on_selection_change(self, _change_ignored):
+        batch = Batch(self.treeview)
+        self._sync_selection(batch)
+        batch.flush()
+        self.treeview.event_generate('<<SelectionChanged>>')
+
+    def _on_wheel(self, event):
+        self.yview('scroll', -1 if event.delta > 0 else 1, 'units')
+
+    def _step_focus(self, step):
+        # The Treeview's own bindings move the focus between rows. We
+        # only need to step in when moving past the first or last row.
+        index = self.index_of(ttk.Treeview.focus(self.treeview))
+        edge = self._rows[0] if step < 0 else self._rows[-1]
+        target = 0 if index is None else index + step
+        if index is not None and 0 <= target < self._count \
+                and self.index_of(edge) == index:
+            row = self.see_index(target)
+            ttk.Treeview.focus(self.treeview, row)
+            if self._browse():
+                self.treeview.selection_set(row)